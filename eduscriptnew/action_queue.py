@@ -0,0 +1,64 @@
+# action_queue.py
+
+from collections import deque
+
+class QueueFull(Exception):
+    pass
+
+# a FIFO with O(1) push and pop at both ends, used for the simulator's actions.
+# capacity=None means unbounded, otherwise it must be at least 1. when a bounded queue is full, push() calls on_full
+# until there is room again, which is how the simulator applies backpressure; without on_full a full queue raises QueueFull
+class ActionQueue:
+    def __init__(self, capacity=None, on_full=None):
+        # a queue that can never hold an item would make push() call on_full forever
+        if capacity is not None and capacity < 1:
+            raise Exception(f"Queue capacity must be at least 1, got {capacity}")
+        self.items = deque()
+        self.capacity = capacity
+        self.on_full = on_full
+
+    def is_full(self):
+        return self.capacity is not None and len(self.items) >= self.capacity
+
+    def push(self, item):
+        if self.capacity is not None and len(self.items) >= self.capacity:
+            if self.on_full is None:
+                raise QueueFull(f"Queue is full ({self.capacity} items)")
+            while len(self.items) >= self.capacity:
+                self.on_full()
+        self.items.append(item)
+
+    def extend(self, items):
+        for item in items:
+            self.push(item)
+
+    def pop(self):
+        return self.items.popleft()
+
+    def peek(self):
+        return self.items[0]
+
+    # the most recently pushed item, which is the only one that may still be changed in place
+    def last(self):
+        return self.items[-1]
+
+    def replace_last(self, item):
+        self.items[-1] = item
+
+    def pop_last(self):
+        return self.items.pop()
+
+    def clear(self):
+        self.items.clear()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __repr__(self):
+        return f"ActionQueue({list(self.items)!r}, capacity={self.capacity})"
@@ -0,0 +1,181 @@
+# batch.py
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from parser import get_parser
+from simulator import HeadlessSimulator, WIDTH, HEIGHT
+from engines import ENGINES, create_interpreter
+from limits import Limits, LimitExceeded
+from cache import ProgramCache
+from world import load_world
+
+class JobTimeout(Exception):
+    pass
+
+# actions a script may have queued before enqueue_action simulates the oldest ones. the eager engines enqueue
+# a whole program at once, so without a bound a runaway script fills memory until its timeout, and the
+# timed-out record would show none of the actions it issued
+QUEUE_CAPACITY = 1024
+
+# collects the scripts to run. a directory yields every .edu file below it in sorted order,
+# any other file is read as a manifest: one script path per line, relative to the manifest,
+# blank lines and lines starting with # are skipped
+def find_scripts(path):
+    if os.path.isdir(path):
+        scripts = []
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith('.edu'):
+                    scripts.append(os.path.join(root, name))
+        return scripts
+    base = os.path.dirname(os.path.abspath(path))
+    scripts = []
+    with open(path) as manifest:
+        for line in manifest:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                scripts.append(os.path.join(base, line))
+    return scripts
+
+def raise_timeout(signum, frame):
+    raise JobTimeout()
+
+_cache = None
+_world = None
+
+# runs once in every pool worker: the frozen parser tables are loaded here, not once per script,
+# and the worker gets its program cache, optionally backed by a directory shared by all workers.
+# world_path is a world file every script's sensors look at, see world.load_world. it is loaded and indexed
+# once per worker; the world is never changed by a run, so all scripts can share it.
+# with boundary=True the world also gets walls along the edges of the simulator's screen, so no robot drives off it
+def init_worker(cache_dir=None, world_path=None, boundary=True):
+    global _cache, _world
+    get_parser()
+    _cache = ProgramCache(directory=cache_dir)
+    _world = None
+    if world_path:
+        _world = load_world(world_path)
+        if boundary:
+            _world.add_boundary(WIDTH, HEIGHT)
+
+# parses and runs one script headlessly and returns its JSON-ready record.
+# any error, including a timeout, ends up in the record instead of being raised,
+# a limits.Limits that fires is also named in record['limit'].
+# record['diagnostics'] lists every syntax error and illegal character found in one pass, see parser.parse_with_diagnostics.
+# record['collisions'] lists every move the world given with --world stopped at an obstacle, see simulator.Collision.
+# optimize=True runs the parsed program through optimizer.optimize before it is executed.
+# the timeout uses SIGALRM, so it is only enforced on platforms that have it
+def run_script(path, engine='vm', timeout=None, limits=None, optimize=False):
+    record = {'script': path, 'ok': False, 'position': None, 'angle': None, 'actions': 0, 'error': None, 'limit': None,
+              'diagnostics': [], 'collisions': []}
+    start = time.perf_counter()
+    if _cache is None:
+        init_worker()
+    simulator = HeadlessSimulator(fast_forward=True, coalesce=True, world=_world, queue_capacity=QUEUE_CAPACITY)
+    use_alarm = timeout and hasattr(signal, 'SIGALRM')
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, raise_timeout)
+    try:
+        # the timer is only armed inside the try, and disarmed inside it too, so a JobTimeout always lands in the record
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            with open(path) as f:
+                source = f.read()
+            # the lexer and parser report syntax errors with print(), which must not end up in the JSON Lines stream
+            messages = io.StringIO()
+            with contextlib.redirect_stdout(messages):
+                ast = _cache.parse(source)
+            record['diagnostics'] = [diagnostic.to_dict() for diagnostic in _cache.diagnostics]
+            if ast is None:
+                record['error'] = messages.getvalue().strip() or "Parsing failed."
+            else:
+                try:
+                    create_interpreter(ast, simulator, engine, limits, optimize).interpret()
+                except LimitExceeded as e:
+                    record['error'] = f"LimitExceeded: {e}"
+                    record['limit'] = e.limit
+                # the actions issued before a limit fired still count towards the final pose
+                simulator.drain()
+                record['ok'] = record['limit'] is None
+        finally:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+    except JobTimeout:
+        record['error'] = f"Timed out after {timeout} seconds"
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, previous_handler)
+    record['position'] = list(simulator.robot_pos)
+    record['angle'] = simulator.robot_angle
+    # every robot command counts, also the ones merged into a neighbouring action
+    record['actions'] = simulator.completed_actions + simulator.coalesced_actions
+    record['collisions'] = [collision.to_dict() for collision in simulator.collisions]
+    record['seconds'] = round(time.perf_counter() - start, 6)
+    return record
+
+# pool.imap_unordered only passes one argument
+def run_job(job):
+    return run_script(*job)
+
+# runs every script and yields the records as soon as they are finished, so not in input order.
+# processes=None uses every core, processes=1 runs in this process without a pool
+def run_batch(scripts, processes=None, engine='vm', timeout=10, limits=None, cache_dir=None, optimize=False,
+              world_path=None, boundary=True):
+    if engine not in ENGINES:
+        raise Exception(f"Unknown engine '{engine}', expected one of: {', '.join(ENGINES)}")
+    jobs = [(path, engine, timeout, limits, optimize) for path in scripts]
+    if processes == 1:
+        init_worker(cache_dir, world_path, boundary)
+        for job in jobs:
+            yield run_job(job)
+        return
+    with multiprocessing.Pool(processes, initializer=init_worker, initargs=(cache_dir, world_path, boundary)) as pool:
+        for record in pool.imap_unordered(run_job, jobs, chunksize=4):
+            yield record
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description="Run EduScript programs headlessly and print one JSON line per script.")
+    arguments.add_argument('path', help="a directory of .edu scripts or a manifest file listing them")
+    arguments.add_argument('-j', '--jobs', type=int, default=None, help="worker processes (default: all cores)")
+    arguments.add_argument('-t', '--timeout', type=float, default=10, help="seconds allowed per script (default: 10)")
+    arguments.add_argument('-e', '--engine', choices=list(ENGINES), default='vm', help="execution engine (default: vm)")
+    arguments.add_argument('-o', '--output', help="write the JSON lines to this file instead of stdout")
+    arguments.add_argument('--max-statements', type=int, help="stop a script after this many statements")
+    arguments.add_argument('--max-actions', type=int, help="stop a script after this many robot commands")
+    arguments.add_argument('--max-depth', type=int, help="maximum nesting of user function calls")
+    arguments.add_argument('--cache-dir', help="keep parsed programs in this directory between runs")
+    arguments.add_argument('-O', '--optimize', action='store_true', help="fold constants, prune constant ifs and unroll small loops first")
+    arguments.add_argument('-w', '--world', help="a world file of obstacles for the sensors (default: an empty world)")
+    arguments.add_argument('--no-boundary', dest='boundary', action='store_false',
+                           help="let robots drive off the screen of a --world instead of stopping at its edges")
+    options = arguments.parse_args(argv)
+    limits = Limits(options.max_statements, options.max_actions, options.max_depth)
+
+    scripts = find_scripts(options.path)
+    output = open(options.output, 'w') if options.output else sys.stdout
+    failed = 0
+    try:
+        for record in run_batch(scripts, options.jobs, options.engine, options.timeout, limits, options.cache_dir,
+                                options.optimize, options.world, options.boundary):
+            if not record['ok']:
+                failed += 1
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+    finally:
+        if options.output:
+            output.close()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
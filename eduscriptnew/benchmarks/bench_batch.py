@@ -0,0 +1,85 @@
+# bench_batch.py
+#
+# writes a set of generated .edu scripts to a temporary directory and runs them through batch.run_batch
+# with 1, 2, 4, ... worker processes up to the number of cores, reporting scripts per second.
+# one script loops forever to check that the per-job timeout fires, one does not parse.
+#
+# usage: python benchmarks/bench_batch.py [scripts] [iterations]
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import find_scripts, run_batch
+
+SCRIPT = '''
+function side() {
+    moveForward(%d);
+    return measureDistance() / 100;
+}
+function main() {
+    repeat(%d) {
+        if (side() == 1) { turnRight(90); } else { turnLeft(90); }
+    }
+}
+'''
+
+FOREVER = '''
+function main() {
+    repeat(1000000000) { turnLeft(1); }
+}
+'''
+
+BROKEN = '''
+function main() {
+    moveForward(10
+}
+'''
+
+
+def write_scripts(directory, count, iterations):
+    for i in range(count):
+        with open(os.path.join(directory, f"script_{i:05d}.edu"), 'w') as f:
+            f.write(SCRIPT % (i % 50 + 1, iterations))
+    with open(os.path.join(directory, "forever.edu"), 'w') as f:
+        f.write(FOREVER)
+    with open(os.path.join(directory, "broken.edu"), 'w') as f:
+        f.write(BROKEN)
+
+
+def check_records(records, count):
+    errors = {os.path.basename(record['script']): record['error'] for record in records if not record['ok']}
+    assert len(records) == count + 2, f"expected {count + 2} records, got {len(records)}"
+    assert set(errors) == {'forever.edu', 'broken.edu'}, f"unexpected failures: {errors}"
+    assert errors['forever.edu'].startswith('Timed out'), errors['forever.edu']
+
+
+def run(count, iterations):
+    cores = os.cpu_count() or 1
+    processes = [1]
+    while processes[-1] * 2 <= cores:
+        processes.append(processes[-1] * 2)
+    if processes[-1] != cores:
+        processes.append(cores)
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_scripts(directory, count, iterations)
+        scripts = find_scripts(directory)
+        print(f"{len(scripts)} scripts, {cores} cores")
+        print(f"{'processes':>10} {'seconds':>10} {'scripts/s':>10} {'speedup':>10}")
+        baseline = None
+        for n in processes:
+            start = time.perf_counter()
+            records = list(run_batch(scripts, processes=n, timeout=1))
+            elapsed = time.perf_counter() - start
+            check_records(records, count)
+            baseline = baseline or elapsed
+            print(f"{n:>10} {elapsed:>10.3f} {len(records) / elapsed:>10.0f} {baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 400,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500)
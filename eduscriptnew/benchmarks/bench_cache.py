@@ -0,0 +1,57 @@
+# bench_cache.py
+#
+# replays a stream of submissions in which a few curriculum scripts are resubmitted over and over,
+# once parsing every submission and once through ProgramCache: with a warm memory tier,
+# and with a fresh cache that can only use the disk tier a previous run left behind.
+# eviction, grammar signature invalidation and diagnostics are checked by tests/test_cache.py.
+#
+# usage: python benchmarks/bench_cache.py [submissions] [distinct scripts]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache import ProgramCache
+from parser import parse
+from bench_parse import generate_program
+
+
+# script i is submitted roughly twice as often as script 2 * i
+def submissions(count, distinct):
+    scripts = [generate_program(40 + i % 7 * 10).replace('helper', f'helper{i}') for i in range(distinct)]
+    rng = random.Random(1)
+    weights = [1 / (i + 1) for i in range(distinct)]
+    return rng.choices(scripts, weights, k=count)
+
+
+def replay(stream, parse_function):
+    start = time.perf_counter()
+    for source in stream:
+        assert parse_function(source) is not None
+    return time.perf_counter() - start
+
+
+def run(count, distinct):
+    stream = submissions(count, distinct)
+    print(f"{count} submissions of {distinct} distinct scripts")
+    print(f"{'mode':>14} {'seconds':>10} {'per submission us':>18}")
+    elapsed = replay(stream, parse)
+    print(f"{'parse':>14} {elapsed:>10.3f} {elapsed / count * 1e6:>18.1f}")
+    with tempfile.TemporaryDirectory() as directory:
+        memory = ProgramCache(max_entries=distinct // 4, directory=directory)
+        elapsed = replay(stream, memory.parse)
+        print(f"{'memory + disk':>14} {elapsed:>10.3f} {elapsed / count * 1e6:>18.1f}")
+        print(f"  {memory.stats()}")
+        disk = ProgramCache(max_entries=1, directory=directory)
+        elapsed = replay(stream, disk.parse)
+        print(f"{'disk only':>14} {elapsed:>10.3f} {elapsed / count * 1e6:>18.1f}")
+        print(f"  {disk.stats()}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,76 @@
+# bench_coalesce.py
+#
+# runs loop-heavy scripts on the VM into a HeadlessSimulator with and without coalesce=True
+# and reports how many actions end up queued and how long running and draining takes.
+# that both simulators end in the same pose and that the coalesced trajectory is the uncoalesced one with
+# the points in the middle of straight lines left out is checked by tests/test_coalesce.py.
+#
+# usage: python benchmarks/bench_coalesce.py [iterations]
+
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import parse
+from engines import create_interpreter
+from simulator import HeadlessSimulator
+
+SCRIPTS = [
+    ('small moves', '''
+    function main() {
+        repeat(%d) { moveForward(1); }
+    }
+    '''),
+    ('wiggle', '''
+    function main() {
+        repeat(%d) { turnLeft(10); turnRight(10); moveForward(1); turnRight(1); turnRight(2); }
+    }
+    '''),
+    # every iteration reads a sensor, so nothing may be merged across iterations
+    ('sensor barrier', '''
+    function main() {
+        repeat(%d) {
+            moveForward(1);
+            moveForward(1);
+            if (measureDistance() > 50) { turnLeft(1); }
+        }
+    }
+    '''),
+]
+
+
+def simulate(ast, **options):
+    simulator = HeadlessSimulator(**options)
+    start = time.perf_counter()
+    create_interpreter(ast, simulator, 'vm').interpret()
+    queued = len(simulator.action_queue)
+    result = simulator.run()
+    return result, queued, time.perf_counter() - start
+
+
+def close(a, b):
+    return math.isclose(a[0], b[0], abs_tol=1e-6) and math.isclose(a[1], b[1], abs_tol=1e-6)
+
+
+# every point of coalesced appears in plain, in the same order
+def is_subpath(coalesced, plain):
+    points = iter(plain)
+    return all(any(close(point, candidate) for candidate in points) for point in coalesced)
+
+
+def run(iterations):
+    print(f"{'script':>16} {'mode':>14} {'queued':>10} {'steps':>10} {'seconds':>10}")
+    for name, source in SCRIPTS:
+        ast = parse(source % iterations)
+        for mode, options in (('stepped', {}), ('fast forward', {'fast_forward': True})):
+            for coalesce in (False, True):
+                result, queued, elapsed = simulate(ast, coalesce=coalesce, **options)
+                label = mode + (' +c' if coalesce else '')
+                print(f"{name:>16} {label:>14} {queued:>10} {result.steps:>10} {elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,87 @@
+# bench_collision.py
+#
+# reports the cost of collision checks on a 10k obstacle world: world.World.sweep against sweeping every obstacle,
+# and random drives of a HeadlessSimulator with and without the world. that the robot stops at the right
+# contact points and the grid sweep matches brute force is checked by tests/test_collision.py.
+#
+# usage: python benchmarks/bench_collision.py [obstacles] [actions]
+
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator import HeadlessSimulator
+from bench_world import random_world
+
+
+def random_drive(simulator, actions, seed):
+    rng = random.Random(seed)
+    for _ in range(actions):
+        choice = rng.randrange(4)
+        if choice == 0:
+            simulator.move_forward(rng.uniform(0, 400))
+        elif choice == 1:
+            simulator.move_backward(rng.uniform(0, 400))
+        else:
+            simulator.turn_left(rng.uniform(0, 360))
+    return simulator.run()
+
+
+def brute_sweep(world, x, y, dx, dy, distance, radius):
+    nearest, hit = distance, None
+    for obstacle in world.obstacles:
+        travelled = obstacle.sweep(x, y, dx, dy, radius)
+        if travelled is not None and travelled < nearest:
+            nearest, hit = travelled, obstacle
+    return nearest, hit
+
+
+def random_moves(world, side, count, seed=4):
+    rng = random.Random(seed)
+    moves = []
+    while len(moves) < count:
+        x, y = rng.uniform(0, side), rng.uniform(0, side)
+        if world.detect_obstacle(x, y, 20):
+            continue  # sweeps start clear of every obstacle
+        angle = rng.uniform(0, 2 * math.pi)
+        moves.append((x, y, math.cos(angle), math.sin(angle), rng.choice([2, 50, 400])))
+    return moves
+
+
+def best_of(function, repeats=3):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(count, actions):
+    world, side = random_world(count)
+    moves = random_moves(world, side, 2000)
+    grid = best_of(lambda: [world.sweep(*move, 20) for move in moves])
+    brute = best_of(lambda: [brute_sweep(world, *move, 20) for move in moves[:20]], repeats=1) * len(moves) / 20
+    print(f"{count} obstacles, {len(moves)} sweeps: grid {len(moves) / grid:.0f}/s, brute force {len(moves) / brute:.0f}/s, "
+          f"{brute / grid:.0f}x")
+    print(f"{'mode':>14} {'world':>8} {'steps':>10} {'collisions':>11} {'seconds':>10}")
+    for mode, options in (('stepped', {}), ('fast forward', {'fast_forward': True})):
+        for label, sweeping in (('none', None), (str(count), world)):
+            simulator = HeadlessSimulator(world=sweeping, **options)
+            simulator.robot_pos = [side / 2, side / 2]
+            while sweeping is not None and sweeping.detect_obstacle(*simulator.robot_pos, 20):
+                simulator.robot_pos[0] += 7
+            start = time.perf_counter()
+            result = random_drive(simulator, actions, 0)
+            elapsed = time.perf_counter() - start
+            print(f"{mode:>14} {label:>8} {result.steps:>10} {len(result.collisions):>11} {elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
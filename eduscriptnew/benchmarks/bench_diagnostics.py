@@ -0,0 +1,70 @@
+# bench_diagnostics.py
+#
+# breaks a number of statements in a generated program and compares one parser.parse_with_diagnostics pass,
+# which reports all of them, with the fix-the-first-error-and-parse-again loop it replaces.
+# that the pass finds every error with the right line and column is checked by tests/test_diagnostics.py.
+#
+# usage: python benchmarks/bench_diagnostics.py [statements] [errors]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import parse_with_diagnostics
+from bench_parse import generate_program
+
+# lines of generate_program before the first statement of main()
+HEADER_LINES = 4
+
+# (broken line, column of the reported token) for a "    moveForward(i);" statement
+BREAKAGES = [
+    lambda line: (line.replace(');', ' +);'), line.index(')') + 3),        # operand missing
+    lambda line: (line.replace('(', ' ', 1), line.index('(') + 2),         # ( missing, the number is unexpected
+    lambda line: (line.replace(';', ' @;'), None),                         # illegal character, not a syntax error
+]
+
+
+def broken_program(statements, errors, seed=1):
+    rng = random.Random(seed)
+    lines = generate_program(statements).split('\n')
+    # every fourth statement is a moveForward, see bench_parse.generate_program
+    candidates = [HEADER_LINES + i for i in range(0, statements, 4)]
+    expected = {}
+    for index in sorted(rng.sample(candidates, errors)):
+        lines[index], column = rng.choice(BREAKAGES)(lines[index])
+        expected[index + 1] = column
+    return '\n'.join(lines), expected
+
+
+# the workflow without recovery: look at the first error only, repair that line and parse everything again
+def fix_one_at_a_time(source, original):
+    lines = source.split('\n')
+    parses = 0
+    while True:
+        parses += 1
+        errors = parse_with_diagnostics('\n'.join(lines)).syntax_errors()
+        if not errors:
+            return parses
+        lines[errors[0].lineno - 1] = original[errors[0].lineno - 1]
+
+
+def run(statements, errors):
+    original = generate_program(statements).split('\n')
+    source, expected = broken_program(statements, errors)
+    start = time.perf_counter()
+    parse_with_diagnostics(source)
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    parses = fix_one_at_a_time(source, original)
+    repeated = time.perf_counter() - start
+    print(f"{'workflow':>22} {'parses':>8} {'seconds':>10}")
+    print(f"{'one recovering pass':>22} {1:>8} {single:>10.3f}")
+    print(f"{'first error, re-parse':>22} {parses:>8} {repeated:>10.3f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20)
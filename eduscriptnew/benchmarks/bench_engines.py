@@ -0,0 +1,322 @@
+# bench_engines.py
+#
+# reports the time each execution engine needs for the sensor hot loop, an expression-heavy loop
+# and a loop that spends its time calling and returning from helper functions.
+# the conformance and limit programs below are run on every engine by tests/test_engines.py.
+#
+# usage: python benchmarks/bench_engines.py [iterations]
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import parse
+from engines import ENGINES, create_interpreter
+from interpreter import InterpreterWithSimulator
+from limits import Limits
+
+# scripts covering every statement and expression form; all engines must produce the same actions and errors
+CONFORMANCE_PROGRAMS = [
+    '''
+    function main() {
+        moveForward(10);
+        turnRight(90);
+        moveBackward(2.5);
+        turnLeft(45);
+    }
+    ''',
+    '''
+    function main() {
+        moveForward(1 + 2 * 3 - 4 / 2);
+        moveForward((1 + 2) * 3);
+        turnRight(10 - 2 - 3);
+        moveForward(1 < 2);
+        moveForward(2 <= 2);
+        moveForward(3 > 4);
+        moveForward(4 >= 5);
+        moveForward(1 == 1);
+        moveForward(1 != 1);
+        moveForward(0 && 5);
+        moveForward(3 && 5);
+        moveForward(0 || 7);
+        moveForward(!0);
+        moveForward(!!3);
+    }
+    ''',
+    '''
+    function main() {
+        if (detectObstacle()) {
+            turnRight(90);
+        } else {
+            moveForward(measureDistance() / 10);
+        }
+        if (measureDistance() > 50) {
+            turnLeft(1);
+        }
+        repeat(3) {
+            moveBackward(5);
+            repeat(2) { turnLeft(15); }
+        }
+        repeat(0) { moveForward(99); }
+        repeat(2.9) { moveForward(7); }
+    }
+    ''',
+    '''
+    function step() {
+        moveForward(1);
+        return 2;
+    }
+    function pick() {
+        repeat(10) {
+            if (1) {
+                turnRight(3);
+                return 4;
+            }
+        }
+        moveForward(999);
+    }
+    function nothing() {
+        moveForward(5);
+    }
+    function main() {
+        moveForward(step() * step());
+        turnLeft(pick());
+        nothing();
+        moveForward(nothing() == nothing());
+    }
+    ''',
+    '''
+    function main() {
+        repeat(3) {
+            if (measureDistance() > 50) { moveForward(1); } else { turnLeft(2); }
+        }
+        repeat(2) {
+            if (detectObstacle()) { moveForward(3); } else { repeat(2) { turnRight(4); } }
+        }
+        if (0) { moveForward(5); } else { if (1) { moveBackward(6); } }
+        repeat(0 - 2) { moveForward(8); }
+        moveForward(3, 4);
+    }
+    ''',
+    '''
+    function main() {
+        moveForward(1);
+        moveForward(1 / 0);
+    }
+    ''',
+    '''
+    function main() {
+        moveForward();
+    }
+    ''',
+    '''
+    function main() {
+        moveForward(2);
+        missing();
+    }
+    ''',
+    '''
+    function main() {
+        turnLeft(3);
+        moveForward(speed);
+    }
+    ''',
+    '''
+    function main() {
+        moveForward(detectObstacle(1));
+    }
+    ''',
+    '''
+    function helper() {
+        moveForward(1);
+    }
+    ''',
+]
+
+# scripts run with limits; every engine has to stop at the same statement, action or call with the same error
+LIMIT_PROGRAMS = [
+    ('''
+    function main() {
+        repeat(1000000000) { }
+    }
+    ''', Limits(max_statements=5000)),
+    ('''
+    function main() {
+        repeat(10) {
+            moveForward(1);
+            if (measureDistance() > 50) { turnLeft(2); }
+        }
+    }
+    ''', Limits(max_statements=17)),
+    ('''
+    function main() {
+        repeat(100) { moveForward(1); turnRight(1); }
+    }
+    ''', Limits(max_actions=15)),
+    ('''
+    function down() {
+        moveForward(1);
+        down();
+    }
+    function main() {
+        down();
+    }
+    ''', Limits(max_depth=25)),
+    ('''
+    function two() {
+        moveForward(2);
+        return 2;
+    }
+    function main() {
+        repeat(two()) { turnLeft(two()); }
+    }
+    ''', Limits(max_statements=100, max_actions=100, max_depth=1)),
+    ('''
+    function main() {
+        repeat(1000000000) { moveBackward(1); }
+    }
+    ''', Limits(max_seconds=0.05, max_actions=1000000000, check_interval=100)),
+]
+
+# the hot path: sensor reads and arithmetic inside a tight repeat loop
+HOT_LOOP = '''
+function main() {
+    repeat(%d) {
+        moveForward(measureDistance() * 2 + 1);
+        if (measureDistance() > 50 && 3 < 4) {
+            turnRight(measureDistance() / 4 - 10);
+        } else {
+            turnLeft(5);
+        }
+    }
+}
+'''
+
+# expression-heavy arithmetic and comparisons with few robot commands per iteration
+EXPRESSION_LOOP = '''
+function half() {
+    return measureDistance() / 2;
+}
+function main() {
+    repeat(%d) {
+        if ((measureDistance() + 4) * 3 - half() / 5 > 2 * (7 - measureDistance() / 25) || !detectObstacle()) {
+            moveForward(((1 + measureDistance()) * 2 - 3) / 4 + (half() > 10) * 5 - (3 <= 2));
+        }
+        turnLeft((half() - 1) * (half() + 1) / (measureDistance() * measureDistance()) + (8 / 4 == 2));
+    }
+}
+'''
+
+# helper functions that compute a value and return early from nested if/repeat blocks
+RETURN_LOOP = '''
+function clamp() {
+    if (measureDistance() > 80) {
+        repeat(3) {
+            if (measureDistance() > 90) {
+                return 90;
+            }
+        }
+    }
+    return measureDistance();
+}
+function step() {
+    return clamp() / 10;
+}
+function main() {
+    repeat(%d) {
+        moveForward(step() + step());
+        turnRight(clamp());
+    }
+}
+'''
+
+# stands in for the simulator: records every enqueued action and answers the sensors
+# the same way the real simulator does without a world
+class RecordingSimulator:
+    def __init__(self):
+        self.actions = []
+
+    def enqueue_action(self, action_type, value):
+        self.actions.append((action_type, value))
+
+    # actions finish instantly, so the cooperative interpreter is resumed right away
+    def is_idle(self):
+        return True
+
+    def drain(self):
+        pass
+
+    def detect_obstacle(self):
+        return False
+
+    def measure_distance(self):
+        return 100
+
+
+# runs a program on one engine and returns the action stream plus the error it ended with, if any
+def execute(engine, ast, limits=None):
+    simulator = RecordingSimulator()
+    error = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            create_interpreter(ast, simulator, engine, limits).interpret()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    return simulator.actions, error
+
+
+# the same for InterpreterWithSimulator, which pauses the program after every command
+def execute_cooperative(ast, limits=None):
+    simulator = RecordingSimulator()
+    error = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            InterpreterWithSimulator(ast, simulator, limits).run_to_end()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    return simulator.actions, error
+
+
+# best of several runs, the machine noise is otherwise larger than the differences between engines
+def time_engine(engine, ast, limits=None, repeats=3):
+    best = None
+    for _ in range(repeats):
+        simulator = RecordingSimulator()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            create_interpreter(ast, simulator, engine, limits).interpret()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, simulator.actions
+
+
+def compare(title, ast, limits=None):
+    timings = {}
+    reference = None
+    for engine in ENGINES:
+        elapsed, actions = time_engine(engine, ast, limits)
+        if reference is None:
+            reference = actions
+        assert actions == reference, f"engine '{engine}' produced a different action stream"
+        timings[engine] = elapsed
+    print(title)
+    print(f"{'engine':>8} {'seconds':>10} {'speedup':>10}")
+    for engine, elapsed in timings.items():
+        print(f"{engine:>8} {elapsed:>10.3f} {timings['tree'] / elapsed:>9.1f}x")
+
+
+def run(iterations):
+    compare(f"hot loop, {iterations} iterations", parse(HOT_LOOP % iterations))
+    # limits that never fire, so the cost of counting statements, actions and calls shows against the run above
+    compare(f"hot loop with limits, {iterations} iterations", parse(HOT_LOOP % iterations),
+            Limits(max_statements=10 ** 12, max_actions=10 ** 12, max_depth=1000, max_seconds=3600))
+    compare(f"expression loop, {iterations // 10} iterations", parse(EXPRESSION_LOOP % (iterations // 10)))
+    compare(f"return loop, {iterations // 10} iterations", parse(RETURN_LOOP % (iterations // 10)))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
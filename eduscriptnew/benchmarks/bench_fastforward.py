@@ -0,0 +1,69 @@
+# bench_fastforward.py
+#
+# drains a long action queue through HeadlessSimulator, once stepping move_speed / turn_speed per step
+# and once with fast_forward=True, which completes every action in closed form.
+# the final poses are compared before anything is timed.
+#
+# usage: python benchmarks/bench_fastforward.py [actions]
+
+import contextlib
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator import HeadlessSimulator
+
+# a square-ish walk with uneven values, so moves and turns both end on partial steps
+PATTERN = [
+    ('move_forward', 11),
+    ('turn_right', 7),
+    ('move_backward', 5),
+    ('turn_left', 13),
+]
+
+
+def make_simulator(actions, **options):
+    simulator = HeadlessSimulator(**options)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(actions):
+            simulator.enqueue_action(*PATTERN[i % len(PATTERN)])
+    return simulator
+
+
+def drain(simulator):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        result = simulator.run()
+        elapsed = time.perf_counter() - start
+    return result, elapsed
+
+
+def check_poses(actions):
+    stepped, _ = drain(make_simulator(actions))
+    fast, _ = drain(make_simulator(actions, fast_forward=True))
+    if not (math.isclose(stepped.position[0], fast.position[0], abs_tol=1e-6)
+            and math.isclose(stepped.position[1], fast.position[1], abs_tol=1e-6)
+            and math.isclose(stepped.angle, fast.angle, abs_tol=1e-6)
+            and len(stepped.trajectory) == len(fast.trajectory)):
+        raise Exception(f"fast forward diverged: {stepped} vs {fast}")
+    print(f"poses match after {actions} actions: {fast}")
+
+
+def run(actions):
+    check_poses(1000)
+    print(f"{'mode':>20} {'steps':>10} {'seconds':>10} {'actions/s':>12}")
+    modes = [
+        ('stepped', {}),
+        ('fast forward', {'fast_forward': True}),
+        ('fast forward 1.0', {'fast_forward': True, 'sample_resolution': 1.0}),
+    ]
+    for name, options in modes:
+        result, elapsed = drain(make_simulator(actions, **options))
+        print(f"{name:>20} {result.steps:>10} {elapsed:>10.3f} {result.actions / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
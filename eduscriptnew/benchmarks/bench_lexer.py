@@ -0,0 +1,58 @@
+# bench_lexer.py
+#
+# reports tokens per second of lexer.FastLexer and the PLY lexer on a generated program, and how long
+# a whole parse takes with each. the engines take turns and the best run of each counts, so a noisy machine
+# slows both alike.
+# that both engines give the same tokens and errors is checked by tests/test_lexer.py.
+#
+# usage: python benchmarks/bench_lexer.py [statements]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import build_lexer, LEXER_ENGINES
+from parser import build_parser
+from bench_parse import generate_program
+
+
+def lex_time(lexer, source):
+    lexer.lineno = 1
+    lexer.input(source)
+    start = time.perf_counter()
+    count = sum(1 for _ in iter(lexer.token, None))
+    return count, time.perf_counter() - start
+
+
+def run(statements, repeats=7):
+    source = generate_program(statements)
+    print(f"{len(source) / 1024:.0f} KB generated source")
+    lexers = {engine: build_lexer(frozen=True, engine=engine) for engine in LEXER_ENGINES}
+    best = {}
+    for _ in range(repeats):
+        for engine, lexer in lexers.items():
+            count, elapsed = lex_time(lexer, source)
+            best[engine] = min(best.get(engine, elapsed), elapsed)
+    print(f"{'engine':>8} {'tokens':>10} {'seconds':>10} {'tokens/s':>12} {'speedup':>10}")
+    for engine, elapsed in best.items():
+        print(f"{engine:>8} {count:>10} {elapsed:>10.3f} {count / elapsed:>12.0f} {best['ply'] / elapsed:>9.1f}x")
+    # the parse is far slower than lexing, so a smaller program gives the same picture
+    source = generate_program(statements // 10)
+    parsers = {engine: build_parser(frozen=True, lexer=engine) for engine in LEXER_ENGINES}
+    best = {}
+    for _ in range(repeats):
+        for engine, parser in parsers.items():
+            start = time.perf_counter()
+            parser.parse(source)
+            elapsed = time.perf_counter() - start
+            best[engine] = min(best.get(engine, elapsed), elapsed)
+    print(f"parsing {len(source) / 1024:.0f} KB")
+    print(f"{'engine':>8} {'seconds':>10} {'speedup':>10}")
+    for engine, elapsed in best.items():
+        print(f"{engine:>8} {elapsed:>10.3f} {best['ply'] / elapsed:>9.2f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,45 @@
+# bench_logging.py
+#
+# steps a HeadlessSimulator through the same actions with the eduscript loggers at WARNING (silent),
+# INFO (one line per action) and DEBUG (one line per step). the log lines go to os.devnull,
+# so the numbers show the cost of formatting and handling records, not of the terminal.
+#
+# usage: python benchmarks/bench_logging.py [actions]
+
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator import HeadlessSimulator
+
+LEVELS = [('WARNING', logging.WARNING), ('INFO', logging.INFO), ('DEBUG', logging.DEBUG)]
+
+
+def drain(actions, level):
+    logger = logging.getLogger('eduscript')
+    logger.setLevel(level)
+    simulator = HeadlessSimulator()
+    start = time.perf_counter()
+    for i in range(actions):
+        simulator.enqueue_action('move_forward' if i % 2 == 0 else 'turn_left', 20)
+    result = simulator.run()
+    return result, time.perf_counter() - start
+
+
+def run(actions):
+    devnull = open(os.devnull, 'w')
+    logger = logging.getLogger('eduscript')
+    logger.addHandler(logging.StreamHandler(devnull))
+    logger.propagate = False
+    print(f"{'level':>8} {'steps':>10} {'seconds':>10} {'us/step':>10}")
+    for name, level in LEVELS:
+        result, elapsed = drain(actions, level)
+        print(f"{name:>8} {result.steps:>10} {elapsed:>10.3f} {elapsed / result.steps * 1e6:>10.2f}")
+    devnull.close()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
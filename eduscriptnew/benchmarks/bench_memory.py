@@ -0,0 +1,139 @@
+# bench_memory.py
+#
+# measures how much memory a parsed AST keeps alive, per node, with the node classes of parser.py,
+# which keep their fields in __slots__ and their bodies in tuples, and with the layout they had before:
+# the same classes with a __dict__, keeping the lists the grammar rules build.
+# the program comes from bench_parse.generate_program; tracemalloc compares the traced memory
+# before parsing with the memory still held once parsing has finished and only the AST is left.
+#
+# usage: python benchmarks/bench_memory.py [sizes...]
+
+import contextlib
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parser
+from parser import parse, ASTNode
+from bench_parse import generate_program
+
+
+# the node classes as they were before __slots__, the grammar rules build these while dict_layout() is active
+class Program(ASTNode):
+    def __init__(self, functions):
+        self.functions = functions
+
+class FunctionDef(ASTNode):
+    def __init__(self, name, body):
+        self.name = name
+        self.body = body
+
+class Command(ASTNode):
+    def __init__(self, command, args):
+        self.command = command
+        self.args = args
+
+class IfStatement(ASTNode):
+    def __init__(self, condition, if_body, else_body=None):
+        self.condition = condition
+        self.if_body = if_body
+        self.else_body = else_body
+
+class RepeatLoop(ASTNode):
+    def __init__(self, times, body):
+        self.times = times
+        self.body = body
+
+class FunctionCall(ASTNode):
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+class ReturnStatement(ASTNode):
+    def __init__(self, expression):
+        self.expression = expression
+
+class BinaryOp(ASTNode):
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+class UnaryOp(ASTNode):
+    def __init__(self, op, operand):
+        self.op = op
+        self.operand = operand
+
+class Number(ASTNode):
+    def __init__(self, value):
+        self.value = value
+
+class Identifier(ASTNode):
+    def __init__(self, name):
+        self.name = name
+
+DICT_LAYOUT = [Program, FunctionDef, Command, IfStatement, RepeatLoop, FunctionCall, ReturnStatement,
+               BinaryOp, UnaryOp, Number, Identifier]
+
+
+# the grammar rules look the node classes up in the parser module, so swapping them there is enough
+@contextlib.contextmanager
+def dict_layout():
+    saved = {cls.__name__: getattr(parser, cls.__name__) for cls in DICT_LAYOUT}
+    try:
+        for cls in DICT_LAYOUT:
+            setattr(parser, cls.__name__, cls)
+        yield
+    finally:
+        for name, cls in saved.items():
+            setattr(parser, name, cls)
+
+
+# the attribute values of a node, whether it keeps them in __slots__ or in a __dict__
+def fields(node):
+    if hasattr(node, '__dict__'):
+        return list(vars(node).values())
+    return [getattr(node, name) for cls in type(node).__mro__ for name in getattr(cls, '__slots__', ())]
+
+
+# every ASTNode reachable from node, the Program included
+def count_nodes(node):
+    count = 1
+    for value in fields(node):
+        if isinstance(value, ASTNode):
+            count += count_nodes(value)
+        elif isinstance(value, (list, tuple)):
+            count += sum(count_nodes(child) for child in value if isinstance(child, ASTNode))
+    return count
+
+
+def measure(statements):
+    data = generate_program(statements)
+    parse("function main() { }")  # loads the parser tables before anything is traced
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    ast = parse(data)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return retained, count_nodes(ast)
+
+
+def run(sizes):
+    print(f"{'statements':>12} {'nodes':>10} {'layout':>8} {'bytes':>12} {'bytes/node':>12} {'saved':>8}")
+    for size in sizes:
+        with dict_layout():
+            dict_retained, dict_nodes = measure(size)
+        retained, nodes = measure(size)
+        assert nodes == dict_nodes
+        print(f"{size:>12} {nodes:>10} {'dict':>8} {dict_retained:>12} {dict_retained / nodes:>12.1f}")
+        print(f"{size:>12} {nodes:>10} {'slots':>8} {retained:>12} {retained / nodes:>12.1f} "
+              f"{1 - retained / dict_retained:>7.0%}")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
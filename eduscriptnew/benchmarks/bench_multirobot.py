@@ -0,0 +1,91 @@
+# bench_multirobot.py
+#
+# reports robot-steps per second of a multirobot.MultiRobotSimulator for 10, 100 and 1000 robots,
+# against simulating the robots one after the other on HeadlessSimulators. that every robot ends exactly where
+# its program takes a lone HeadlessSimulator is checked by tests/test_multirobot.py. a step of all robots costs a dozen
+# array operations however many robots there are, so a handful of robots is faster one by one and the
+# arrays win from around a hundred.
+#
+# usage: python benchmarks/bench_multirobot.py [robots...]
+
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import parse
+from interpreter import InterpreterWithSimulator
+from simulator import HeadlessSimulator
+from multirobot import MultiRobotSimulator
+from world import World, Segment, Circle, Rect
+
+
+def random_program(rng):
+    return f'''
+    function main() {{
+        repeat({rng.randrange(1, 12)}) {{
+            moveForward({rng.uniform(0, 120):.3f});
+            turnLeft({rng.randrange(0, 180)});
+            if (measureDistance() < 40) {{ turnRight({rng.randrange(90, 270)}); }}
+            moveBackward({rng.randrange(0, 30)});
+        }}
+    }}
+    '''
+
+
+def alone(ast, world=None):
+    simulator = HeadlessSimulator(world=world)
+    error = None
+    try:
+        InterpreterWithSimulator(ast, simulator).run_to_end()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return simulator.result(), error
+
+
+def same_result(a, b):
+    def close(p, q):
+        return all(math.isclose(u, v, abs_tol=1e-9) for u, v in zip(p, q))
+    return (close(a.position, b.position) and math.isclose(a.angle, b.angle, abs_tol=1e-9)
+            and a.steps == b.steps and a.actions == b.actions
+            and len(a.trajectory) == len(b.trajectory) and all(close(p, q) for p, q in zip(a.trajectory, b.trajectory))
+            and [collision.obstacle for collision in a.collisions] == [collision.obstacle for collision in b.collisions])
+
+
+def walled_world():
+    world = World([Circle(500, 250, 30), Rect(550, 350, 60, 60), Segment(300, 100, 350, 500)])
+    world.add_boundary(800, 600)
+    return world
+
+
+def competition(count, seed=7):
+    rng = random.Random(seed)
+    return [parse(f'''
+    function main() {{
+        repeat({rng.randrange(5, 15)}) {{ moveForward({rng.randrange(100, 600)}); turnLeft({rng.randrange(30, 360)}); }}
+    }}
+    ''') for _ in range(count)]
+
+
+def run(sizes):
+    print(f"{'robots':>8} {'robot-steps':>12} {'mode':>12} {'seconds':>10} {'steps/s':>12} {'speedup':>9}")
+    for count in sizes:
+        asts = competition(count)
+        start = time.perf_counter()
+        results = [alone(ast)[0] for ast in asts]
+        sequential = time.perf_counter() - start
+        start = time.perf_counter()
+        batch, errors = MultiRobotSimulator(count).run_programs(asts)
+        vectorized = time.perf_counter() - start
+        steps = sum(result.steps for result in results)
+        assert steps == sum(result.steps for result in batch) and not any(errors)
+        print(f"{count:>8} {steps:>12} {'one by one':>12} {sequential:>10.3f} {steps / sequential:>12.0f} {1:>8.1f}x")
+        print(f"{count:>8} {steps:>12} {'numpy':>12} {vectorized:>10.3f} {steps / vectorized:>12.0f} "
+              f"{sequential / vectorized:>8.1f}x")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000])
@@ -0,0 +1,74 @@
+# bench_optimizer.py
+#
+# times a loop full of constant arithmetic, constant conditions and small fixed repeats on each engine
+# with and without the optimizer.optimize pass, for a few loop iterations run many times and for a long loop.
+# the optimized timings include the pass itself, which on a short script costs about as much as it saves.
+# that the pass keeps every conformance program's actions and errors is checked by tests/test_optimizer.py.
+#
+# usage: python benchmarks/bench_optimizer.py [iterations...]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import parse
+from engines import ENGINES, create_interpreter
+from bench_engines import RecordingSimulator
+
+# what classroom scripts look like: literal arithmetic, always-true guards and short fixed loops
+CONSTANT_LOOP = '''
+function side() {
+    moveForward(10 * 5 + 2);
+    if (1 == 1) {
+        turnRight(360 / 4);
+    } else {
+        turnLeft(360 / 4);
+    }
+}
+function main() {
+    repeat(%d) {
+        repeat(4) { side(); }
+        if (measureDistance() > 2 * 25 && !(3 > 4)) {
+            repeat(3) { moveBackward(1 + 1); turnLeft(45 * 2 - 80); }
+        }
+        if (0) { moveForward(99); }
+    }
+}
+'''
+
+
+# one run of the program, with the pass inside the timing when optimized
+def run_once(engine, ast, optimized):
+    simulator = RecordingSimulator()
+    create_interpreter(ast, simulator, engine, None, optimized).interpret()
+    return simulator.actions
+
+
+# best of several rounds that alternate between the plain and the optimized program, so machine noise hits both alike
+def compare(engine, ast, runs, rounds=5):
+    best = {False: None, True: None}
+    for _ in range(rounds):
+        for optimized in (False, True):
+            start = time.perf_counter()
+            for _ in range(runs):
+                actions = run_once(engine, ast, optimized)
+            elapsed = time.perf_counter() - start
+            best[optimized] = elapsed if best[optimized] is None else min(best[optimized], elapsed)
+    return best[False], best[True]
+
+
+def run(sizes):
+    print(f"{'iterations':>10} {'runs':>6} {'engine':>8} {'plain s':>10} {'optimized s':>12} {'speedup':>10}")
+    for iterations in sizes:
+        ast = parse(CONSTANT_LOOP % iterations)
+        runs = max(1, 2000 // iterations)
+        for engine in ENGINES:
+            assert run_once(engine, ast, True) == run_once(engine, ast, False)
+            plain, fast = compare(engine, ast, runs)
+            print(f"{iterations:>10} {runs:>6} {engine:>8} {plain:>10.3f} {fast:>12.3f} {plain / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [1, 100, 20000])
@@ -0,0 +1,47 @@
+# bench_parse.py
+#
+# measures how parse time grows with program size.
+# a generated main() with N statements should take roughly 10x longer
+# for every 10x more statements if the grammar actions build their lists in linear time.
+#
+# usage: python benchmarks/bench_parse.py [sizes...]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import build_parser
+
+
+# builds a single main() with the requested number of statements,
+# cycling through commands, calls with arguments, ifs and loops so every list rule is exercised
+def generate_program(statements):
+    body = []
+    templates = [
+        "    moveForward({i});",
+        "    turnRight({i} * 2 + 1);",
+        "    if ({i} > 3) {{ moveBackward(1); }} else {{ turnLeft(1); }}",
+        "    repeat(2) {{ moveForward(1); }}",
+    ]
+    for i in range(statements):
+        body.append(templates[i % len(templates)].format(i=i))
+    return "function helper() {\n    return 1;\n}\nfunction main() {\n" + "\n".join(body) + "\n}\n"
+
+
+def run(sizes):
+    parser = build_parser()
+    print(f"{'statements':>12} {'seconds':>10} {'us/stmt':>10}")
+    for size in sizes:
+        data = generate_program(size)
+        start = time.perf_counter()
+        ast = parser.parse(data)
+        elapsed = time.perf_counter() - start
+        assert ast is not None and len(ast.functions[-1].body) == size
+        print(f"{size:>12} {elapsed:>10.3f} {elapsed / size * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    run(sizes)
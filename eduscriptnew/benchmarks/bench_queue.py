@@ -0,0 +1,81 @@
+# bench_queue.py
+#
+# checks that the smallest bounded queue still drains and that a capacity below 1 is rejected instead of hanging.
+# then drains 10^5 and 10^6 actions: first the bare queue against the old list with pop(0),
+# then a fast-forward HeadlessSimulator with an unbounded queue and with a small bounded one,
+# where enqueue_action applies backpressure by stepping the simulator.
+#
+# usage: python benchmarks/bench_queue.py [sizes...]
+
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from action_queue import ActionQueue
+from simulator import HeadlessSimulator
+
+# list.pop(0) is quadratic, above this many items it would take minutes
+LIST_LIMIT = 200000
+
+ACTION = ('move_forward', 3)
+
+
+def drain_list(n):
+    queue = []
+    for _ in range(n):
+        queue.append(ACTION)
+    start = time.perf_counter()
+    while queue:
+        queue.pop(0)
+    return time.perf_counter() - start
+
+
+def drain_action_queue(n):
+    queue = ActionQueue()
+    for _ in range(n):
+        queue.push(ACTION)
+    start = time.perf_counter()
+    while queue:
+        queue.pop()
+    return time.perf_counter() - start
+
+
+# enqueue everything, then run; with a bounded queue most of the stepping happens inside enqueue_action
+def drain_simulator(n, capacity):
+    simulator = HeadlessSimulator(fast_forward=True, queue_capacity=capacity)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for _ in range(n):
+            simulator.enqueue_action(*ACTION)
+        result = simulator.run()
+        elapsed = time.perf_counter() - start
+    if result.actions != n:
+        raise Exception(f"expected {n} completed actions, got {result.actions}")
+    return elapsed
+
+
+def check_capacity():
+    drain_simulator(1000, 1)
+    for capacity in (0, -1):
+        try:
+            HeadlessSimulator(queue_capacity=capacity)
+        except Exception as e:
+            assert 'at least 1' in str(e), e
+        else:
+            raise AssertionError(f"queue_capacity={capacity} was accepted")
+
+
+def run(sizes):
+    check_capacity()
+    print(f"{'actions':>10} {'list pop(0)':>12} {'ActionQueue':>12} {'sim unbounded':>14} {'sim cap 64':>12}")
+    for n in sizes:
+        list_time = f"{drain_list(n):.3f}" if n <= LIST_LIMIT else "skipped"
+        print(f"{n:>10} {list_time:>12} {drain_action_queue(n):>12.3f} "
+              f"{drain_simulator(n, None):>14.3f} {drain_simulator(n, 64):>12.3f}")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
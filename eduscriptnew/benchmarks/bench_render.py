@@ -0,0 +1,112 @@
+# bench_render.py
+#
+# drives robots around a world of obstacles and draws every frame with renderer.Renderer, checking after each
+# frame that the screen holds exactly the pixels of a complete redraw. then compares frames per second of the
+# cached-layer, dirty-rectangle renderer with the previous way of drawing a frame: fill the screen, draw every
+# obstacle and robot, render the text and flip. runs on SDL's dummy video driver unless SDL_VIDEODRIVER is set,
+# so the display itself costs nothing here and only the drawing is measured.
+#
+# usage: python benchmarks/bench_render.py [frames]
+
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from renderer import Renderer
+from world import World, Segment, Circle, Rect
+
+
+def classroom_world(count=300, seed=1):
+    rng = random.Random(seed)
+    obstacles = []
+    for _ in range(count):
+        x, y = rng.uniform(0, 800), rng.uniform(0, 600)
+        kind = rng.randrange(3)
+        if kind == 0:
+            obstacles.append(Segment(x, y, x + rng.uniform(-60, 60), y + rng.uniform(-60, 60)))
+        elif kind == 1:
+            obstacles.append(Circle(x, y, rng.uniform(2, 10)))
+        else:
+            obstacles.append(Rect(x, y, rng.uniform(2, 30), rng.uniform(2, 30)))
+    world = World(obstacles)
+    world.add_boundary(800, 600)
+    return world
+
+
+# count robots on random headings, moving moving of them 2 units per frame and turning
+def frames(count, moving, number, seed=2):
+    rng = random.Random(seed)
+    poses = [[rng.uniform(30, 770), rng.uniform(30, 570), rng.uniform(0, 360)] for _ in range(count)]
+    for frame in range(number):
+        for pose in poses[:moving]:
+            pose[0] = (pose[0] + 2 * math.cos(math.radians(pose[2]))) % 800
+            pose[1] = (pose[1] + 2 * math.sin(math.radians(pose[2]))) % 600
+            pose[2] = (pose[2] + 1) % 360
+        yield [tuple(pose) for pose in poses], f"Position: ({poses[0][0]:.1f}, {poses[0][1]:.1f})"
+
+
+# the way renderer.Simulator.draw_robot drew a frame before: everything, every frame
+def draw_everything(screen, font, world, poses, text):
+    screen.fill((255, 255, 255))
+    for obstacle in world.obstacles:
+        if isinstance(obstacle, Segment):
+            pygame.draw.line(screen, (128, 128, 128), (obstacle.x1, obstacle.y1), (obstacle.x2, obstacle.y2), 2)
+        elif isinstance(obstacle, Circle):
+            pygame.draw.circle(screen, (128, 128, 128), (int(obstacle.x), int(obstacle.y)), int(obstacle.radius))
+        else:
+            pygame.draw.rect(screen, (128, 128, 128), pygame.Rect(obstacle.x, obstacle.y, obstacle.width, obstacle.height))
+    for x, y, angle in poses:
+        pygame.draw.circle(screen, (0, 0, 255), (int(x), int(y)), 20)
+        end = (x + 20 * math.cos(math.radians(angle)), y + 20 * math.sin(math.radians(angle)))
+        pygame.draw.line(screen, (255, 0, 0), (x, y), end, 2)
+    screen.blit(font.render(text, True, (0, 0, 0)), (10, 30))
+    pygame.display.flip()
+
+
+def check_pixels(screen, font, world):
+    reference = pygame.Surface(screen.get_size()).convert()
+    for count, moving in ((1, 1), (1, 0), (5, 3), (60, 60), (150, 20)):
+        renderer = Renderer(screen, font, world)
+        for poses, text in frames(count, moving, 40):
+            renderer.draw(poses, text)
+            draw_everything(reference, font, world, poses, text)
+            if pygame.image.tobytes(screen, 'RGB') != pygame.image.tobytes(reference, 'RGB'):
+                raise AssertionError(f"{count} robots: the screen differs from a full redraw")
+
+
+def frames_per_second(draw, count, moving, number):
+    best = None
+    for _ in range(3):
+        frame_list = list(frames(count, moving, number))
+        start = time.perf_counter()
+        for poses, text in frame_list:
+            draw(poses, text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return number / best
+
+
+def run(number):
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    font = pygame.font.SysFont(None, 24)
+    world = classroom_world()
+    check_pixels(screen, font, world)
+    print(f"pixels: every dirty-rectangle frame equals a full redraw, {len(world.obstacles)} obstacles")
+    print(f"{'robots':>8} {'moving':>8} {'full fps':>10} {'dirty fps':>10} {'speedup':>9}")
+    for count, moving in ((1, 0), (1, 1), (10, 10), (100, 10), (100, 100), (1000, 1000)):
+        full = frames_per_second(lambda poses, text: draw_everything(screen, font, world, poses, text), count, moving, number)
+        renderer = Renderer(screen, font, world)
+        dirty = frames_per_second(renderer.draw, count, moving, number)
+        print(f"{count:>8} {moving:>8} {full:>10.0f} {dirty:>10.0f} {dirty / full:>8.1f}x")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
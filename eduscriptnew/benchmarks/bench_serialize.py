@@ -0,0 +1,47 @@
+# bench_serialize.py
+#
+# compares loading a serialized AST, with serialize.loads and the mmap-based load, against parsing its source
+# for generated programs of growing size. the round trips are checked by tests/test_serialize.py.
+#
+# usage: python benchmarks/bench_serialize.py [sizes...]
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import parse
+from serialize import dumps, loads, dump, load
+from bench_parse import generate_program
+
+
+def best_of(function, repeats=3):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(sizes):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'generated.ast')
+        print(f"{'statements':>12} {'source KB':>10} {'binary KB':>10} {'parse s':>10} {'loads s':>10} {'load s':>10} {'speedup':>10}")
+        for size in sizes:
+            source = generate_program(size)
+            parse_time, ast = best_of(lambda: parse(source))
+            data = dumps(ast)
+            dump(ast, path)
+            loads_time, loaded = best_of(lambda: loads(data))
+            load_time, mapped = best_of(lambda: load(path))
+            assert repr(loaded) == repr(ast) and repr(mapped) == repr(ast)
+            print(f"{size:>12} {len(source) / 1024:>10.0f} {len(data) / 1024:>10.0f} {parse_time:>10.3f} "
+                  f"{loads_time:>10.3f} {load_time:>10.3f} {parse_time / load_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,43 @@
+# bench_startup.py
+#
+# measures cold start: a fresh interpreter process importing the parser and parsing one program.
+# compares the default build_parser() path against the frozen tables loaded by parser.parse().
+#
+# usage: python benchmarks/bench_startup.py [runs]
+
+import os
+import subprocess
+import sys
+import time
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROGRAM = "function main() { moveForward(10); repeat(3) { turnRight(90); } }"
+
+SNIPPETS = {
+    'default': "import parser; parser.build_parser().parse(%r)" % PROGRAM,
+    'frozen': "import parser; parser.parse(%r)" % PROGRAM,
+}
+
+
+def time_snippet(snippet, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', snippet], cwd=PACKAGE_DIR, check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(runs):
+    baseline = time_snippet("pass", runs)
+    print(f"{'mode':>8} {'best ms':>10} {'minus python':>14}")
+    print(f"{'python':>8} {baseline * 1000:>10.1f} {0.0:>14.1f}")
+    for name, snippet in SNIPPETS.items():
+        elapsed = time_snippet(snippet, runs)
+        print(f"{name:>8} {elapsed * 1000:>10.1f} {(elapsed - baseline) * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
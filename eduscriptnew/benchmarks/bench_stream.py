@@ -0,0 +1,72 @@
+# bench_stream.py
+#
+# lexes and parses generated programs from a file, once read into one string and once streamed,
+# and reports time and peak traced memory of both. that streaming gives the same tokens and ASTs
+# is checked by tests/test_stream.py.
+#
+# usage: python benchmarks/bench_stream.py [sizes...]
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import StreamLexer, load_frozen_lexer
+from parser import parse, parse_file
+from bench_parse import generate_program
+
+
+def measure(function):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def lex_whole(path):
+    with open(path) as f:
+        source = f.read()
+    lexer = load_frozen_lexer()
+    lexer.input(source)
+    return sum(1 for _ in iter(lexer.token, None))
+
+
+def lex_streamed(path):
+    with open(path) as f:
+        return sum(1 for _ in StreamLexer(f))
+
+
+def parse_whole(path):
+    with open(path) as f:
+        return parse(f.read())
+
+
+def run(sizes):
+    print(f"{'statements':>12} {'source KB':>10} {'mode':>14} {'seconds':>10} {'peak KB':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'generated.edu')
+        for size in sizes:
+            with open(path, 'w') as f:
+                f.write(generate_program(size))
+            kilobytes = os.path.getsize(path) / 1024
+            assert lex_whole(path) == lex_streamed(path)
+            modes = [
+                ('lex whole', lambda: lex_whole(path)),
+                ('lex streamed', lambda: lex_streamed(path)),
+                ('parse whole', lambda: parse_whole(path)),
+                ('parse streamed', lambda: parse_file(path)),
+            ]
+            for name, function in modes:
+                elapsed, peak = measure(function)
+                print(f"{size:>12} {kilobytes:>10.0f} {name:>14} {elapsed:>10.3f} {peak / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
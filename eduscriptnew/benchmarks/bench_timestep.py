@@ -0,0 +1,77 @@
+# bench_timestep.py
+#
+# runs programs in the visual renderer.Simulator at every speed of renderer.SPEEDS and checks that the robot ends
+# in exactly the pose, path and step count of a HeadlessSimulator, with and without a world of obstacles:
+# the speed only decides how many fixed steps run per frame, never how far a step goes.
+# then reports how long a longer program takes to watch at each speed and how many steps a frame runs.
+# runs on SDL's dummy video driver unless SDL_VIDEODRIVER is set.
+#
+# usage: python benchmarks/bench_timestep.py [distance]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from parser import parse
+from interpreter import InterpreterWithSimulator
+from simulator import HeadlessSimulator
+from renderer import Simulator, SPEEDS
+from world import World, Circle
+from bench_world import WALL_SCRIPT
+
+PROGRAM = '''
+function main() {
+    repeat(2) {
+        moveForward(%d);
+        turnLeft(45);
+        if (measureDistance() < 50) { turnRight(135); }
+        moveBackward(10);
+    }
+}
+'''
+
+
+def watch(ast, speed, world=None):
+    simulator = Simulator(world, speed)
+    interpreter = InterpreterWithSimulator(ast, simulator)
+    interpreter.interpret()
+    frames = 0
+    start = time.perf_counter()
+    while not simulator.is_done(interpreter):
+        pygame.event.pump()
+        simulator.update_display(interpreter)
+        frames += 1
+    return simulator.result(), frames, time.perf_counter() - start
+
+
+def check(ast, world=None):
+    # the window stops the robot at its edges as well
+    simulator = HeadlessSimulator(world=None if world is None else world.bounded(800, 600))
+    InterpreterWithSimulator(ast, simulator).run_to_end()
+    expected = simulator.result()
+    for speed in SPEEDS + (3.5,):
+        result, frames, elapsed = watch(ast, speed, world)
+        if (result.position, result.angle, result.trajectory, result.steps) != \
+                (expected.position, expected.angle, expected.trajectory, expected.steps):
+            raise AssertionError(f"speed {speed} ends differently: {result} != {expected}")
+
+
+def run(distance):
+    pygame.init()
+    check(parse(PROGRAM % 20))
+    check(parse(WALL_SCRIPT.replace('repeat(60)', 'repeat(8)')), World([Circle(470, 300, 20)]))
+    print(f"conformance: speeds {', '.join(str(speed) for speed in SPEEDS)} and 3.5 end in the headless pose")
+    ast = parse(PROGRAM % distance)
+    print(f"{'speed':>6} {'steps':>8} {'frames':>8} {'steps/frame':>12} {'seconds':>9}")
+    for speed in SPEEDS:
+        result, frames, elapsed = watch(ast, speed)
+        print(f"{speed:>6} {result.steps:>8} {frames:>8} {result.steps / frames:>12.1f} {elapsed:>9.2f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,99 @@
+# bench_world.py
+#
+# builds random worlds of segments, circles and rectangles and reports sensor queries per second of the grid-backed
+# world.World.detect_obstacle and measure_distance and of the brute-force scan. that both give the same answers
+# is checked by tests/test_world.py.
+#
+# usage: python benchmarks/bench_world.py [obstacles...]
+
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from world import World, Segment, Circle, Rect
+
+# drives forward until the wall ahead is close, then turns away from it
+WALL_SCRIPT = '''
+function main() {
+    repeat(60) {
+        if (measureDistance() < 25 || detectObstacle()) {
+            turnLeft(90);
+        } else {
+            moveForward(7);
+        }
+    }
+}
+'''
+
+
+# about one obstacle per 60 x 60 units, so a 100 unit ray passes a handful of them
+def random_world(count, seed=1):
+    rng = random.Random(seed)
+    side = math.sqrt(count) * 60
+    obstacles = []
+    for _ in range(count):
+        x, y = rng.uniform(0, side), rng.uniform(0, side)
+        kind = rng.randrange(3)
+        if kind == 0:
+            angle = rng.uniform(0, 2 * math.pi)
+            length = rng.uniform(0, 80)
+            obstacles.append(Segment(x, y, x + length * math.cos(angle), y + length * math.sin(angle)))
+        elif kind == 1:
+            obstacles.append(Circle(x, y, rng.uniform(1, 15)))
+        else:
+            obstacles.append(Rect(x, y, rng.uniform(1, 40), rng.uniform(1, 40)))
+    return World(obstacles), side
+
+
+def random_queries(count, side, seed=2):
+    rng = random.Random(seed)
+    return [(rng.uniform(0, side), rng.uniform(0, side), rng.choice([0, 90, 180, 270, rng.uniform(0, 360)]))
+            for _ in range(count)]
+
+
+def brute_detect(world, x, y):
+    return any(obstacle.distance_to(x, y) <= world.detect_range for obstacle in world.obstacles)
+
+
+def brute_measure(world, x, y, angle):
+    rad = math.radians(angle)
+    dx, dy = math.cos(rad), math.sin(rad)
+    hits = [obstacle.raycast(x, y, dx, dy) for obstacle in world.obstacles]
+    return min([hit for hit in hits if hit is not None] + [world.sensor_range])
+
+
+def queries_per_second(query, queries, repeats=3):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for x, y, angle in queries:
+            query(x, y, angle)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(queries) / best
+
+
+def run(sizes):
+    print(f"{'obstacles':>10} {'cells':>8} {'build s':>8} {'query':>8} {'grid q/s':>12} {'brute q/s':>12} {'speedup':>9}")
+    for size in sizes:
+        start = time.perf_counter()
+        world, side = random_world(size)
+        build = time.perf_counter() - start
+        queries = random_queries(20000, side)
+        modes = [
+            ('detect', lambda x, y, angle: world.detect_obstacle(x, y), lambda x, y, angle: brute_detect(world, x, y)),
+            ('measure', world.measure_distance, lambda x, y, angle: brute_measure(world, x, y, angle)),
+        ]
+        for name, grid_query, brute_query in modes:
+            grid_rate = queries_per_second(grid_query, queries)
+            brute_rate = queries_per_second(brute_query, queries[:20], repeats=1)
+            print(f"{size:>10} {len(world.grid):>8} {build:>8.2f} {name:>8} {grid_rate:>12.0f} {brute_rate:>12.0f} "
+                  f"{grid_rate / brute_rate:>8.0f}x")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
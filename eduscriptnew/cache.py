@@ -0,0 +1,181 @@
+# cache.py
+
+import hashlib
+import os
+import shutil
+from collections import OrderedDict
+from parser import get_parser, parse_with_diagnostics
+import serialize
+from serialize import dumps, SerializationError
+
+# bumped whenever the layout of the cache directory changes
+CACHE_VERSION = 2
+
+# identifies the grammar the cached ASTs were parsed with (see serialize.grammar_signature),
+# the binary AST format version and CACHE_VERSION.
+# regenerating the tables after a grammar change yields a new signature, which invalidates every cached entry
+def grammar_signature():
+    digest = hashlib.sha256(serialize.grammar_signature().encode())
+    digest.update(f"{serialize.FORMAT_VERSION}:{CACHE_VERSION}".encode())
+    return digest.hexdigest()[:16]
+
+# parsed programs keyed by a sha256 of the grammar signature and the source text.
+# the memory tier is an LRU of at most max_entries ASTs. with a directory there is also a disk tier
+# of serialized ASTs (see serialize.py) in directory/<grammar signature>/, trimmed to max_disk_bytes by evicting the least recently used files.
+# directories left behind by other grammar signatures are removed when the cache is created.
+# every process keeps its own index of the disk tier, so with several workers on one directory
+# max_disk_bytes is enforced per process and the directory may briefly grow beyond it.
+# the cached ASTs are shared between callers, which is safe because nothing modifies an AST after parsing
+class ProgramCache:
+    def __init__(self, max_entries=1024, directory=None, max_disk_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.signature = grammar_signature()
+        self.memory = OrderedDict()
+        self.counters = {'hits': 0, 'misses': 0, 'memory_hits': 0, 'disk_hits': 0,
+                         'evictions': 0, 'disk_evictions': 0, 'disk_errors': 0, 'serialize_errors': 0}
+        self.directory = None
+        self.disk = OrderedDict()  # key -> file size, least recently used first
+        self.disk_bytes = 0
+        self.diagnostics = []
+        if directory is not None:
+            self.open_directory(directory)
+
+    def open_directory(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name != self.signature and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+        self.directory = os.path.join(directory, self.signature)
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.ast'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        for mtime, key, size in sorted(entries):
+            self.disk[key] = size
+            self.disk_bytes += size
+
+    def key(self, source):
+        digest = hashlib.sha256(self.signature.encode())
+        digest.update(b'\0')
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    # returns the AST of source, parsing it only on a miss.
+    # like parser.parse it prints the errors and returns None for a program with syntax errors.
+    # self.diagnostics keeps the errors of the last call as lexer.Diagnostic objects. only programs without any are
+    # cached, so a program that parsed despite illegal characters is parsed again and reports them on every call
+    def parse(self, source):
+        key = self.key(source)
+        self.diagnostics = []
+        ast = self.memory.get(key)
+        if ast is not None:
+            self.memory.move_to_end(key)
+            self.counters['hits'] += 1
+            self.counters['memory_hits'] += 1
+            return ast
+        ast = self.load(key)
+        if ast is not None:
+            self.counters['hits'] += 1
+            self.counters['disk_hits'] += 1
+            self.remember(key, ast)
+            return ast
+        self.counters['misses'] += 1
+        result = parse_with_diagnostics(source)
+        self.diagnostics = result.diagnostics
+        ast = get_parser().accept(result)
+        if ast is not None and not self.diagnostics:
+            self.remember(key, ast)
+            self.store(key, ast)
+        return ast
+
+    def remember(self, key, ast):
+        self.memory[key] = ast
+        if len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+            self.counters['evictions'] += 1
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.ast')
+
+    # the file is looked up even if this process has not seen it yet, so worker processes share one directory
+    def load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(self.path(key), 'rb') as f:
+                data = f.read()
+            ast = serialize.loads(data)
+            os.utime(self.path(key))
+        except FileNotFoundError:
+            self.forget(key)
+            return None
+        except (OSError, SerializationError, UnicodeDecodeError, ValueError):
+            # an unreadable entry is dropped and counts as a miss
+            self.counters['disk_errors'] += 1
+            self.forget(key)
+            return None
+        self.forget(key)
+        self.disk[key] = len(data)
+        self.disk_bytes += len(data)
+        return ast
+
+    # written to a temporary file and renamed, so concurrent workers never read a partial entry.
+    # an AST that cannot be serialized, for example one nested too deeply for the encoder's recursion,
+    # is counted and only kept in the memory tier
+    def store(self, key, ast):
+        if self.directory is None:
+            return
+        try:
+            data = dumps(ast)
+        except (SerializationError, RecursionError):
+            self.counters['serialize_errors'] += 1
+            return
+        if len(data) > self.max_disk_bytes:
+            return
+        temporary = self.path(key) + f'.{os.getpid()}.tmp'
+        try:
+            with open(temporary, 'wb') as f:
+                f.write(data)
+            os.replace(temporary, self.path(key))
+        except OSError:
+            self.counters['disk_errors'] += 1
+            return
+        self.forget(key)
+        self.disk[key] = len(data)
+        self.disk_bytes += len(data)
+        while self.disk_bytes > self.max_disk_bytes:
+            oldest = next(iter(self.disk))
+            self.forget(oldest)
+            try:
+                os.remove(self.path(oldest))
+            except OSError:
+                pass
+            self.counters['disk_evictions'] += 1
+
+    def forget(self, key):
+        size = self.disk.pop(key, None)
+        if size is not None:
+            self.disk_bytes -= size
+
+    def clear(self):
+        self.memory.clear()
+        for key in list(self.disk):
+            self.forget(key)
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+
+    # the counters plus the current size of both tiers, as a flat dictionary of numbers
+    def stats(self):
+        stats = dict(self.counters)
+        stats['entries'] = len(self.memory)
+        stats['disk_entries'] = len(self.disk)
+        stats['disk_bytes'] = self.disk_bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,191 @@
+# closures.py
+
+from parser import Command, IfStatement, RepeatLoop, FunctionCall, ReturnStatement, BinaryOp, UnaryOp, Number, Identifier
+from interpreter import Interpreter, Environment
+from compiler import COMMAND_ACTIONS, logical_and, logical_or
+from limits import LimitExceeded
+
+# one closure factory per binary operator, so evaluating an operator is a single specialized call
+# with no string matching. && and || evaluate both operands, like Interpreter.apply_binary_op
+BINARY_CLOSURES = {
+    '+': lambda left, right: lambda: left() + right(),
+    '-': lambda left, right: lambda: left() - right(),
+    '*': lambda left, right: lambda: left() * right(),
+    '/': lambda left, right: lambda: left() / right(),
+    '==': lambda left, right: lambda: left() == right(),
+    '!=': lambda left, right: lambda: left() != right(),
+    '<': lambda left, right: lambda: left() < right(),
+    '<=': lambda left, right: lambda: left() <= right(),
+    '>': lambda left, right: lambda: left() > right(),
+    '>=': lambda left, right: lambda: left() >= right(),
+    '&&': lambda left, right: lambda: logical_and(left(), right()),
+    '||': lambda left, right: lambda: logical_or(left(), right()),
+}
+
+# an execution engine that resolves the whole AST into nested Python closures once, when it is constructed.
+# running a program then only calls closures: there is no isinstance dispatch and no operator lookup left.
+# built-ins, environments and the simulator are shared with Interpreter, so the observable behaviour is the same.
+# statement closures follow Interpreter.execute_statement: they return True when a return statement ran.
+# statements are only counted when the limits need it, otherwise the closures carry no counting code at all
+class ClosureInterpreter(Interpreter):
+    def __init__(self, ast, simulator, limits=None):
+        super().__init__(ast, simulator, limits)
+        self.counting = self.limits.counts_statements()
+        self.bodies = {}
+        for func in ast.functions:
+            self.bodies[func.name] = self.compile_block(func.body)
+
+    def interpret(self):
+        if 'main' not in self.bodies:
+            raise Exception("No 'main' function defined.")
+        self.execute_function('main', [])
+
+    def execute_function(self, name, args):
+        if name in self.built_in_functions:
+            return self.built_in_functions[name](args)
+        elif name in self.bodies:
+            self.depth += 1
+            if self.depth > self.max_depth:
+                raise LimitExceeded('depth', self.max_depth)
+            env = Environment(parent=self.global_env)
+            previous_env = self.current_env
+            self.current_env = env
+            returned = self.bodies[name]()
+            self.current_env = previous_env
+            self.depth -= 1
+            if returned:
+                value = self.return_value
+                self.return_value = None
+                return value
+        else:
+            raise Exception(f"Undefined function '{name}'")
+
+    # a block becomes one closure that runs its statement closures in order.
+    # when statements are counted it first charges the block, plus extra, like Interpreter.execute_statements
+    def compile_block(self, statements, extra=0):
+        compiled = [self.compile_statement(stmt) for stmt in statements]
+        if self.counting:
+            return self.count(self.join(compiled), len(compiled) + extra)
+        return self.join(compiled)
+
+    def join(self, compiled):
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def block():
+            for stmt in compiled:
+                if stmt():
+                    return True
+            return False
+        return block
+
+    def count(self, closure, charge):
+        budget = self.budget
+
+        def counted():
+            budget.remaining -= charge
+            if budget.remaining < 0:
+                budget.exhausted()
+            return closure()
+        return counted
+
+    def compile_statement(self, stmt):
+        if isinstance(stmt, Command):
+            return self.compile_command(stmt)
+        elif isinstance(stmt, IfStatement):
+            condition = self.compile_expression(stmt.condition)
+            if_body = self.compile_block(stmt.if_body)
+            if stmt.else_body is None:
+                def if_statement():
+                    if condition():
+                        return if_body()
+                    return False
+                return if_statement
+            else_body = self.compile_block(stmt.else_body)
+
+            def if_else_statement():
+                if condition():
+                    return if_body()
+                return else_body()
+            return if_else_statement
+        elif isinstance(stmt, RepeatLoop):
+            times = self.compile_expression(stmt.times)
+            # every iteration counts as a statement, so empty loops run into max_statements too
+            body = self.compile_block(stmt.body, 1)
+
+            def repeat_loop():
+                for _ in range(int(times())):
+                    if body():
+                        return True
+                return False
+            return repeat_loop
+        elif isinstance(stmt, FunctionCall):
+            call = self.compile_call(stmt)
+
+            # the called function's return value is discarded, it must not look like a return from this body
+            def call_statement():
+                call()
+                return False
+            return call_statement
+        elif isinstance(stmt, ReturnStatement):
+            expression = self.compile_expression(stmt.expression)
+
+            def return_statement():
+                self.return_value = expression()
+                return True
+            return return_statement
+        else:
+            raise Exception(f"Unknown statement type: {type(stmt)}")
+
+    def compile_command(self, cmd):
+        if cmd.command not in COMMAND_ACTIONS:
+            raise Exception(f"Unknown command '{cmd.command}'")
+        action_type = COMMAND_ACTIONS[cmd.command]
+        enqueue = self.enqueue
+        args = [self.compile_expression(arg) for arg in cmd.args]
+        if len(args) == 1:
+            value = args[0]
+
+            def command():
+                enqueue(action_type, value())
+                return False
+            return command
+
+        # every argument is evaluated, only the first one is used
+        def command_with_arguments():
+            values = [arg() for arg in args]
+            enqueue(action_type, values[0])
+            return False
+        return command_with_arguments
+
+    def compile_expression(self, expr):
+        if isinstance(expr, Number):
+            value = expr.value
+            return lambda: value
+        elif isinstance(expr, Identifier):
+            name = expr.name
+            return lambda: self.current_env.get(name)
+        elif isinstance(expr, BinaryOp):
+            if expr.op not in BINARY_CLOSURES:
+                raise Exception(f"Unknown binary operator '{expr.op}'")
+            return BINARY_CLOSURES[expr.op](self.compile_expression(expr.left), self.compile_expression(expr.right))
+        elif isinstance(expr, UnaryOp):
+            if expr.op != '!':
+                raise Exception(f"Unknown unary operator '{expr.op}'")
+            operand = self.compile_expression(expr.operand)
+            return lambda: not operand()
+        elif isinstance(expr, FunctionCall):
+            return self.compile_call(expr)
+        else:
+            raise Exception(f"Unknown expression type: {type(expr)}")
+
+    # built-ins are bound directly; user functions are looked up when called,
+    # so calling an undefined function still fails only if that call actually runs
+    def compile_call(self, call):
+        name = call.name
+        args = call.args
+        if name in self.built_in_functions:
+            built_in = self.built_in_functions[name]
+            return lambda: built_in(args)
+        execute_function = self.execute_function
+        return lambda: execute_function(name, args)
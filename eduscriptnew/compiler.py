@@ -0,0 +1,308 @@
+# compiler.py
+
+import operator
+from parser import Command, IfStatement, RepeatLoop, FunctionCall, ReturnStatement, BinaryOp, UnaryOp, Number, Identifier
+
+# opcodes of the EduScript bytecode.
+# every instruction is an (opcode, argument) pair, instructions that need no argument carry None.
+# the VM keeps the top of the value stack in a local variable, "top" below means that cached value.
+# the *_OP_CONST forms are superinstructions that fuse a binary operator whose right operand is a constant
+# into the instruction around it, they cover the arithmetic-on-a-sensor pattern of typical loops.
+# the numbering follows how often each instruction runs in loop-heavy scripts,
+# because the VM tests them in this order. the two counting instructions come right after the loop test,
+# with limits they run once per loop iteration and branch, without limits they are never emitted
+COMMAND_CONST          = 0   # enqueue the robot action arg[0] with the constant value arg[1]
+SENSOR_OP_CONST        = 1   # push arg[1](<simulator method arg[0]>(), arg[2])
+COMMAND_OP_CONST       = 2   # pop a value and enqueue the robot action arg[0] with arg[1](value, arg[2])
+FOR_ITER               = 3   # if the loop counter on top is positive decrement it and jump to arg[0], otherwise pop it and jump to arg[1]
+FOR_ITER_TICK          = 4   # FOR_ITER that also charges arg[2] statements for the iteration it starts, only emitted when statements are counted
+TICK                   = 5   # charge arg statements to the interpreter's limits.Budget, only emitted when statements are counted
+CALL_SENSOR            = 6   # push the result of the zero-argument simulator method named by arg
+POP_JUMP_IF_FALSE      = 7   # pop a value and jump to arg if it is falsy
+OP_CONST_JUMP_IF_FALSE = 8   # pop a value and jump to arg[2] if arg[0](value, arg[1]) is falsy
+JUMP                   = 9   # jump to arg
+LOAD_CONST             = 10  # push arg
+BINARY_OP_CONST        = 11  # top = arg[0](top, arg[1])
+COMMAND                = 12  # pop a value and enqueue the robot action named by arg with it
+BINARY_OP              = 13  # pop the right operand and replace the left one with arg(left, right)
+CALL_FUNCTION          = 14  # push the result of the user function named by arg
+POP_TOP                = 15  # discard the top of the stack
+RETURN_VALUE           = 16  # return the top of the stack from the current function
+UNARY_NOT              = 17  # replace the top with its logical negation
+GET_ITER               = 18  # replace the loop count on top with int(count)
+LOAD_NAME              = 19  # push the value of the variable named by arg
+CALL_BUILTIN           = 20  # push the result of a built-in called through the interpreter, arg = (name, argument expressions)
+COMMAND_N              = 21  # pop arg[1] values and enqueue the robot action arg[0] with the first one
+
+OPNAMES = {
+    COMMAND_CONST: 'COMMAND_CONST',
+    SENSOR_OP_CONST: 'SENSOR_OP_CONST',
+    COMMAND_OP_CONST: 'COMMAND_OP_CONST',
+    FOR_ITER: 'FOR_ITER',
+    FOR_ITER_TICK: 'FOR_ITER_TICK',
+    TICK: 'TICK',
+    CALL_SENSOR: 'CALL_SENSOR',
+    POP_JUMP_IF_FALSE: 'POP_JUMP_IF_FALSE',
+    OP_CONST_JUMP_IF_FALSE: 'OP_CONST_JUMP_IF_FALSE',
+    JUMP: 'JUMP',
+    LOAD_CONST: 'LOAD_CONST',
+    BINARY_OP_CONST: 'BINARY_OP_CONST',
+    COMMAND: 'COMMAND',
+    BINARY_OP: 'BINARY_OP',
+    CALL_FUNCTION: 'CALL_FUNCTION',
+    POP_TOP: 'POP_TOP',
+    RETURN_VALUE: 'RETURN_VALUE',
+    UNARY_NOT: 'UNARY_NOT',
+    GET_ITER: 'GET_ITER',
+    LOAD_NAME: 'LOAD_NAME',
+    CALL_BUILTIN: 'CALL_BUILTIN',
+    COMMAND_N: 'COMMAND_N',
+}
+
+# EduScript's && and || evaluate both operands and return one of them, like Interpreter.apply_binary_op
+def logical_and(left, right):
+    return left and right
+
+def logical_or(left, right):
+    return left or right
+
+# binary operators resolved once at compile time instead of string-matched on every evaluation
+BINARY_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '&&': logical_and,
+    '||': logical_or,
+}
+
+# robot commands and the simulator action each one enqueues
+COMMAND_ACTIONS = {
+    'moveForward': 'move_forward',
+    'moveBackward': 'move_backward',
+    'turnRight': 'turn_right',
+    'turnLeft': 'turn_left',
+}
+
+# built-ins and the simulator method behind each of them.
+# these names always resolve to the built-in, even if the program defines a function with the same name
+SENSOR_METHODS = {
+    'detectObstacle': 'detect_obstacle',
+    'measureDistance': 'measure_distance',
+}
+
+# compiled form of one EduScript function
+class CodeObject:
+    def __init__(self, name, code):
+        self.name = name
+        self.code = code
+
+    def __repr__(self):
+        return f"CodeObject(name={self.name}, instructions={len(self.code)})"
+
+# raised for constructs the compiler cannot translate
+class CompileError(Exception):
+    pass
+
+# translates a Program into a dictionary of CodeObjects keyed by function name.
+# like Interpreter.interpret, a later definition with the same name replaces an earlier one.
+# count_statements=True adds a TICK wherever Interpreter.execute_statements charges the budget
+def compile_program(program, count_statements=False):
+    return {func.name: compile_function(func, count_statements) for func in program.functions}
+
+def compile_function(func, count_statements=False):
+    compiler = FunctionCompiler(count_statements)
+    compiler.compile_statements(func.body)
+    # falling off the end of a function returns None, just like the tree-walking interpreter
+    compiler.emit(LOAD_CONST, None)
+    compiler.emit(RETURN_VALUE)
+    return CodeObject(func.name, tuple(thread_jumps(compiler.code)))
+
+# replaces every JUMP that lands on a FOR_ITER, JUMP or RETURN_VALUE with a copy of that instruction.
+# the end of an if-branch inside a loop then goes straight back to the loop test, saving a dispatch per iteration.
+# copying is only valid for instructions that never fall through, which is why FOR_ITER names both of its exits
+def thread_jumps(code):
+    threaded = list(code)
+    for index, (op, arg) in enumerate(code):
+        if op != JUMP:
+            continue
+        seen = set()
+        target_op, target_arg = code[arg]
+        while target_op == JUMP and arg not in seen:
+            seen.add(arg)
+            arg = target_arg
+            target_op, target_arg = code[arg]
+        if target_op in (FOR_ITER, FOR_ITER_TICK, RETURN_VALUE):
+            threaded[index] = (target_op, target_arg)
+        else:
+            threaded[index] = (JUMP, arg)
+    return threaded
+
+# emits the instructions of a single function body into a flat list.
+# jump targets are absolute instruction indexes, patched once the target is known
+class FunctionCompiler:
+    def __init__(self, count_statements=False):
+        self.code = []
+        self.count_statements = count_statements
+
+    def emit(self, op, arg=None):
+        self.code.append((op, arg))
+        return len(self.code) - 1
+
+    # jump targets are always the argument itself or the last element of a tuple argument
+    def patch(self, index, target):
+        op, arg = self.code[index]
+        self.code[index] = (op, arg[:-1] + (target,) if isinstance(arg, tuple) else target)
+
+    def compile_statements(self, statements):
+        if self.count_statements and statements:
+            self.emit(TICK, len(statements))
+        for stmt in statements:
+            self.compile_statement(stmt)
+
+    def compile_statement(self, stmt):
+        if isinstance(stmt, Command):
+            if stmt.command not in COMMAND_ACTIONS:
+                raise CompileError(f"Unknown command '{stmt.command}'")
+            action_type = COMMAND_ACTIONS[stmt.command]
+            value = constant_value(stmt.args[0]) if len(stmt.args) == 1 else NOT_CONSTANT
+            if value is not NOT_CONSTANT:
+                self.emit(COMMAND_CONST, (action_type, value))
+                return
+            if len(stmt.args) == 1:
+                tail = self.compile_split(stmt.args[0])
+                if tail is None:
+                    self.emit(COMMAND, action_type)
+                else:
+                    self.emit(COMMAND_OP_CONST, (action_type,) + tail)
+                return
+            for arg in stmt.args:
+                self.compile_expression(arg)
+            self.emit(COMMAND_N, (action_type, len(stmt.args)))
+        elif isinstance(stmt, IfStatement):
+            tail = self.compile_split(stmt.condition)
+            if tail is None:
+                jump_to_else = self.emit(POP_JUMP_IF_FALSE)
+            else:
+                jump_to_else = self.emit(OP_CONST_JUMP_IF_FALSE, tail + (None,))
+            self.compile_statements(stmt.if_body)
+            if stmt.else_body is not None:
+                jump_to_end = self.emit(JUMP)
+                self.patch(jump_to_else, len(self.code))
+                self.compile_statements(stmt.else_body)
+                self.patch(jump_to_end, len(self.code))
+            else:
+                self.patch(jump_to_else, len(self.code))
+        elif isinstance(stmt, RepeatLoop):
+            # the loop counter lives on the value stack for the duration of the loop.
+            # the test sits at the bottom, so every iteration costs a single FOR_ITER
+            self.compile_expression(stmt.times)
+            self.emit(GET_ITER)
+            jump_to_test = self.emit(JUMP)
+            body_start = len(self.code)
+            for body_stmt in stmt.body:
+                self.compile_statement(body_stmt)
+            self.patch(jump_to_test, len(self.code))
+            if self.count_statements:
+                # every iteration counts as a statement, so empty loops run into max_statements too.
+                # the loop test charges the body itself, instead of a TICK at its start
+                self.emit(FOR_ITER_TICK, (body_start, len(self.code) + 1, len(stmt.body) + 1))
+            else:
+                self.emit(FOR_ITER, (body_start, len(self.code) + 1))
+        elif isinstance(stmt, FunctionCall):
+            self.compile_call(stmt)
+            self.emit(POP_TOP)
+        elif isinstance(stmt, ReturnStatement):
+            self.compile_expression(stmt.expression)
+            self.emit(RETURN_VALUE)
+        else:
+            raise CompileError(f"Unknown statement type: {type(stmt)}")
+
+    def compile_expression(self, expr):
+        value = constant_value(expr)
+        if value is not NOT_CONSTANT:
+            self.emit(LOAD_CONST, value)
+        elif isinstance(expr, Identifier):
+            self.emit(LOAD_NAME, expr.name)
+        elif isinstance(expr, BinaryOp):
+            if expr.op not in BINARY_OPERATORS:
+                raise CompileError(f"Unknown binary operator '{expr.op}'")
+            right = constant_value(expr.right)
+            if right is NOT_CONSTANT:
+                self.compile_expression(expr.left)
+                self.compile_expression(expr.right)
+                self.emit(BINARY_OP, BINARY_OPERATORS[expr.op])
+            elif is_sensor_call(expr.left):
+                self.emit(SENSOR_OP_CONST, (SENSOR_METHODS[expr.left.name], BINARY_OPERATORS[expr.op], right))
+            else:
+                self.compile_expression(expr.left)
+                self.emit(BINARY_OP_CONST, (BINARY_OPERATORS[expr.op], right))
+        elif isinstance(expr, UnaryOp):
+            if expr.op != '!':
+                raise CompileError(f"Unknown unary operator '{expr.op}'")
+            self.compile_expression(expr.operand)
+            self.emit(UNARY_NOT)
+        elif isinstance(expr, FunctionCall):
+            self.compile_call(expr)
+        else:
+            raise CompileError(f"Unknown expression type: {type(expr)}")
+
+    # compiles an expression except for a trailing "operator, constant" step, which is returned
+    # as (operator function, constant) so the caller can fuse it into a COMMAND or a jump
+    def compile_split(self, expr):
+        if isinstance(expr, BinaryOp) and expr.op in BINARY_OPERATORS and constant_value(expr) is NOT_CONSTANT:
+            right = constant_value(expr.right)
+            if right is not NOT_CONSTANT:
+                self.compile_expression(expr.left)
+                return (BINARY_OPERATORS[expr.op], right)
+        self.compile_expression(expr)
+        return None
+
+    # call arguments are never evaluated: built-ins only check how many were given
+    # and user functions take no parameters, which matches Interpreter.execute_function
+    def compile_call(self, call):
+        if call.name in SENSOR_METHODS:
+            if call.args:
+                # keeps the interpreter's "takes no arguments" error at run time
+                self.emit(CALL_BUILTIN, (call.name, call.args))
+            else:
+                self.emit(CALL_SENSOR, SENSOR_METHODS[call.name])
+        else:
+            self.emit(CALL_FUNCTION, call.name)
+
+NOT_CONSTANT = object()
+
+def is_sensor_call(expr):
+    return isinstance(expr, FunctionCall) and expr.name in SENSOR_METHODS and not expr.args
+
+# value of an expression built only from number literals, or NOT_CONSTANT.
+# operations that would raise, such as division by zero, are left for run time
+def constant_value(expr):
+    if isinstance(expr, Number):
+        return expr.value
+    elif isinstance(expr, BinaryOp) and expr.op in BINARY_OPERATORS:
+        left = constant_value(expr.left)
+        right = constant_value(expr.right)
+        if left is NOT_CONSTANT or right is NOT_CONSTANT:
+            return NOT_CONSTANT
+        try:
+            return BINARY_OPERATORS[expr.op](left, right)
+        except ArithmeticError:
+            return NOT_CONSTANT
+    elif isinstance(expr, UnaryOp) and expr.op == '!':
+        operand = constant_value(expr.operand)
+        return NOT_CONSTANT if operand is NOT_CONSTANT else not operand
+    return NOT_CONSTANT
+
+# readable listing of a CodeObject, handy when debugging the compiler
+def disassemble(code_object):
+    lines = [f"{code_object.name}:"]
+    for index, (op, arg) in enumerate(code_object.code):
+        lines.append(f"  {index:>4} {OPNAMES[op]:<18} {'' if arg is None else repr(arg)}")
+    return "\n".join(lines)
@@ -0,0 +1,24 @@
+# engines.py
+
+from interpreter import Interpreter
+from closures import ClosureInterpreter
+from vm import VirtualMachine
+from optimizer import optimize as optimize_program
+
+# the interchangeable execution engines. all of them take (ast, simulator, limits=None), expose interpret()
+# and enqueue the same actions as the tree-walking Interpreter
+ENGINES = {
+    'tree': Interpreter,
+    'closure': ClosureInterpreter,
+    'vm': VirtualMachine,
+}
+
+# builds an interpreter for the program using the engine chosen by name, limits is an optional limits.Limits.
+# optimize=True runs the program through optimizer.optimize first. the vm's compiler folds constants itself,
+# so for the vm the pass only prunes and unrolls, which keeps it cheaper than the compiling it saves
+def create_interpreter(ast, simulator, engine='tree', limits=None, optimize=False):
+    if engine not in ENGINES:
+        raise Exception(f"Unknown engine '{engine}', expected one of: {', '.join(ENGINES)}")
+    if optimize:
+        ast = optimize_program(ast, fold=engine != 'vm')
+    return ENGINES[engine](ast, simulator, limits)
@@ -1,11 +1,15 @@
 # interpreter.py
 
-import pygame
+import logging
 import sys
 import time
 from parser import build_parser, Program, FunctionDef, Command, IfStatement, RepeatLoop, FunctionCall, ReturnStatement, BinaryOp, UnaryOp, Number, Identifier
+from simulator import HeadlessSimulator
+from limits import Limits, Budget, LimitExceeded
 import textwrap
-import math
+
+# built-in sensor calls are traced at DEBUG
+logger = logging.getLogger('eduscript.interpreter')
 
 class Environment:
     # initializing an environment with an empty variable dictionary
@@ -28,17 +32,29 @@ class Environment:
     def set(self, name, value):
         self.vars[name] = value
 
+# limits is an optional limits.Limits, running into one raises limits.LimitExceeded
 class Interpreter:
-    def __init__(self, ast, simulator):
+    def __init__(self, ast, simulator, limits=None):
         self.ast = ast # Abstract Syntax Tree generated by the parser
         self.functions = {} # dictionary to store user-defined functions
         self.global_env = Environment() # global environment for variable storage
         self.current_env = self.global_env
+        self.return_value = None # value of the return statement that is currently unwinding a function body
         self.simulator = simulator  # reference to the Simulator responsible for executing the robot actions
         self.built_in_functions = {
             'detectObstacle': self.built_in_detect_obstacle,
             'measureDistance': self.built_in_measure_distance
         }
+        self.limits = limits or Limits()
+        self.budget = Budget(self.limits) # counts statements against max_statements and max_seconds
+        self.depth = 0 # nesting of user function calls
+        self.max_depth = sys.maxsize if self.limits.max_depth is None else self.limits.max_depth
+        self.actions = 0
+        # every engine enqueues through self.enqueue, which only counts actions when there is a limit for them
+        if self.limits.max_actions is None:
+            self.enqueue = simulator.enqueue_action
+        else:
+            self.enqueue = self.enqueue_limited
 
     def interpret(self):
         for func in self.ast.functions:
@@ -55,64 +71,95 @@ class Interpreter:
             return self.built_in_functions[name](args)
         elif name in self.functions:
             func = self.functions[name]
+            self.depth += 1
+            if self.depth > self.max_depth:
+                raise LimitExceeded('depth', self.max_depth)
             env = Environment(parent=self.global_env)
             previous_env = self.current_env
             self.current_env = env
-            try:
-                self.execute_statements(func.body)
-            except ReturnException as ret:
-                self.current_env = previous_env
-                return ret.value
+            returned = self.execute_statements(func.body)
             self.current_env = previous_env
+            self.depth -= 1
+            if returned:
+                value = self.return_value
+                self.return_value = None
+                return value
         else:
             raise Exception(f"Undefined function '{name}'")
 
 # iterates through a list of statements and executes each one
+# returns True as soon as a return statement ran, which stops the enclosing blocks one by one
+# until execute_function picks up self.return_value. no exception is raised or caught on the way
+# the whole block is charged to the statement budget before its first statement runs
     def execute_statements(self, statements):
+        budget = self.budget
+        budget.remaining -= len(statements)
+        if budget.remaining < 0:
+            budget.exhausted()
         for stmt in statements:
-            self.execute_statement(stmt)
+            if self.execute_statement(stmt):
+                return True
+        return False
 # determining the type of statement and delegates execution to the appropriate method
+# returns True if the statement executed a return, False otherwise
     def execute_statement(self, stmt):
         if isinstance(stmt, Command):
             self.execute_command(stmt)
         elif isinstance(stmt, IfStatement):
             condition = self.evaluate_expression(stmt.condition)
             if condition:
-                self.execute_statements(stmt.if_body)
+                return self.execute_statements(stmt.if_body)
             elif stmt.else_body is not None:
-                self.execute_statements(stmt.else_body)
+                return self.execute_statements(stmt.else_body)
         elif isinstance(stmt, RepeatLoop):
             times = self.evaluate_expression(stmt.times)
+            budget = self.budget
             for _ in range(int(times)):
-                self.execute_statements(stmt.body)
+                # every iteration counts as a statement, so empty loops run into max_statements too
+                budget.remaining -= 1
+                if budget.remaining < 0:
+                    budget.exhausted()
+                if self.execute_statements(stmt.body):
+                    return True
         elif isinstance(stmt, FunctionCall):
             self.execute_function(stmt.name, stmt.args)
         elif isinstance(stmt, ReturnStatement):
-            value = self.evaluate_expression(stmt.expression)
-            raise ReturnException(value)
+            self.return_value = self.evaluate_expression(stmt.expression)
+            return True
         else:
             raise Exception(f"Unknown statement type: {type(stmt)}")
+        return False
 
 #  maps EduScript commands (moveForward, turnRight, etc.) to simulator actions by enqueuing them
     def execute_command(self, cmd):
-        command = cmd.command
         args = [self.evaluate_expression(arg) for arg in cmd.args]
+        self.enqueue_command(cmd.command, args)
+
+# enqueues the action of one command whose arguments have already been evaluated
+    def enqueue_command(self, command, args):
         # implementing the robotic commands
         if command == 'moveForward':
             distance = args[0]
-            self.simulator.enqueue_action('move_forward', distance)
+            self.enqueue('move_forward', distance)
         elif command == 'moveBackward':
             distance = args[0]
-            self.simulator.enqueue_action('move_backward', distance)
+            self.enqueue('move_backward', distance)
         elif command == 'turnRight':
             angle = args[0]
-            self.simulator.enqueue_action('turn_right', angle)
+            self.enqueue('turn_right', angle)
         elif command == 'turnLeft':
             angle = args[0]
-            self.simulator.enqueue_action('turn_left', angle)
+            self.enqueue('turn_left', angle)
         else:
             raise Exception(f"Unknown command '{command}'")
 
+# counts robot commands against max_actions before passing them on to the simulator
+    def enqueue_limited(self, action_type, value):
+        self.actions += 1
+        if self.actions > self.limits.max_actions:
+            raise LimitExceeded('actions', self.limits.max_actions)
+        self.simulator.enqueue_action(action_type, value)
+
 # recursively evaluates expressions, handling numbers, identifiers, binary operations, unary operations, and function calls
     def evaluate_expression(self, expr):
         if isinstance(expr, Number):
@@ -170,7 +217,7 @@ class Interpreter:
         if len(args) != 0:
             raise Exception("detectObstacle() takes no arguments.")
         obstacle_detected = self.simulator.detect_obstacle()
-        print(f"detectObstacle() called, returning {obstacle_detected}")
+        logger.debug("detectObstacle() called, returning %s", obstacle_detected)
         return obstacle_detected
 
 # simulates distance measurement (currently returns a fixed value of 100).
@@ -179,180 +226,145 @@ class Interpreter:
         if len(args) != 0:
             raise Exception("measureDistance() takes no arguments.")
         distance = self.simulator.measure_distance()
-        print(f"measureDistance() called, returning {distance}")
+        logger.debug("measureDistance() called, returning %s", distance)
         return distance
 
-class ReturnException(Exception):
-    def __init__(self, value):
-        self.value = value
-
-class Simulator:
-    def __init__(self):
-        pygame.init() # initialzing pygame
-        self.width, self.height = 800, 600
-        self.screen = pygame.display.set_mode((self.width, self.height))
-        pygame.display.set_caption("EduScript Robot Simulation")
-        self.clock = pygame.time.Clock()
-        self.robot_pos = [400.0, 300.0]  #  robot's starting position at the center of the window
-        self.robot_angle = 0  # initializing the robots's angle , 0 degrees pointing to the right
-        self.robot_size = 20
-        self.font = pygame.font.SysFont(None, 24)
-
-        # initializing the action_queue, current_action, and action_progress to manage robot actions
-        self.action_queue = []
-        self.current_action = None
-        self.action_progress = 0  # tracking progress within the current action
-
-        self.move_speed = 2  # units per frame
-        self.turn_speed = 2  # degrees per frame
-
-    def enqueue_action(self, action_type, value):
-        # action_type: Type of action (move_forward, turn_right, etc.).
-        # value: Distance (units) or angle (degrees) associated with the action.
-        # adds the action to the action_queue and prints a message indicating the enqueued action
-        self.action_queue.append((action_type, value))
-        print(f"Enqueued action: {action_type} with value {value}")
-
-    def update_actions(self):
-        # if no action is currently being executed (current_action is None) and there are actions in the queue, 
-        # dequeues the next action and starts it
-        if self.current_action is None and self.action_queue:
-            self.current_action = self.action_queue.pop(0)
-            self.action_progress = 0
-            print(f"Starting action: {self.current_action}")
-        
-        # Action Execution:
-        # Movement:
-        # calculates the direction (1 for forward, -1 for backward)
-        # determines the step size based on move_speed and remaining distance
-        # updates robot_pos by adding delta_x and delta_y based on the current angle and step size
-        # increments action_progress by the step size
-        # marks the action as completed if the target distance is reached
-        if self.current_action:
-            action_type, value = self.current_action
-            if action_type in ['move_forward', 'move_backward']:
-                direction = 1 if action_type == 'move_forward' else -1
-                distance_remaining = value - self.action_progress
-                step = self.move_speed if distance_remaining > self.move_speed else distance_remaining
-                rad = math.radians(self.robot_angle)
-                delta_x = direction * step * math.cos(rad)
-                delta_y = direction * step * math.sin(rad)
-                self.robot_pos[0] += delta_x
-                self.robot_pos[1] += delta_y
-                self.action_progress += step
-                print(f"Moving {'forward' if direction ==1 else 'backward'}: Step {self.action_progress}/{value}")
-
-                if self.action_progress >= value:
-                    print(f"Completed action: {action_type}")
-                    self.current_action = None
-            # turning:
-            # determines the direction (-1 for right, 1 for left).
-            # calculates the step size based on turn_speed and remaining angle.
-            # updates robot_angle by adding the step size, ensuring it wraps around at 360 degrees.
-            # increments action_progress by the step size.
-            # marks the action as completed if the target angle is reached.
-            elif action_type in ['turn_right', 'turn_left']:
-                direction = -1 if action_type == 'turn_right' else 1
-                angle_remaining = value - self.action_progress
-                step = self.turn_speed if angle_remaining > self.turn_speed else angle_remaining
-                self.robot_angle += direction * step
-                self.robot_angle %= 360
-                self.action_progress += step
-                print(f"Turning {'right' if direction == -1 else 'left'}: Step {self.action_progress}/{value}")
-
-                if self.action_progress >= value:
-                    print(f"Completed action: {action_type}")
-                    self.current_action = None
-
-    def move_forward(self, distance):
-        self.enqueue_action('move_forward', distance)
-
-    def move_backward(self, distance):
-        self.enqueue_action('move_backward', distance)
-
-    def turn_right(self, angle):
-        self.enqueue_action('turn_right', angle)
-
-    def turn_left(self, angle):
-        self.enqueue_action('turn_left', angle)
-
-    def detect_obstacle(self):
-        obstacle_detected = False
-        return obstacle_detected
+# inherits from the Interpreter class and runs the program cooperatively with the simulator.
+# the program is a generator: every robot command enqueues its action and then yields,
+# wherever it is (inside repeat, if or any depth of function calls), and it is resumed once the simulator is idle again.
+# so only one action is ever queued, and sensors read the pose after every earlier action has finished.
+# the run_* methods mirror execute_* / evaluate_expression in Interpreter; they return their results through StopIteration
+class InterpreterWithSimulator(Interpreter):
+    def __init__(self, ast, simulator, limits=None):
+        super().__init__(ast, simulator, limits)
+        self.program = None # the suspended main() generator, None before interpret() and once the program has ended
 
-    def measure_distance(self):
-        distance = 100  
-        return distance
+    def interpret(self):
+        for func in self.ast.functions:
+            self.functions[func.name] = func
 
-    def draw_robot(self):
-        self.screen.fill((255, 255, 255))  # White background
-
-        pygame.draw.circle(
-            self.screen,
-            (0, 0, 255),  # blue color
-            (int(self.robot_pos[0]), int(self.robot_pos[1])),
-            self.robot_size
-        )
-
-        # direction indicator
-        end_x = self.robot_pos[0] + self.robot_size * math.cos(math.radians(self.robot_angle))
-        end_y = self.robot_pos[1] + self.robot_size * math.sin(math.radians(self.robot_angle))
-        pygame.draw.line(
-            self.screen,
-            (255, 0, 0),  # red color
-            self.robot_pos,
-            (end_x, end_y),
-            2  
-        )
-
-        # robot position
-        position_text = f"Position: ({self.robot_pos[0]:.1f}, {self.robot_pos[1]:.1f})"
-        text_surface = self.font.render(position_text, True, (0, 0, 0))
-        self.screen.blit(text_surface, (10, 30))
-
-        pygame.display.flip()
-
-    def update_display(self):
-        # Update robot actions
-        self.update_actions()
-
-        # Draw the robot
-        self.draw_robot()
-
-        # Control the loop speed
-        self.clock.tick(60)
-
-# inherits from the Interpreter class, extending its functionality to integrate with the simulator's action queue
-class InterpreterWithSimulator(Interpreter):
-    def __init__(self, ast, simulator):
-        super().__init__(ast, simulator)
-        self.command_queue = [] # command_queue to hold EduScript commands
-        self.populate_command_queue(ast) # fill the queue with commands from the main function
-
-    def populate_command_queue(self, ast):
-    # Iterates through all functions in the AST.
-    # if a function named main is found, its body (list of statements) is added to the command_queue.
-        for func in ast.functions:
-            if func.name == 'main':
-                self.command_queue.extend(func.body)
-
-    # dequeues the next command from command_queue
-    def execute_next_command(self):
-        if self.command_queue:
-            stmt = self.command_queue.pop(0)
-            self.execute_statement(stmt)
+        if 'main' not in self.functions:
+            raise Exception("No 'main' function defined.")
+
+        self.program = self.run_function('main', [])
+        self.resume()
+
+    # runs the program until it emits its next robot command or ends
+    def resume(self):
+        try:
+            next(self.program)
+        except StopIteration:
+            self.program = None
+        except Exception:
+            self.program = None
+            raise
+
+    def is_finished(self):
+        return self.program is None
 
     def update(self):
-        # Checks if the simulator is idle (no current_action).
-        # if idle and commands are pending, executes the next command.
-        if not self.simulator.current_action and self.command_queue:
+        # resumes the program once the simulator has finished the action it emitted last
+        if self.program is not None and self.simulator.is_idle():
             try:
-                self.execute_next_command()
+                self.resume()
             except Exception as e:
-                print(f"Error during interpretation: {e}")
+                logger.error("Error during interpretation: %s", e)
+
+    # drives a simulator without a frame loop: after every command the simulator runs until it is idle
+    def run_to_end(self):
+        self.interpret()
+        while self.program is not None:
+            self.simulator.drain()
+            self.resume()
+        self.simulator.drain()
+
+    def run_function(self, name, args):
+        if name in self.built_in_functions:
+            return self.built_in_functions[name](args)
+        elif name in self.functions:
+            func = self.functions[name]
+            self.depth += 1
+            if self.depth > self.max_depth:
+                raise LimitExceeded('depth', self.max_depth)
+            env = Environment(parent=self.global_env)
+            previous_env = self.current_env
+            self.current_env = env
+            returned = yield from self.run_statements(func.body)
+            self.current_env = previous_env
+            self.depth -= 1
+            if returned:
+                value = self.return_value
+                self.return_value = None
+                return value
+        else:
+            raise Exception(f"Undefined function '{name}'")
+
+    def run_statements(self, statements):
+        budget = self.budget
+        budget.remaining -= len(statements)
+        if budget.remaining < 0:
+            budget.exhausted()
+        for stmt in statements:
+            if (yield from self.run_statement(stmt)):
+                return True
+        return False
+
+    def run_statement(self, stmt):
+        if isinstance(stmt, Command):
+            yield from self.run_command(stmt)
+        elif isinstance(stmt, IfStatement):
+            condition = yield from self.evaluate(stmt.condition)
+            if condition:
+                return (yield from self.run_statements(stmt.if_body))
+            elif stmt.else_body is not None:
+                return (yield from self.run_statements(stmt.else_body))
+        elif isinstance(stmt, RepeatLoop):
+            times = yield from self.evaluate(stmt.times)
+            budget = self.budget
+            for _ in range(int(times)):
+                budget.remaining -= 1
+                if budget.remaining < 0:
+                    budget.exhausted()
+                if (yield from self.run_statements(stmt.body)):
+                    return True
+        elif isinstance(stmt, FunctionCall):
+            yield from self.run_function(stmt.name, stmt.args)
+        elif isinstance(stmt, ReturnStatement):
+            self.return_value = yield from self.evaluate(stmt.expression)
+            return True
+        else:
+            raise Exception(f"Unknown statement type: {type(stmt)}")
+        return False
+
+    # the only place the program yields: right after handing an action to the simulator
+    def run_command(self, cmd):
+        args = []
+        for arg in cmd.args:
+            args.append((yield from self.evaluate(arg)))
+        self.enqueue_command(cmd.command, args)
+        yield
+
+    def evaluate(self, expr):
+        if isinstance(expr, Number):
+            return expr.value
+        elif isinstance(expr, Identifier):
+            return self.current_env.get(expr.name)
+        elif isinstance(expr, BinaryOp):
+            left = yield from self.evaluate(expr.left)
+            right = yield from self.evaluate(expr.right)
+            return self.apply_binary_op(expr.op, left, right)
+        elif isinstance(expr, UnaryOp):
+            operand = yield from self.evaluate(expr.operand)
+            return self.apply_unary_op(expr.op, operand)
+        elif isinstance(expr, FunctionCall):
+            return (yield from self.run_function(expr.name, expr.args))
+        else:
+            raise Exception(f"Unknown expression type: {type(expr)}")
 
 # Main Execution
 if __name__ == "__main__":
+    # actions are shown by default, --verbose adds every simulation step and sensor call
+    logging.basicConfig(level=logging.DEBUG if '--verbose' in sys.argv[1:] else logging.INFO, format='%(message)s')
     parser = build_parser() # calling parser to compile the parser with the defined grammar rules
     data = textwrap.dedent('''\
         function main() {
@@ -367,22 +379,32 @@ if __name__ == "__main__":
         }
     ''')
     ast = parser.parse(data)
-    if ast:
+    if ast and '--optimize' in sys.argv[1:]:
+        from optimizer import optimize
+        ast = optimize(ast)
+    if ast and '--headless' in sys.argv[1:]:
+        # runs the same program without a window and prints where the robot ended up
+        simulator = HeadlessSimulator()
+        InterpreterWithSimulator(ast, simulator).run_to_end()
+        print(simulator.result())
+    elif ast:
+        import pygame
+        from renderer import Simulator
+        from renderer import SPEEDS
         simulator = Simulator()
         interpreter = InterpreterWithSimulator(ast, simulator)
-        interpreter.interpret()  # starting interpreting and enqueue actions
+        interpreter.interpret()  # runs main() up to its first robot command
 
-        # the simulation loop starts
+        # the simulation loop starts, keys 1, 2 and 3 switch between the speeds 1x, 10x and max
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
+                if event.type == pygame.KEYDOWN and event.unicode in ('1', '2', '3'):
+                    simulator.set_speed(SPEEDS[int(event.unicode) - 1])
 
-            # updating and drawing the robot
-            simulator.update_display()
-
-            # update interpreter 
-            interpreter.update()
+            # updating the robot, resuming the interpreter after every step, and drawing it
+            simulator.update_display(interpreter)
     else:
         print("Parsing failed.")
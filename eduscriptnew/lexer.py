@@ -1,6 +1,10 @@
 # lexer.py
 
 import ply.lex as lex
+import functools
+import io
+import os
+import re
 import textwrap
 
 # listing all token types that the lexer will recognize.
@@ -84,9 +88,11 @@ def t_NUMBER(t):
     return t
 
 # matching one or more newline characters
+# line_start is the lexpos where the current line begins, so columns never need a search through the text
 def t_newline(t):
     r'\n+'
     t.lexer.lineno += len(t.value)
+    t.lexer.line_start = t.lexpos + len(t.value)
 
 # characters to ignore during lexing. spaces and tabs are ignored.
 t_ignore  = ' \t'
@@ -94,12 +100,43 @@ t_ignore  = ' \t'
 # catching any characters that do not match any defined token patterns
 # it prints the illegal character along with its line and column number
 def t_error(t):
-    print(f"Illegal character '{t.value[0]}' at line {t.lineno}, column {find_column(t.lexer.lexdata, t)}")
+    report_illegal_character(t.lexer, t.value[0], t.lineno, token_column(t.lexer, t))
     t.lexer.skip(1)
 
+def report_illegal_character(lexer, char, lineno, column):
+    report(lexer, Diagnostic('lexical', f"Illegal character '{char}' at line {lineno}, column {column}", lineno, column))
+
+# an error found while lexing or parsing. kind is 'lexical' for an illegal character, which is skipped,
+# or 'syntax' for a parse error. column is None where it is unknown, at the end of the input
+class Diagnostic:
+    def __init__(self, kind, message, lineno, column):
+        self.kind = kind
+        self.message = message
+        self.lineno = lineno
+        self.column = column
+
+    def to_dict(self):
+        return {'kind': self.kind, 'message': self.message, 'line': self.lineno, 'column': self.column}
+
+    def __repr__(self):
+        return f"Diagnostic({self.kind}, {self.message!r}, line={self.lineno}, column={self.column})"
+
+# errors are printed, unless the lexer carries a diagnostics list to collect them in (see parser.FrozenParser)
+def report(lexer, diagnostic):
+    diagnostics = getattr(lexer, 'diagnostics', None)
+    if diagnostics is None:
+        print(diagnostic.message)
+    else:
+        diagnostics.append(diagnostic)
+
+# 1-based column of a token the lexer has just produced, from the start of its line that t_newline recorded
+def token_column(lexer, token):
+    return token.lexpos - getattr(lexer, 'line_start', 0) + 1
+
 #  determining the column position of a token within the input string
 # it searches for the last occurrence of a newline character before the token's position
-# it subtracts the position of the last newline from the token's position to get the column number
+# it subtracts the position of the last newline from the token's position to get the column number.
+# this works for any token at any time but costs a search back to the previous newline, token_column is O(1)
 def find_column(input, token):
     last_cr = input.rfind('\n', 0, token.lexpos)
     if last_cr < 0:
@@ -107,10 +144,179 @@ def find_column(input, token):
     column = token.lexpos - last_cr
     return column
 
+# the operators and punctuation of the simple t_ rules above, as literal text -> token type
+OPERATORS = {re.sub(r'\\(.)', r'\1', rule): name[2:]
+             for name, rule in list(globals().items()) if name.startswith('t_') and name != 't_ignore' and isinstance(rule, str)}
+
+# one pattern for every token. the two-character operators come first so == wins over =, <= over < and so on,
+# the single characters share one character class, which the regex engine tests in a single step.
+# the last group catches any other character except the ignored ones, so finditer never skips over an illegal one
+FAST_PATTERN = re.compile(
+    r'[ \t]*(?:([A-Za-z_][A-Za-z0-9_]*)|(\d+(?:\.\d+)?)|(\n+)|('
+    + '|'.join(re.escape(text) for text in OPERATORS if len(text) > 1)
+    + '|[' + ''.join(re.escape(text) for text in OPERATORS if len(text) == 1)
+    + r'])|([^ \t]))')
+
+IDENTIFIER_GROUP, NUMBER_GROUP, NEWLINE_GROUP, OPERATOR_GROUP, ERROR_GROUP = 1, 2, 3, 4, 5
+
+# a hand-written scanner that produces the same tokens, line numbers, positions and error messages
+# as the PLY lexer built from the rules above, without PLY's per-token rule dispatch and t_ callbacks:
+# a single finditer walks the text and the match group says which token it was.
+# it has the parts of PLY's lexer interface the parsers and StreamLexer use:
+# input(), token(), iteration, lineno, lexpos, lexdata and line_start.
+# it lexes 1.2-1.5x the tokens per second of the PLY lexer, which makes a whole parse only 5-15% faster, the LR
+# parser costs far more than lexing (benchmarks/bench_lexer.py). much of what is left is the cost of that interface:
+# a LexToken and a generator step for every token, since the parser asks for one token at a time
+class FastLexer:
+    def __init__(self):
+        self.lineno = 1
+        self.lexpos = 0
+        self.lexdata = ''
+        self.line_start = 0
+        self.diagnostics = None
+        self.token = lambda: None
+
+    # like PLY's input() this keeps lineno, so a caller can lex one text in several pieces
+    def input(self, data):
+        self.lexdata = data
+        self.lexpos = 0
+        self.token = functools.partial(next, self.scan(data), None)
+
+    def scan(self, data):
+        lineno = self.lineno
+        reserved_get = reserved.get
+        operators = OPERATORS
+        LexToken = lex.LexToken
+        for match in FAST_PATTERN.finditer(data):
+            group = match.lastindex
+            tok = LexToken()
+            if group == IDENTIFIER_GROUP:
+                tok.value = value = match.group(1)
+                tok.type = reserved_get(value, 'IDENTIFIER')
+            elif group == OPERATOR_GROUP:
+                tok.value = value = match.group(4)
+                tok.type = operators[value]
+            elif group == NUMBER_GROUP:
+                value = match.group(2)
+                tok.value = float(value) if '.' in value else int(value)
+                tok.type = 'NUMBER'
+            elif group == NEWLINE_GROUP:
+                lineno += len(match.group(3))
+                self.lineno = lineno
+                self.line_start = match.end()
+                continue
+            else:
+                position = match.start(5)
+                report_illegal_character(self, data[position], lineno, position - self.line_start + 1)
+                continue
+            tok.lineno = lineno
+            tok.lexpos = self.lexpos = match.start(group)
+            yield tok
+        self.lexpos = len(data)
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+# the lexer engines build_lexer() can create
+LEXER_ENGINES = ('ply', 'fast')
+
 # compiling the lexer with defined rules
-def build_lexer():
+# frozen=True skips the rule reflection and loads the prebuilt lextab.py shipped next to this file.
+# engine='fast' returns a FastLexer instead, which needs no tables at all
+def build_lexer(frozen=False, engine='ply'):
+    if engine not in LEXER_ENGINES:
+        raise Exception(f"Unknown lexer engine '{engine}', expected one of: {', '.join(LEXER_ENGINES)}")
+    if engine == 'fast':
+        return FastLexer()
+    if frozen:
+        return load_frozen_lexer()
     return lex.lex()
 
+# builds a lexer straight from the frozen lextab module.
+# no t_ rule docstrings are inspected, nothing is validated and nothing is written to disk
+def load_frozen_lexer():
+    import lextab
+    lexer = lex.Lexer()
+    lexer.lexoptimize = True  # token types were checked when the table was frozen
+    lexer.readtab(lextab, globals())
+    return lexer
+
+# the characters StreamLexer cuts the source after: no token contains whitespace, and these punctuation
+# characters are never part of a longer token
+CUT_AFTER = ' \t\n;{}(),'
+
+# tokenizes a file object, or any iterable of strings, without ever holding the whole text.
+# the source is read chunk_size characters at a time and handed to the PLY lexer in pieces that end right after
+# one of CUT_AFTER, so no token is split and minified scripts without any whitespace are cut as well.
+# text after the last such character of a chunk waits for the next chunk, memory is bounded by chunk_size
+# plus the longest run of text without one, in practice the longest identifier or number.
+# lineno and line_start carry over from piece to piece, every token gets an absolute lexpos
+# and its column as token.column. it has input() and token(), so it can be passed to a PLY parser
+class StreamLexer:
+    def __init__(self, source=None, lexer=None, chunk_size=65536):
+        self.lexer = lexer or load_frozen_lexer()
+        self.chunk_size = chunk_size
+        if source is not None:
+            self.input(source)
+
+    # a plain string is accepted too, it is streamed from an io.StringIO
+    def input(self, source):
+        if isinstance(source, str):
+            source = io.StringIO(source)
+        if hasattr(source, 'read'):
+            self.chunks = iter(lambda: source.read(self.chunk_size), '')
+        else:
+            self.chunks = iter(source)
+        self.pending = ''  # text after the last whitespace read so far
+        self.offset = 0  # absolute position of the piece the lexer is working on
+        self.finished = False
+        self.lexer.lineno = 1
+        self.lexer.line_start = 0
+        self.lexer.input('')
+
+    @property
+    def lineno(self):
+        return self.lexer.lineno
+
+    # hands the next piece to the lexer, False once the source is used up
+    def feed(self):
+        while not self.finished:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.finished = True
+                piece, self.pending = self.pending, ''
+            else:
+                text = self.pending + chunk
+                cut = max(text.rfind(character) for character in CUT_AFTER) + 1
+                piece, self.pending = text[:cut], text[cut:]
+            if piece:
+                done = len(self.lexer.lexdata)
+                self.offset += done
+                self.lexer.line_start -= done
+                self.lexer.input(piece)
+                return True
+        return False
+
+    def token(self):
+        lexer = self.lexer
+        while True:
+            tok = lexer.token()
+            if tok is not None:
+                tok.column = tok.lexpos - lexer.line_start + 1
+                tok.lexpos += self.offset
+                return tok
+            if not self.feed():
+                return None
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+# regenerates lextab.py from the rules above, run this after changing any t_ rule
+def write_lexer_table(outputdir=None):
+    lexer = lex.lex()
+    lexer.writetab('lextab', outputdir or os.path.dirname(os.path.abspath(__file__)))
+    return lexer
+
 # testing the lexer
 if __name__ == "__main__":
     lexer = build_lexer()
@@ -128,7 +334,5 @@ if __name__ == "__main__":
         }
     ''')
 
-    lexer.input(data)
-    for tok in lexer:
-        column = find_column(data, tok)
-        print(f"LexToken({tok.type},{tok.value!r},{tok.lineno},{column})")
+    for tok in StreamLexer(io.StringIO(data), lexer, chunk_size=16):
+        print(f"LexToken({tok.type},{tok.value!r},{tok.lineno},{tok.column})")
@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'COMMA', 'DIVIDE', 'ELSE', 'EQ', 'FUNCTION', 'GE', 'GT', 'IDENTIFIER', 'IF', 'LBRACE', 'LE', 'LPAREN', 'LT', 'MINUS', 'MOVEBACKWARD', 'MOVEFORWARD', 'MULTIPLY', 'NEQ', 'NOT', 'NUMBER', 'OR', 'PLUS', 'RBRACE', 'REPEAT', 'RETURN', 'RPAREN', 'SEMICOLON', 'TURNLEFT', 'TURNRIGHT'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_IDENTIFIER>[A-Za-z_][A-Za-z0-9_]*)|(?P<t_NUMBER>\\d+(\\.\\d+)?)|(?P<t_newline>\\n+)|(?P<t_OR>\\|\\|)|(?P<t_LPAREN>\\()|(?P<t_RPAREN>\\))|(?P<t_LBRACE>\\{)|(?P<t_RBRACE>\\})|(?P<t_PLUS>\\+)|(?P<t_MULTIPLY>\\*)|(?P<t_EQ>==)|(?P<t_NEQ>!=)|(?P<t_LE><=)|(?P<t_GE>>=)|(?P<t_AND>&&)|(?P<t_COMMA>,)|(?P<t_SEMICOLON>;)|(?P<t_MINUS>-)|(?P<t_DIVIDE>/)|(?P<t_LT><)|(?P<t_GT>>)|(?P<t_NOT>!)', [None, ('t_IDENTIFIER', 'IDENTIFIER'), ('t_NUMBER', 'NUMBER'), None, ('t_newline', 'newline'), (None, 'OR'), (None, 'LPAREN'), (None, 'RPAREN'), (None, 'LBRACE'), (None, 'RBRACE'), (None, 'PLUS'), (None, 'MULTIPLY'), (None, 'EQ'), (None, 'NEQ'), (None, 'LE'), (None, 'GE'), (None, 'AND'), (None, 'COMMA'), (None, 'SEMICOLON'), (None, 'MINUS'), (None, 'DIVIDE'), (None, 'LT'), (None, 'GT'), (None, 'NOT')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -0,0 +1,64 @@
+# limits.py
+
+import sys
+import time
+
+# raised when a program runs into one of its Limits.
+# limit names the limit that fired ('statements', 'actions', 'depth' or 'seconds'), maximum is its configured value
+class LimitExceeded(Exception):
+    def __init__(self, limit, maximum):
+        super().__init__(f"{limit} limit of {maximum} exceeded")
+        self.limit = limit
+        self.maximum = maximum
+
+# resource limits for one program run, None means unlimited.
+# max_statements counts statements plus one for every repeat iteration. statements are charged a block at a time:
+# when a function body, an if or else branch or a loop iteration starts, all statements directly in it are counted,
+# and the limit fires right there if they would not fit. max_actions counts robot commands,
+# max_depth nested user function calls (main is depth 1) and max_seconds the wall-clock time
+# since the interpreter was created. the clock is only read after about check_interval statements
+class Limits:
+    def __init__(self, max_statements=None, max_actions=None, max_depth=None, max_seconds=None, check_interval=1000):
+        self.max_statements = max_statements
+        self.max_actions = max_actions
+        self.max_depth = max_depth
+        self.max_seconds = max_seconds
+        self.check_interval = check_interval
+
+    # whether statements have to be counted at all
+    def counts_statements(self):
+        return self.max_statements is not None or self.max_seconds is not None
+
+    def __repr__(self):
+        return (f"Limits(max_statements={self.max_statements}, max_actions={self.max_actions}, "
+                f"max_depth={self.max_depth}, max_seconds={self.max_seconds})")
+
+# counts statements for Limits.max_statements and Limits.max_seconds on behalf of every engine.
+# the count runs down in self.remaining, so the engines only do "remaining -= n; if remaining < 0: exhausted()",
+# a subtraction and a comparison per block. exhausted() adds up what was used, enforces both limits
+# and hands out the next allotment. without limits the allotment is sys.maxsize and never runs out
+class Budget:
+    def __init__(self, limits=None):
+        self.limits = limits or Limits()
+        self.deadline = None if self.limits.max_seconds is None else time.perf_counter() + self.limits.max_seconds
+        self.used = 0  # statements accounted for before the current allotment
+        self.allotment = self.next_allotment()
+        self.remaining = self.allotment
+
+    def next_allotment(self):
+        allotment = self.limits.check_interval if self.deadline is not None else sys.maxsize
+        if self.limits.max_statements is not None:
+            allotment = min(allotment, self.limits.max_statements - self.used)
+        return allotment
+
+    def statements(self):
+        return self.used + self.allotment - self.remaining
+
+    def exhausted(self):
+        self.used += self.allotment - self.remaining
+        if self.limits.max_statements is not None and self.used > self.limits.max_statements:
+            raise LimitExceeded('statements', self.limits.max_statements)
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise LimitExceeded('seconds', self.limits.max_seconds)
+        self.allotment = self.next_allotment()
+        self.remaining = self.allotment
@@ -0,0 +1,265 @@
+# multirobot.py
+
+import logging
+import math
+# numpy is optional, only this module needs it, see requirements-multirobot.txt
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("multirobot needs numpy, install it with: pip install -r requirements-multirobot.txt")
+from action_queue import ActionQueue
+from interpreter import InterpreterWithSimulator
+from simulator import Collision, SimulationResult
+
+logger = logging.getLogger('eduscript.multirobot')
+
+# what a robot is doing, kept per robot in MultiRobotSimulator.kind
+IDLE, MOVE, TURN = 0, 1, 2
+
+# (kind, direction) of every action type, directions as in HeadlessSimulator.update_actions
+ACTIONS = {
+    'move_forward': (MOVE, 1.0),
+    'move_backward': (MOVE, -1.0),
+    'turn_right': (TURN, -1.0),
+    'turn_left': (TURN, 1.0),
+}
+
+# one robot of a MultiRobotSimulator, with the methods the interpreters call on a simulator
+class Robot:
+    def __init__(self, simulator, index):
+        self.simulator = simulator
+        self.index = index
+
+    @property
+    def robot_pos(self):
+        return self.simulator.positions[self.index].tolist()
+
+    @property
+    def robot_angle(self):
+        return float(self.simulator.angles[self.index])
+
+    def enqueue_action(self, action_type, value):
+        self.simulator.enqueue_action(self.index, action_type, value)
+
+    def move_forward(self, distance):
+        self.enqueue_action('move_forward', distance)
+
+    def move_backward(self, distance):
+        self.enqueue_action('move_backward', distance)
+
+    def turn_right(self, angle):
+        self.enqueue_action('turn_right', angle)
+
+    def turn_left(self, angle):
+        self.enqueue_action('turn_left', angle)
+
+    def is_idle(self):
+        return self.simulator.is_idle(self.index)
+
+    def drain(self):
+        while not self.is_idle():
+            self.simulator.step()
+
+    def detect_obstacle(self):
+        return self.simulator.detect_obstacle(self.index)
+
+    def measure_distance(self):
+        return self.simulator.measure_distance(self.index)
+
+    def result(self):
+        return self.simulator.result(self.index)
+
+# count robots in one world, every one with its own action queue, moving exactly like a HeadlessSimulator:
+# move_speed units or turn_speed degrees per step. the poses and the state of the action each robot is executing
+# live in NumPy arrays, so step() advances every robot with a handful of array operations instead of a Python loop
+# over the robots. the heading cannot change during a move, so its cos and sin are taken once when the move
+# starts and every step adds velocity * step; idle robots have speed 0 and stay where they are.
+# only starting and finishing actions, which happens once per action and not once per step, touches single robots.
+# world is a world.World shared by all robots: the sensors query it, and moves stop at its obstacles like in
+# HeadlessSimulator. the collision sweep is a call per moving robot per step, so a world costs most of the
+# vectorization's advantage. robots do not collide with each other.
+# robot(i) is the simulator to hand to the interpreter of robot i, run_programs runs one program per robot
+class MultiRobotSimulator:
+    def __init__(self, count, width=800, height=600, world=None):
+        self.count = count
+        self.width, self.height = width, height
+        self.world = world
+        self.robot_size = 20
+        self.move_speed = 2  # units per step
+        self.turn_speed = 2  # degrees per step
+
+        # every robot starts at the center of the world, pointing to the right
+        self.positions = np.tile(np.array([width / 2, height / 2], dtype=np.float64), (count, 1))
+        self.angles = np.zeros(count)
+        # the action each robot is executing: IDLE, MOVE or TURN, how far it goes per step and in total,
+        # and how far it has got. a move changes the position by velocity, a turn the heading by turn, per unit
+        self.kind = np.zeros(count, dtype=np.int8)
+        self.speed = np.zeros(count)
+        self.target = np.zeros(count)
+        self.progress = np.zeros(count)
+        self.velocity = np.zeros((count, 2))
+        self.turn = np.zeros(count)
+        self.current_actions = [None] * count  # the (action_type, value) being executed, for collision reports
+
+        self.queues = [ActionQueue() for _ in range(count)]
+        self.waiting = set()  # robots with queued actions
+        self.robots = [Robot(self, index) for index in range(count)]
+        self.trajectories = [[tuple(position)] for position in self.positions.tolist()]
+        self.steps = np.zeros(count, dtype=np.int64)
+        self.completed_actions = np.zeros(count, dtype=np.int64)
+        self.collisions = [[] for _ in range(count)]
+
+    def robot(self, index):
+        return self.robots[index]
+
+    def enqueue_action(self, index, action_type, value):
+        logger.debug("Robot %s enqueued action: %s with value %s", index, action_type, value)
+        self.queues[index].push((action_type, value))
+        self.waiting.add(index)
+
+    def is_idle(self, index):
+        return self.kind[index] == IDLE and not self.queues[index]
+
+    def all_idle(self):
+        return not self.waiting and not self.kind.any()
+
+    # idle robots take their next queued action, like the start of HeadlessSimulator.update_actions
+    def start_actions(self):
+        for index in list(self.waiting):
+            if self.kind[index] != IDLE:
+                continue
+            queue = self.queues[index]
+            action_type, value = queue.pop()
+            kind, direction = ACTIONS[action_type]
+            self.kind[index] = kind
+            self.current_actions[index] = (action_type, value)
+            if kind == MOVE:
+                # direction * cos is exact, so velocity * step is HeadlessSimulator's direction * step * cos
+                rad = math.radians(self.angles[index])
+                self.velocity[index] = (direction * math.cos(rad), direction * math.sin(rad))
+                self.speed[index] = self.move_speed
+            else:
+                self.turn[index] = direction
+                self.speed[index] = self.turn_speed
+            self.target[index] = value
+            if not queue:
+                self.waiting.discard(index)
+
+    # advances every robot by one step and returns the indexes of the robots that finished their action
+    def step(self):
+        if self.waiting:
+            self.start_actions()
+        step = np.minimum(self.target - self.progress, self.speed)
+        collided = self.sweep(step) if self.world is not None else ()
+        self.positions += self.velocity * step[:, None]
+        self.angles += self.turn * step
+        np.remainder(self.angles, 360, out=self.angles)
+        self.progress += step
+        active = self.kind != IDLE
+        self.steps += active
+        finished = active & (self.progress >= self.target)
+        for index, obstacle in collided:
+            self.collide(index, obstacle)
+            finished[index] = True
+        finished = np.flatnonzero(finished)
+        if len(finished):
+            self.finish_actions(finished)
+        return finished
+
+    # cuts the steps of moving robots short where they would touch an obstacle, see HeadlessSimulator.update_actions,
+    # and returns (index, obstacle) of every robot that does
+    def sweep(self, step):
+        collided = []
+        positions = self.positions.tolist()
+        velocity = self.velocity.tolist()
+        for index in np.flatnonzero((self.kind == MOVE) & (step != 0)).tolist():
+            x, y = positions[index]
+            dx, dy = velocity[index]
+            # a negative distance drives the other way, see HeadlessSimulator.sweep
+            sign = 1.0 if step[index] > 0 else -1.0
+            travelled, obstacle = self.world.sweep(x, y, sign * dx, sign * dy, sign * step[index], self.robot_size)
+            if obstacle is not None:
+                step[index] = sign * travelled
+                collided.append((index, obstacle))
+        return collided
+
+    def collide(self, index, obstacle):
+        position = tuple(self.positions[index].tolist())
+        logger.info("Robot %s collided with %s at (%.1f, %.1f)", index, obstacle, position[0], position[1])
+        self.collisions[index].append(Collision(position, float(self.angles[index]), obstacle, self.current_actions[index],
+                                                int(self.steps[index])))
+
+    def finish_actions(self, finished):
+        moved = finished[self.kind[finished] == MOVE]
+        # the path is a polyline, its corners are where the moves end
+        for index, position in zip(moved.tolist(), self.positions[moved].tolist()):
+            self.trajectories[index].append(tuple(position))
+        self.kind[finished] = IDLE
+        self.speed[finished] = 0
+        self.target[finished] = 0
+        self.progress[finished] = 0
+        self.velocity[finished] = 0
+        self.turn[finished] = 0
+        self.completed_actions[finished] += 1
+
+    def drain(self, max_steps=None):
+        while not self.all_idle():
+            if max_steps is not None and self.steps.max() >= max_steps:
+                break
+            self.step()
+
+    def detect_obstacle(self, index):
+        if self.world is None:
+            return False
+        x, y = self.positions[index].tolist()
+        return self.world.detect_obstacle(x, y)
+
+    def measure_distance(self, index):
+        if self.world is None:
+            return 100
+        x, y = self.positions[index].tolist()
+        return self.world.measure_distance(x, y, float(self.angles[index]))
+
+    def result(self, index):
+        return SimulationResult(tuple(self.positions[index].tolist()), float(self.angles[index]),
+                                list(self.trajectories[index]), int(self.steps[index]),
+                                int(self.completed_actions[index]), self.collisions[index])
+
+    def results(self):
+        return [self.result(index) for index in range(self.count)]
+
+    # runs asts[i] on robot i, all robots at the same time, and returns (results, errors): a SimulationResult
+    # per robot and None or the error message of every program. every program is an InterpreterWithSimulator
+    # that is resumed when its robot has finished the command it emitted last, so sensors read the pose the robot
+    # has really driven to. max_steps stops the run after that many steps of the busiest robot
+    def run_programs(self, asts, limits=None, max_steps=None):
+        if len(asts) != self.count:
+            raise Exception(f"Expected {self.count} programs, got {len(asts)}")
+        errors = [None] * self.count
+        interpreters = {}
+        for index, ast in enumerate(asts):
+            interpreter = InterpreterWithSimulator(ast, self.robots[index], limits)
+            try:
+                interpreter.interpret()
+            except Exception as e:
+                errors[index] = f"{type(e).__name__}: {e}"
+                continue
+            if not interpreter.is_finished():
+                interpreters[index] = interpreter
+        ticks = 0
+        while interpreters or not self.all_idle():
+            if max_steps is not None and ticks >= max_steps:
+                break
+            finished = self.step().tolist() if not self.all_idle() else list(interpreters)
+            ticks += 1
+            for index in finished:
+                interpreter = interpreters.get(index)
+                if interpreter is None or not self.is_idle(index):
+                    continue
+                try:
+                    interpreter.resume()
+                except Exception as e:
+                    errors[index] = f"{type(e).__name__}: {e}"
+                if interpreter.is_finished():
+                    del interpreters[index]
+        return self.results(), errors
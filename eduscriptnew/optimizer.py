@@ -0,0 +1,98 @@
+# optimizer.py
+
+from parser import Program, FunctionDef, Command, IfStatement, RepeatLoop, FunctionCall, ReturnStatement, BinaryOp, UnaryOp, Number
+from compiler import constant_value, NOT_CONSTANT
+
+# a repeat with a constant count is only unrolled if that yields at most this many statements
+UNROLL_LIMIT = 32
+
+# optional pass that runs between parser.parse and an engine. it builds a new Program and leaves the original alone:
+#   fold    a BinaryOp or UnaryOp over number literals becomes one Number, computed like the interpreter would
+#   prune   an if with a constant condition is replaced by the statements of the branch it always takes,
+#           and statements after a return in the same block are dropped
+#   unroll  a repeat with a constant count and a small body is replaced by that many copies of the body
+# the optimized program enqueues the same actions and ends with the same error. it runs fewer statements,
+# so limits.Limits.max_statements counts the statements of the optimized program.
+# unrolled copies share their nodes, which is safe because nothing modifies an AST after parsing
+class Optimizer:
+    def __init__(self, fold=True, prune=True, unroll=True, unroll_limit=UNROLL_LIMIT):
+        self.fold = fold
+        self.prune = prune
+        self.unroll = unroll
+        self.unroll_limit = unroll_limit
+
+    def optimize(self, program):
+        return Program([FunctionDef(func.name, self.block(func.body)) for func in program.functions])
+
+    def block(self, statements):
+        result = []
+        for stmt in statements:
+            result.extend(self.statement(stmt))
+            if self.prune and result and isinstance(result[-1], ReturnStatement):
+                break
+        return result
+
+    # returns the statements that replace stmt, usually just one
+    def statement(self, stmt):
+        if isinstance(stmt, Command):
+            if not self.fold:
+                return [stmt]
+            return [Command(stmt.command, [self.expression(arg) for arg in stmt.args])]
+        elif isinstance(stmt, IfStatement):
+            condition = self.expression(stmt.condition)
+            if_body = self.block(stmt.if_body)
+            else_body = None if stmt.else_body is None else self.block(stmt.else_body)
+            if self.prune:
+                value = constant_value(condition)
+                if value is not NOT_CONSTANT:
+                    return if_body if value else else_body or []
+            return [IfStatement(condition, if_body, else_body)]
+        elif isinstance(stmt, RepeatLoop):
+            times = self.expression(stmt.times)
+            body = self.block(stmt.body)
+            count = self.constant_count(times) if self.unroll else None
+            if count is not None and count * max(len(body), 1) <= self.unroll_limit:
+                return body * max(count, 0)
+            return [RepeatLoop(times, body)]
+        elif isinstance(stmt, FunctionCall):
+            # call arguments are never evaluated, there is nothing to fold
+            return [stmt]
+        elif isinstance(stmt, ReturnStatement):
+            return [ReturnStatement(self.expression(stmt.expression))] if self.fold else [stmt]
+        else:
+            raise Exception(f"Unknown statement type: {type(stmt)}")
+
+    # the children are folded first, so only an operator over number literals can fold, and constant_value
+    # only ever looks one level deep. without fold the expressions are kept as they are, prune and unroll
+    # evaluate constant conditions and counts with constant_value themselves
+    def expression(self, expr):
+        if not self.fold:
+            return expr
+        if isinstance(expr, BinaryOp):
+            left, right = self.expression(expr.left), self.expression(expr.right)
+            expr = BinaryOp(expr.op, left, right)
+            foldable = isinstance(left, Number) and isinstance(right, Number)
+        elif isinstance(expr, UnaryOp):
+            operand = self.expression(expr.operand)
+            expr = UnaryOp(expr.op, operand)
+            foldable = isinstance(operand, Number)
+        else:
+            return expr
+        if foldable:
+            value = constant_value(expr)
+            if value is not NOT_CONSTANT:
+                return Number(value)
+        return expr
+
+    # the iteration count of repeat(times) if it is known at compile time, like int(times) in the interpreter
+    def constant_count(self, times):
+        value = constant_value(times)
+        if value is NOT_CONSTANT:
+            return None
+        try:
+            return int(value)
+        except (OverflowError, ValueError):
+            return None
+
+def optimize(program, fold=True, prune=True, unroll=True, unroll_limit=UNROLL_LIMIT):
+    return Optimizer(fold, prune, unroll, unroll_limit).optimize(program)
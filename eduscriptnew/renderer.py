@@ -0,0 +1,199 @@
+# renderer.py
+
+import pygame
+import math
+import time
+from simulator import HeadlessSimulator, WIDTH, HEIGHT
+from world import Segment, Circle
+
+BACKGROUND = (255, 255, 255)
+OBSTACLE = (128, 128, 128)
+ROBOT = (0, 0, 255)
+HEADING = (255, 0, 0)
+TEXT = (0, 0, 0)
+TEXT_POSITION = (10, 30)
+FRAME_RATE = 60         # frames per second the window is drawn at
+TICK_RATE = 60          # simulation steps per second at speed 1
+MAX_FRAME_TIME = 0.25   # a longer frame, say while the window is dragged, only simulates this many seconds
+MAX_STEP_TIME = 0.012   # seconds per frame spent stepping at speed 'max', the rest of the frame is left for drawing
+SPEEDS = (1, 10, 'max')
+# above this many moved robots a frame redraws and updates the whole screen, which is then cheaper than the pieces
+MAX_DIRTY_RECTS = 100
+
+# draws robots onto screen, touching only what changed since the last frame.
+# the white background with the obstacles of world is drawn once into a cached surface. a frame copies the
+# cached pixels back over the robots that moved, draws them at their new pose and hands just those rectangles to
+# pygame.display.update; a frame in which nothing moved costs nothing. a robot that was not moved but overlaps
+# a repainted rectangle is drawn again as well, in the original order, so the screen always holds exactly
+# what a complete redraw would. the text surface is only rendered again when the text changes.
+# when more than MAX_DIRTY_RECTS robots moved, or their number changed, the frame is drawn over a full copy
+# of the background instead.
+# draw() takes any number of robots, as (x, y, angle) poses, so a multirobot.MultiRobotSimulator can be drawn too
+class Renderer:
+    def __init__(self, screen, font, world=None, robot_size=20):
+        self.screen = screen
+        self.font = font
+        self.world = world
+        self.robot_size = robot_size
+        self.background = self.draw_background()
+        self.poses = None       # the poses drawn last frame, None before the first frame
+        self.rects = []         # the rectangle every robot may have drawn into
+        self.text = None
+        self.text_surface = None
+        self.text_rect = None
+
+    # the static layers: background colour and obstacles
+    def draw_background(self):
+        background = pygame.Surface(self.screen.get_size()).convert()
+        background.fill(BACKGROUND)
+        if self.world is not None:
+            for obstacle in self.world.obstacles:
+                if isinstance(obstacle, Segment):
+                    pygame.draw.line(background, OBSTACLE, (obstacle.x1, obstacle.y1), (obstacle.x2, obstacle.y2), 2)
+                elif isinstance(obstacle, Circle):
+                    pygame.draw.circle(background, OBSTACLE, (int(obstacle.x), int(obstacle.y)), int(obstacle.radius))
+                else:
+                    pygame.draw.rect(background, OBSTACLE, pygame.Rect(obstacle.x, obstacle.y, obstacle.width, obstacle.height))
+        return background
+
+    # covers the body and the direction indicator, whose 2 pixel line may reach a pixel past the body
+    def bounds(self, x, y):
+        margin = self.robot_size + 2
+        return pygame.Rect(int(x) - margin, int(y) - margin, 2 * margin + 1, 2 * margin + 1)
+
+    def draw_robot(self, x, y, angle):
+        pygame.draw.circle(self.screen, ROBOT, (int(x), int(y)), self.robot_size)
+        # direction indicator
+        end_x = x + self.robot_size * math.cos(math.radians(angle))
+        end_y = y + self.robot_size * math.sin(math.radians(angle))
+        pygame.draw.line(self.screen, HEADING, (x, y), (end_x, end_y), 2)
+
+    def draw(self, poses, text):
+        poses = list(poses)
+        if text != self.text:
+            erased = [self.text_rect] if self.text_rect else []
+            self.text = text
+            self.text_surface = self.font.render(text, True, TEXT)
+            self.text_rect = self.text_surface.get_rect(topleft=TEXT_POSITION)
+        else:
+            erased = []
+        if self.poses is None or len(poses) != len(self.poses):
+            return self.draw_all(poses)
+        changed = [index for index, (old, new) in enumerate(zip(self.poses, poses)) if old != new]
+        if not changed and not erased:
+            return
+        if len(changed) > MAX_DIRTY_RECTS:
+            return self.draw_all(poses)
+        rects = self.rects
+        erased.extend(rects[index] for index in changed)
+        for index in changed:
+            rects[index] = self.bounds(poses[index][0], poses[index][1])
+        self.poses = poses
+
+        # every robot that overlaps a repainted rectangle is repainted too, and so on
+        redraw = set(changed)
+        frontier = erased + [rects[index] for index in changed]
+        while frontier:
+            found = []
+            for rect in frontier:
+                for index in rect.collidelistall(rects):
+                    if index not in redraw:
+                        redraw.add(index)
+                        found.append(rects[index])
+            frontier = found
+        for rect in erased:
+            self.screen.blit(self.background, rect, rect)
+        for index in sorted(redraw):
+            self.draw_robot(*poses[index])
+        dirty = erased + [rects[index] for index in redraw]
+        if self.text_rect.collidelist(dirty) != -1:
+            self.screen.blit(self.text_surface, self.text_rect)
+            dirty.append(self.text_rect)
+        pygame.display.update(dirty)
+
+    def draw_all(self, poses):
+        self.poses = poses
+        self.rects = [self.bounds(x, y) for x, y, angle in poses]
+        self.screen.blit(self.background, (0, 0))
+        for x, y, angle in poses:
+            self.draw_robot(x, y, angle)
+        self.screen.blit(self.text_surface, self.text_rect)
+        pygame.display.flip()
+
+# the visual simulator: HeadlessSimulator's kinematics drawn into a pygame window.
+# the simulation runs at a fixed TICK_RATE steps per simulated second, independent of the frame rate: every frame
+# adds the real time since the last frame, times speed, to an accumulator and runs one step for every whole tick
+# in it. speed 10 runs ten times as many steps in the same time, speed 'max' as many as fit in MAX_STEP_TIME per
+# frame; the kinematics, move_speed and turn_speed, never change, so every speed ends in the same pose.
+# the robot is drawn between its pose before and after the last step, as far as the left-over part of a tick in
+# the accumulator goes, so motion stays smooth when steps and frames do not line up.
+# pass the InterpreterWithSimulator to update_display, it is resumed after every step and not only once a frame.
+# the obstacles of world, a world.World, are drawn in grey. unless boundary=False the robot also stops at the
+# edges of the window, a copy of world with walls along them is simulated; without a world the robot is never stopped
+class Simulator(HeadlessSimulator):
+    def __init__(self, world=None, speed=1, boundary=True):
+        if world is not None and boundary:
+            world = world.bounded(WIDTH, HEIGHT)
+        super().__init__(WIDTH, HEIGHT, world=world)
+        pygame.init() # initialzing pygame
+        self.screen = pygame.display.set_mode((self.width, self.height))
+        pygame.display.set_caption("EduScript Robot Simulation")
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.SysFont(None, 24)
+        self.renderer = Renderer(self.screen, self.font, world, self.robot_size)
+        self.set_speed(speed)
+        self.last_frame = None   # perf_counter() of the last frame
+        self.previous_pose = (self.robot_pos[0], self.robot_pos[1], self.robot_angle)
+
+    # a positive multiplier of TICK_RATE, or 'max'
+    def set_speed(self, speed):
+        if speed != 'max' and not (isinstance(speed, (int, float)) and speed > 0):
+            raise Exception(f"Unknown simulation speed '{speed}', expected a positive multiplier or 'max'")
+        self.speed = speed
+        self.accumulator = 0.0   # simulated seconds not stepped yet
+
+    def step(self, interpreter=None):
+        self.previous_pose = (self.robot_pos[0], self.robot_pos[1], self.robot_angle)
+        self.update_actions()
+        if interpreter is not None:
+            interpreter.update()
+
+    def is_done(self, interpreter=None):
+        return self.is_idle() and (interpreter is None or interpreter.is_finished())
+
+    # runs the steps due since the last frame and returns how far into the next tick the simulation is, 0 to 1
+    def advance(self, interpreter=None):
+        now = time.perf_counter()
+        elapsed = 0.0 if self.last_frame is None else min(now - self.last_frame, MAX_FRAME_TIME)
+        self.last_frame = now
+        if self.speed == 'max':
+            deadline = now + MAX_STEP_TIME
+            while not self.is_done(interpreter) and time.perf_counter() < deadline:
+                for _ in range(64):
+                    self.step(interpreter)
+            return 1.0
+        tick = 1 / TICK_RATE
+        self.accumulator += elapsed * self.speed
+        while self.accumulator >= tick:
+            self.step(interpreter)
+            self.accumulator -= tick
+        return self.accumulator / tick
+
+    def draw_robot(self, alpha=1.0):
+        x, y, angle = self.previous_pose
+        # the shorter way round, a turn from 359 to 1 degrees passes 0
+        turned = (self.robot_angle - angle + 180) % 360 - 180
+        pose = (x + (self.robot_pos[0] - x) * alpha, y + (self.robot_pos[1] - y) * alpha, (angle + turned * alpha) % 360)
+        # robot position
+        position_text = f"Position: ({self.robot_pos[0]:.1f}, {self.robot_pos[1]:.1f})"
+        self.renderer.draw([pose], position_text)
+
+    def update_display(self, interpreter=None):
+        # Update robot actions
+        alpha = self.advance(interpreter)
+
+        # Draw the robot
+        self.draw_robot(alpha)
+
+        # Control the loop speed
+        self.clock.tick(FRAME_RATE)
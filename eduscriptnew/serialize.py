@@ -0,0 +1,292 @@
+# serialize.py
+
+import gc
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from itertools import chain, islice
+import parsetab
+import lextab
+from parser import Program, FunctionDef, Command, IfStatement, RepeatLoop, FunctionCall, ReturnStatement, BinaryOp, UnaryOp, Number, Identifier
+
+# binary AST format:
+#   header   magic, format version, grammar signature and the sizes of the three sections below
+#   strings  every function name, identifier, command and operator once, utf-8, separated by NUL bytes
+#   values   every number literal as "<kind>:<repr>", kind i (int), f (float) or b (bool), separated by NUL bytes
+#   wide     int32 pairs of a word position and the word, for the rare words that do not fit int16
+#   words    the nodes in preorder as little-endian int16 words: a tag followed by its fixed operands,
+#            names and operators are indexes into strings, numbers are indexes into values.
+#            the words listed in wide are left out here
+# the words section is read straight out of the buffer (for load() an mmap) without copying it.
+# only a huge program has wide words, a body count or a value index above 32767, and then only a few,
+# so they are kept aside instead of making every word int32
+MAGIC = b'EDUA'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<4sI16sIIII')  # magic, version, grammar signature, strings, values, wide pairs, word count
+
+PROGRAM = 0     # function count, then the functions
+FUNCTION = 1    # name, statement count, then the statements
+COMMAND = 2     # command, argument count, then the arguments
+IF = 3          # if-body count, else-body count or -1 without an else, then condition, if-body, else-body
+REPEAT = 4      # statement count, then times and the statements
+CALL = 5        # name, argument count, then the arguments
+RETURN = 6      # then the expression
+BINARY = 7      # operator, then left and right
+UNARY = 8       # operator, then the operand
+NUMBER = 9      # value
+IDENTIFIER = 10 # name
+
+class SerializationError(Exception):
+    pass
+
+# identifies the grammar an AST was parsed with: the LR table signature from parsetab.py
+# and the token regular expressions from lextab.py. regenerating the tables after a grammar change changes it
+def grammar_signature():
+    digest = hashlib.sha256()
+    digest.update(parsetab._lr_signature.encode())
+    digest.update(repr(lextab._lexstatere).encode())
+    return digest.hexdigest()[:16]
+
+class Encoder:
+    def __init__(self):
+        self.words = array('i')
+        self.strings = {}
+        self.values = {}
+
+    def string(self, text):
+        if text not in self.strings:
+            self.strings[text] = len(self.strings)
+        return self.strings[text]
+
+    def value(self, value):
+        # bool before int, True is an int too. the kind keeps 1, 1.0 and True apart
+        if isinstance(value, bool):
+            key = f"b:{int(value)}"
+        elif isinstance(value, int):
+            key = f"i:{value}"
+        elif isinstance(value, float):
+            key = f"f:{value!r}"
+        else:
+            raise SerializationError(f"Cannot serialize number {value!r}")
+        if key not in self.values:
+            self.values[key] = len(self.values)
+        return self.values[key]
+
+    def block(self, statements):
+        for stmt in statements:
+            self.node(stmt)
+
+    def node(self, node):
+        emit = self.words.extend
+        if isinstance(node, Program):
+            emit((PROGRAM, len(node.functions)))
+            self.block(node.functions)
+        elif isinstance(node, FunctionDef):
+            emit((FUNCTION, self.string(node.name), len(node.body)))
+            self.block(node.body)
+        elif isinstance(node, Command):
+            emit((COMMAND, self.string(node.command), len(node.args)))
+            self.block(node.args)
+        elif isinstance(node, IfStatement):
+            emit((IF, len(node.if_body), -1 if node.else_body is None else len(node.else_body)))
+            self.node(node.condition)
+            self.block(node.if_body)
+            if node.else_body is not None:
+                self.block(node.else_body)
+        elif isinstance(node, RepeatLoop):
+            emit((REPEAT, len(node.body)))
+            self.node(node.times)
+            self.block(node.body)
+        elif isinstance(node, FunctionCall):
+            emit((CALL, self.string(node.name), len(node.args)))
+            self.block(node.args)
+        elif isinstance(node, ReturnStatement):
+            emit((RETURN,))
+            self.node(node.expression)
+        elif isinstance(node, BinaryOp):
+            emit((BINARY, self.string(node.op)))
+            self.node(node.left)
+            self.node(node.right)
+        elif isinstance(node, UnaryOp):
+            emit((UNARY, self.string(node.op)))
+            self.node(node.operand)
+        elif isinstance(node, Number):
+            emit((NUMBER, self.value(node.value)))
+        elif isinstance(node, Identifier):
+            emit((IDENTIFIER, self.string(node.name)))
+        else:
+            raise SerializationError(f"Cannot serialize node {type(node)}")
+
+# encodes a Program as bytes
+def dumps(program):
+    encoder = Encoder()
+    encoder.node(program)
+    strings = '\0'.join(encoder.strings).encode()
+    values = '\0'.join(encoder.values).encode()
+    wide = array('i')
+    try:
+        words = array('h', encoder.words)
+    except OverflowError:
+        words = array('h')
+        for position, word in enumerate(encoder.words):
+            if -32768 <= word <= 32767:
+                words.append(word)
+            else:
+                wide.extend((position, word))
+    if sys.byteorder != 'little':
+        wide.byteswap()
+        words.byteswap()
+    # the sections are padded to a multiple of 4 so the words start aligned
+    strings += b'\0' * (-len(strings) % 4)
+    values += b'\0' * (-len(values) % 4)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, grammar_signature().encode(),
+                         len(strings), len(values), len(wide) // 2, len(words))
+    return header + strings + values + wide.tobytes() + words.tobytes()
+
+def dump(program, path):
+    with open(path, 'wb') as f:
+        f.write(dumps(program))
+
+def decode_value(text):
+    kind, literal = text[0], text[2:]
+    if kind == 'i':
+        return int(literal)
+    if kind == 'f':
+        return float(literal)
+    if kind == 'b':
+        return literal == '1'
+    raise SerializationError(f"Unknown number kind '{kind}'")
+
+def split_section(view):
+    text = bytes(view).decode().rstrip('\0')
+    return text.split('\0') if text else []
+
+# iterates over the words with the wide words put back in at their positions
+def merge_words(words, wide):
+    if not wide:
+        return iter(words)
+    narrow = iter(words)
+    pieces = []
+    start = 0
+    for index in range(0, len(wide), 2):
+        position = wide[index]
+        if not start <= position < len(words) + len(wide) // 2:
+            raise SerializationError("Corrupt payload")
+        pieces.append(islice(narrow, position - start))
+        pieces.append((wide[index + 1],))
+        start = position + 1
+    pieces.append(narrow)
+    return chain.from_iterable(pieces)
+
+# decodes a Program from any buffer: bytes, a memoryview or an mmap.
+# only the small string and value sections are copied, the words are read in place
+def loads(data):
+    with memoryview(data) as view:
+        if len(view) < HEADER.size:
+            raise SerializationError("Truncated header")
+        magic, version, signature, strings_size, values_size, wide_count, word_count = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise SerializationError("Not a serialized EduScript program")
+        if version != FORMAT_VERSION:
+            raise SerializationError(f"Unsupported format version {version}, expected {FORMAT_VERSION}")
+        if signature.decode() != grammar_signature():
+            raise SerializationError("Program was serialized with a different grammar")
+        start = HEADER.size
+        wide_start = start + strings_size + values_size
+        words_start = wide_start + wide_count * 8
+        end = words_start + word_count * 2
+        if len(view) < end:
+            raise SerializationError("Truncated payload")
+        strings = split_section(view[start:start + strings_size])
+        values = [decode_value(text) for text in split_section(view[start + strings_size:wide_start])]
+        wide = array('i')
+        wide.frombytes(view[wide_start:words_start])
+        with view[words_start:end].cast('h') as words:
+            if sys.byteorder != 'little':
+                wide.byteswap()
+                words = array('h', words)
+                words.byteswap()
+            try:
+                return decode(merge_words(words, wide), strings, values)
+            except (StopIteration, IndexError):
+                raise SerializationError("Corrupt payload")
+
+# memory-maps the file and decodes it
+def load(path):
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return loads(mapped)
+
+# the cyclic garbage collector is paused while decoding: an AST has no cycles,
+# but without the pause every few hundred new nodes would trigger a scan of all the nodes created so far
+def decode(words, strings, values):
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return decode_program(words, strings, values)
+    finally:
+        if enabled:
+            gc.enable()
+
+def decode_program(words, strings, values):
+    read = words.__next__
+
+    def block(count):
+        return tuple([node() for _ in range(count)])
+
+    def node():
+        tag = read()
+        if tag == NUMBER:
+            return Number(values[read()])
+        elif tag == BINARY:
+            op = strings[read()]
+            left = node()
+            return BinaryOp(op, left, node())
+        elif tag == IDENTIFIER:
+            return Identifier(strings[read()])
+        elif tag == COMMAND:
+            command = strings[read()]
+            return Command(command, block(read()))
+        elif tag == CALL:
+            name = strings[read()]
+            return FunctionCall(name, block(read()))
+        elif tag == IF:
+            if_count = read()
+            else_count = read()
+            condition = node()
+            if_body = block(if_count)
+            return IfStatement(condition, if_body, None if else_count < 0 else block(else_count))
+        elif tag == REPEAT:
+            count = read()
+            times = node()
+            return RepeatLoop(times, block(count))
+        elif tag == RETURN:
+            return ReturnStatement(node())
+        elif tag == UNARY:
+            op = strings[read()]
+            return UnaryOp(op, node())
+        elif tag == FUNCTION:
+            name = strings[read()]
+            return FunctionDef(name, block(read()))
+        elif tag == PROGRAM:
+            return Program(block(read()))
+        raise SerializationError(f"Unknown node tag {tag}")
+
+    program = node()
+    if not isinstance(program, Program):
+        raise SerializationError("Payload does not start with a program")
+    return program
+
+# precompiles a script library: writes <script>.ast next to every script given on the command line
+if __name__ == "__main__":
+    from parser import parse
+    for path in sys.argv[1:]:
+        with open(path) as f:
+            ast = parse(f.read())
+        if ast is None:
+            print(f"{path}: parsing failed")
+            continue
+        dump(ast, path + '.ast')
+        print(f"{path} -> {path}.ast")
@@ -0,0 +1,307 @@
+# simulator.py
+
+import logging
+import math
+from action_queue import ActionQueue
+
+# actions are logged at INFO, every single step at DEBUG
+logger = logging.getLogger('eduscript.simulator')
+
+# the size of the screen the robot starts in the middle of, also the size of renderer.Simulator's window
+WIDTH, HEIGHT = 800, 600
+
+# a move the world stopped short: the robot touched obstacle at position and the rest of action was dropped
+class Collision:
+    def __init__(self, position, angle, obstacle, action, step):
+        self.position = position        # (x, y) of the robot where it touched the obstacle
+        self.angle = angle
+        self.obstacle = obstacle        # the world.World obstacle it touched
+        self.action = action            # the (action_type, value) that was cut short
+        self.step = step                # the update_actions() step it happened in
+
+    def to_dict(self):
+        return {
+            'position': list(self.position),
+            'angle': self.angle,
+            'obstacle': self.obstacle.to_dict(),
+            'action': list(self.action),
+            'step': self.step,
+        }
+
+    def __repr__(self):
+        return f"Collision(position={self.position}, obstacle={self.obstacle}, action={self.action}, step={self.step})"
+
+# final state of a headless run
+class SimulationResult:
+    def __init__(self, position, angle, trajectory, steps, actions, collisions=()):
+        self.position = position        # final (x, y) of the robot
+        self.angle = angle              # final heading in degrees, 0 points to the right
+        self.trajectory = trajectory    # list of (x, y) corners of the path the robot drove, starting at its start position
+        self.steps = steps              # number of update_actions() steps the run took
+        self.actions = actions          # number of actions the simulator completed
+        self.collisions = list(collisions)  # Collision of every move an obstacle stopped, in order
+
+    def to_dict(self):
+        return {
+            'position': list(self.position),
+            'angle': self.angle,
+            'trajectory': [list(point) for point in self.trajectory],
+            'steps': self.steps,
+            'actions': self.actions,
+            'collisions': [collision.to_dict() for collision in self.collisions],
+        }
+
+    def __repr__(self):
+        return (f"SimulationResult(position={self.position}, angle={self.angle}, steps={self.steps}, actions={self.actions}, "
+                f"collisions={len(self.collisions)})")
+
+# turns as signed angles, left is positive like the heading
+TURN_SIGNS = {'turn_left': 1, 'turn_right': -1}
+
+# the single action that has the same effect as previous followed by action, None if there is none.
+# moves of the same type and sign are added up: the robot drives the same straight line in one go.
+# opposite moves are never merged, the robot really drives there and back.
+# any two turns are added up as signed angles and keep the direction of the larger one,
+# turns that cancel out merge into no action at all, which is returned as ()
+def merge_actions(previous, action):
+    previous_type, previous_value = previous
+    action_type, value = action
+    if action_type in TURN_SIGNS and previous_type in TURN_SIGNS:
+        net = TURN_SIGNS[previous_type] * previous_value + TURN_SIGNS[action_type] * value
+        if net == 0:
+            return ()
+        return ('turn_left', net) if net > 0 else ('turn_right', -net)
+    if action_type == previous_type and action_type in ('move_forward', 'move_backward'):
+        if (value >= 0) == (previous_value >= 0):
+            return (action_type, previous_value + value)
+    return None
+
+# the robot kinematics without any display.
+# it keeps the action queue and advances the robot by move_speed units or turn_speed degrees per step,
+# exactly like the visual simulator does per frame, but never imports pygame and never waits for a clock.
+# with fast_forward=True every step completes a whole action in closed form instead,
+# optionally adding a trajectory point every sample_resolution units along each move.
+# queue_capacity bounds the action queue. when it is full, backpressure='drain' steps the simulator
+# until an action has been taken off the queue, backpressure='raise' raises action_queue.QueueFull instead.
+# coalesce=True merges every action into the last queued one where merge_actions allows it, so
+# repeat(1000) { moveForward(1); } queues and simulates a single move of 1000. the robot ends in the same pose
+# and drives the same path, only the trajectory points in the middle of a straight line are left out.
+# a sensor reading is a barrier: actions enqueued after it are never merged into actions enqueued before it.
+# world is a world.World the sensors look at. without one no obstacle is ever detected and measureDistance()
+# reads 100. with one, a sensor first finishes every queued action, so it reads the pose the program has driven to,
+# then asks the world: detect_obstacle() is a proximity query around robot_pos,
+# measure_distance() a ray cast from robot_pos along robot_angle.
+# the world also stops the robot: every move, a step at a time or whole in fast forward, sweeps the robot's circle
+# of robot_size through the world, and a move that would touch an obstacle ends at the contact point.
+# the rest of that move is dropped and a Collision is added to collisions. turning never collides.
+# with coalesce=True a run of merged moves into a wall is one collision instead of one per blocked move,
+# the pose the robot ends in is the same.
+# renderer.Simulator draws on top of this class
+class HeadlessSimulator:
+    def __init__(self, width=WIDTH, height=HEIGHT, fast_forward=False, sample_resolution=None,
+                 queue_capacity=None, backpressure='drain', coalesce=False, world=None):
+        self.width, self.height = width, height
+        self.world = world
+        self.robot_pos = [width / 2, height / 2]  # robot's starting position at the center of the world
+        self.robot_angle = 0  # initializing the robots's angle , 0 degrees pointing to the right
+        self.robot_size = 20
+
+        # initializing the action_queue, current_action, and action_progress to manage robot actions
+        if backpressure not in ('drain', 'raise'):
+            raise Exception(f"Unknown backpressure mode '{backpressure}'")
+        self.action_queue = ActionQueue(queue_capacity, self.update_actions if backpressure == 'drain' else None)
+        self.current_action = None
+        self.action_progress = 0  # tracking progress within the current action
+        self.trace_steps = False  # whether DEBUG step tracing was enabled when the current action started
+        self.coalesce = coalesce
+        self.mergeable = False  # whether the last queued action was pushed after the last sensor reading
+
+        self.move_speed = 2  # units per step
+        self.turn_speed = 2  # degrees per step
+        self.fast_forward = fast_forward
+        self.sample_resolution = sample_resolution
+
+        # the path is a polyline, so its corners are enough to reproduce it: a point is added whenever a move ends
+        self.trajectory = [tuple(self.robot_pos)]
+        self.steps = 0
+        self.completed_actions = 0
+        self.coalesced_actions = 0  # actions merged into a queued one instead of being queued themselves
+        self.collisions = []
+
+    def enqueue_action(self, action_type, value):
+        # action_type: Type of action (move_forward, turn_right, etc.).
+        # value: Distance (units) or angle (degrees) associated with the action.
+        # adds the action to the action_queue and logs the enqueued action
+        logger.info("Enqueued action: %s with value %s", action_type, value)
+        if self.coalesce and self.mergeable and self.action_queue:
+            merged = merge_actions(self.action_queue.last(), (action_type, value))
+            if merged is not None:
+                self.coalesced_actions += 1
+                if merged:
+                    self.action_queue.replace_last(merged)
+                else:
+                    # the action before the removed one may predate a sensor reading
+                    self.action_queue.pop_last()
+                    self.coalesced_actions += 1
+                    self.mergeable = False
+                return
+        self.action_queue.push((action_type, value))
+        self.mergeable = True
+
+    def is_idle(self):
+        return self.current_action is None and not self.action_queue
+
+    def update_actions(self):
+        # if no action is currently being executed (current_action is None) and there are actions in the queue,
+        # dequeues the next action and starts it
+        if self.current_action is None and self.action_queue:
+            self.current_action = self.action_queue.pop()
+            self.action_progress = 0
+            # the level is looked up once per action, so a step with tracing disabled costs a single attribute test
+            self.trace_steps = logger.isEnabledFor(logging.DEBUG)
+            logger.info("Starting action: %s", self.current_action)
+
+        # Action Execution:
+        # Movement:
+        # calculates the direction (1 for forward, -1 for backward)
+        # determines the step size based on move_speed and remaining distance
+        # updates robot_pos by adding delta_x and delta_y based on the current angle and step size
+        # increments action_progress by the step size
+        # marks the action as completed if the target distance is reached
+        if self.current_action:
+            self.steps += 1
+            if self.fast_forward:
+                self.finish_action()
+                return
+            action_type, value = self.current_action
+            if action_type in ['move_forward', 'move_backward']:
+                direction = 1 if action_type == 'move_forward' else -1
+                distance_remaining = value - self.action_progress
+                step = self.move_speed if distance_remaining > self.move_speed else distance_remaining
+                rad = math.radians(self.robot_angle)
+                obstacle = None
+                if self.world is not None and step != 0:
+                    step, obstacle = self.sweep(direction * math.cos(rad), direction * math.sin(rad), step)
+                delta_x = direction * step * math.cos(rad)
+                delta_y = direction * step * math.sin(rad)
+                self.robot_pos[0] += delta_x
+                self.robot_pos[1] += delta_y
+                self.action_progress += step
+                if self.trace_steps:
+                    logger.debug("Moving %s: Step %s/%s", 'forward' if direction == 1 else 'backward', self.action_progress, value)
+                if obstacle is not None:
+                    self.collide(obstacle)
+                    self.action_progress = value
+
+                if self.action_progress >= value:
+                    logger.info("Completed action: %s", action_type)
+                    self.current_action = None
+                    self.completed_actions += 1
+                    self.trajectory.append(tuple(self.robot_pos))
+            # turning:
+            # determines the direction (-1 for right, 1 for left).
+            # calculates the step size based on turn_speed and remaining angle.
+            # updates robot_angle by adding the step size, ensuring it wraps around at 360 degrees.
+            # increments action_progress by the step size.
+            # marks the action as completed if the target angle is reached.
+            elif action_type in ['turn_right', 'turn_left']:
+                direction = -1 if action_type == 'turn_right' else 1
+                angle_remaining = value - self.action_progress
+                step = self.turn_speed if angle_remaining > self.turn_speed else angle_remaining
+                self.robot_angle += direction * step
+                self.robot_angle %= 360
+                self.action_progress += step
+                if self.trace_steps:
+                    logger.debug("Turning %s: Step %s/%s", 'right' if direction == -1 else 'left', self.action_progress, value)
+
+                if self.action_progress >= value:
+                    logger.info("Completed action: %s", action_type)
+                    self.current_action = None
+                    self.completed_actions += 1
+
+    # completes the rest of the current action in one go.
+    # a move of d units along heading a ends at pos + d * (cos a, sin a) and a turn only changes the heading,
+    # so the end pose is the same as stepping there move_speed or turn_speed at a time
+    def finish_action(self):
+        action_type, value = self.current_action
+        remaining = value - self.action_progress
+        if action_type in ['move_forward', 'move_backward']:
+            direction = 1 if action_type == 'move_forward' else -1
+            rad = math.radians(self.robot_angle)
+            dx = direction * math.cos(rad)
+            dy = direction * math.sin(rad)
+            start_x, start_y = self.robot_pos
+            obstacle = None
+            if self.world is not None and remaining != 0:
+                remaining, obstacle = self.sweep(dx, dy, remaining)
+            if self.sample_resolution and remaining > 0:
+                travelled = self.sample_resolution
+                while travelled < remaining:
+                    self.trajectory.append((start_x + travelled * dx, start_y + travelled * dy))
+                    travelled += self.sample_resolution
+            self.robot_pos[0] = start_x + remaining * dx
+            self.robot_pos[1] = start_y + remaining * dy
+            self.trajectory.append(tuple(self.robot_pos))
+            if obstacle is not None:
+                self.collide(obstacle)
+        elif action_type in ['turn_right', 'turn_left']:
+            direction = -1 if action_type == 'turn_right' else 1
+            self.robot_angle = (self.robot_angle + direction * remaining) % 360
+        self.action_progress = value
+        logger.info("Completed action: %s", action_type)
+        self.current_action = None
+        self.completed_actions += 1
+
+    # sweeps the robot from its position along (dx, dy) for distance units and returns (travelled, obstacle),
+    # see world.World.sweep. a negative distance, moveForward(-200), drives the other way and is swept that way
+    def sweep(self, dx, dy, distance):
+        if distance < 0:
+            travelled, obstacle = self.world.sweep(self.robot_pos[0], self.robot_pos[1], -dx, -dy, -distance, self.robot_size)
+            return -travelled, obstacle
+        return self.world.sweep(self.robot_pos[0], self.robot_pos[1], dx, dy, distance, self.robot_size)
+
+    def collide(self, obstacle):
+        logger.info("Collision with %s at (%.1f, %.1f)", obstacle, self.robot_pos[0], self.robot_pos[1])
+        self.collisions.append(Collision(tuple(self.robot_pos), self.robot_angle, obstacle, self.current_action, self.steps))
+
+    # steps until every queued action has finished, as fast as the CPU allows.
+    # max_steps guards against programs that never drain, the run simply stops there
+    def drain(self, max_steps=None):
+        while not self.is_idle():
+            if max_steps is not None and self.steps >= max_steps:
+                break
+            self.update_actions()
+
+    def run(self, max_steps=None):
+        self.drain(max_steps)
+        return self.result()
+
+    def result(self):
+        return SimulationResult(tuple(self.robot_pos), self.robot_angle, list(self.trajectory),
+                                self.steps, self.completed_actions, self.collisions)
+
+    def move_forward(self, distance):
+        self.enqueue_action('move_forward', distance)
+
+    def move_backward(self, distance):
+        self.enqueue_action('move_backward', distance)
+
+    def turn_right(self, angle):
+        self.enqueue_action('turn_right', angle)
+
+    def turn_left(self, angle):
+        self.enqueue_action('turn_left', angle)
+
+    def detect_obstacle(self):
+        self.mergeable = False
+        if self.world is None:
+            return False
+        self.drain()
+        return self.world.detect_obstacle(self.robot_pos[0], self.robot_pos[1])
+
+    def measure_distance(self):
+        self.mergeable = False
+        if self.world is None:
+            return 100
+        self.drain()
+        return self.world.measure_distance(self.robot_pos[0], self.robot_pos[1], self.robot_angle)
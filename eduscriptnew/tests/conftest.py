@@ -0,0 +1,11 @@
+# conftest.py
+#
+# the modules import each other by their flat names, as they do when run from eduscriptnew/,
+# and the tests share the program corpora of the benchmarks
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
@@ -0,0 +1,97 @@
+# test_cache.py
+#
+# cache.ProgramCache evicts the least recently used programs from both tiers, shares its disk tier with fresh caches,
+# ignores entries of another grammar signature, reports diagnostics on every call and falls back to its memory tier
+# for ASTs it cannot write to disk
+
+import contextlib
+import io
+import os
+
+import cache
+from cache import ProgramCache
+from bench_parse import generate_program
+
+SOURCES = [generate_program(20).replace('helper', f'helper{i}') for i in range(4)]
+
+
+# parsing is not recursive, but serializing is, so an AST nested this deeply only lives in memory
+def test_deeply_nested(tmp_path):
+    source = 'function main() {' + 'if (1 > 0) {' * 2000 + 'moveForward(1);' + '}' * 2000 + '}'
+    cache = ProgramCache(directory=str(tmp_path))
+    ast = cache.parse(source)
+    assert ast is not None
+    assert cache.parse(source) is ast
+    stats = cache.stats()
+    assert (stats['serialize_errors'], stats['memory_hits'], stats['disk_entries']) == (1, 1, 0), stats
+
+
+def test_memory_lru():
+    program_cache = ProgramCache(max_entries=2)
+    a, b, c = (program_cache.parse(source) for source in SOURCES[:3])
+    assert program_cache.stats()['evictions'] == 1
+    # SOURCES[0] was the least recently used, SOURCES[1] and [2] are still there
+    assert program_cache.parse(SOURCES[2]) is c and program_cache.parse(SOURCES[1]) is b
+    assert program_cache.parse(SOURCES[0]) is not a
+    stats = program_cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (2, 4, 2, 2), stats
+
+
+def test_disk_tier(tmp_path):
+    first = ProgramCache(directory=str(tmp_path))
+    asts = [first.parse(source) for source in SOURCES]
+    second = ProgramCache(directory=str(tmp_path))
+    assert second.stats()['disk_entries'] == len(SOURCES)
+    assert [repr(second.parse(source)) for source in SOURCES] == [repr(ast) for ast in asts]
+    assert second.stats()['disk_hits'] == len(SOURCES) and second.stats()['misses'] == 0
+
+
+def test_disk_lru(tmp_path):
+    sizes = []
+    for source in SOURCES:
+        program_cache = ProgramCache(directory=str(tmp_path / 'sizes'))
+        program_cache.parse(source)
+        sizes.append(program_cache.stats()['disk_bytes'])
+        program_cache.clear()
+    # room for the last three entries only
+    limit = sum(sizes[1:]) + sizes[0] // 2
+    program_cache = ProgramCache(directory=str(tmp_path), max_disk_bytes=limit)
+    for source in SOURCES:
+        program_cache.parse(source)
+    stats = program_cache.stats()
+    assert stats['disk_evictions'] == 1 and stats['disk_bytes'] <= limit, stats
+    fresh = ProgramCache(max_entries=1, directory=str(tmp_path))
+    fresh.parse(SOURCES[0])
+    fresh.parse(SOURCES[3])
+    assert (fresh.stats()['misses'], fresh.stats()['disk_hits']) == (1, 1), fresh.stats()
+
+
+def test_grammar_signature(tmp_path, monkeypatch):
+    ProgramCache(directory=str(tmp_path)).parse(SOURCES[0])
+    monkeypatch.setattr(cache, 'grammar_signature', lambda: 'other-grammar')
+    changed = ProgramCache(directory=str(tmp_path))
+    changed.parse(SOURCES[0])
+    assert changed.stats()['misses'] == 1, changed.stats()
+    # the entries of the old signature are removed
+    assert os.listdir(tmp_path) == ['other-grammar']
+
+
+def test_corrupt_entry(tmp_path):
+    program_cache = ProgramCache(directory=str(tmp_path))
+    ast = program_cache.parse(SOURCES[0])
+    with open(program_cache.path(program_cache.key(SOURCES[0])), 'wb') as f:
+        f.write(b'EDUA broken')
+    fresh = ProgramCache(directory=str(tmp_path))
+    assert repr(fresh.parse(SOURCES[0])) == repr(ast)
+    stats = fresh.stats()
+    assert (stats['disk_errors'], stats['misses']) == (1, 1), stats
+
+
+# a program that parsed despite an illegal character reports it on every call, from any tier
+def test_diagnostics(tmp_path):
+    source = 'function main() { moveForward(10); @ }'
+    for program_cache in (ProgramCache(directory=str(tmp_path)), ProgramCache(directory=str(tmp_path))):
+        for _ in range(2):
+            with contextlib.redirect_stdout(io.StringIO()):
+                assert program_cache.parse(source) is not None
+            assert [diagnostic.kind for diagnostic in program_cache.diagnostics] == ['lexical']
@@ -0,0 +1,48 @@
+# test_coalesce.py
+#
+# a HeadlessSimulator with coalesce=True ends in the same pose as one without, its trajectory is the uncoalesced one
+# with the points in the middle of straight lines left out, and a sensor read stops actions from merging across it
+
+import math
+import textwrap
+
+import pytest
+
+from parser import parse
+from bench_engines import CONFORMANCE_PROGRAMS, execute
+from bench_coalesce import SCRIPTS, simulate, close, is_subpath
+
+# the actions queued for 200 iterations of each script of bench_coalesce, without and with coalescing
+QUEUED = {'small moves': (200, 1), 'wiggle': (1000, 400), 'sensor barrier': (600, 400)}
+
+
+def check_same_outcome(ast, **options):
+    plain, _, _ = simulate(ast, **options)
+    coalesced, _, _ = simulate(ast, coalesce=True, **options)
+    assert close(plain.position, coalesced.position), (plain, coalesced)
+    assert math.isclose(plain.angle % 360, coalesced.angle % 360, abs_tol=1e-6), (plain, coalesced)
+    assert is_subpath(coalesced.trajectory, plain.trajectory), (plain, coalesced)
+
+
+@pytest.mark.parametrize('fast_forward', [False, True])
+@pytest.mark.parametrize('index', range(len(SCRIPTS)))
+def test_scripts(index, fast_forward):
+    name, source = SCRIPTS[index]
+    check_same_outcome(parse(source % 200), fast_forward=fast_forward)
+
+
+@pytest.mark.parametrize('index', range(len(SCRIPTS)))
+def test_queued(index):
+    name, source = SCRIPTS[index]
+    ast = parse(source % 200)
+    assert (simulate(ast)[1], simulate(ast, coalesce=True)[1]) == QUEUED[name]
+
+
+# the conformance programs that run without an error
+CLEAN = [parse(textwrap.dedent(source)) for source in CONFORMANCE_PROGRAMS]
+CLEAN = [ast for ast in CLEAN if execute('tree', ast)[1] is None]
+
+
+@pytest.mark.parametrize('index', range(len(CLEAN)))
+def test_conformance(index):
+    check_same_outcome(CLEAN[index])
@@ -0,0 +1,144 @@
+# test_collision.py
+#
+# a HeadlessSimulator with a world stops the robot at the contact point of walls, pillars and crates,
+# stepped and in fast forward, a fast robot does not tunnel through a thin wall, random drives never bring
+# the robot's circle into an obstacle or off a walled screen, and the grid-backed world.World.sweep finds
+# the same contact as sweeping against every obstacle
+
+import math
+import random
+
+import pytest
+
+from simulator import HeadlessSimulator
+from world import World, Segment, Circle, Rect
+from bench_world import random_world
+from bench_collision import random_drive, brute_sweep, random_moves
+
+
+def close(a, b):
+    return all(math.isclose(p, q, abs_tol=1e-6) for p, q in zip(a, b))
+
+
+# the robot starts at (400, 300) facing right, robot_size is 20
+CONTACTS = [
+    (Segment(500, 0, 500, 600), 0, (480, 300)),
+    (Circle(500, 300, 30), 0, (450, 300)),
+    (Rect(300, 350, 200, 40), 90, (400, 330)),
+    (Rect(250, 290, 40, 40), 180, (310, 300)),
+    (Rect(250, 250, 40, 40), 180, (290 + math.sqrt(300), 300)),     # clips the crate's bottom-right corner
+]
+
+# obstacles the robot at (400, 300) touches on its right
+TOUCHING = [Segment(420, 0, 420, 600), Rect(420, 0, 30, 600), Circle(440, 300, 20)]
+
+
+@pytest.mark.parametrize('fast_forward', [False, True])
+@pytest.mark.parametrize('index', range(len(CONTACTS)))
+def test_contact(index, fast_forward):
+    obstacle, angle, expected = CONTACTS[index]
+    simulator = HeadlessSimulator(world=World([obstacle]), fast_forward=fast_forward)
+    simulator.robot_angle = angle
+    simulator.move_forward(1000)
+    simulator.move_backward(10)
+    result = simulator.run()
+    assert len(result.collisions) == 1, result
+    assert close(result.collisions[0].position, expected), result.collisions
+    # backing away from the obstacle it touches is allowed
+    x, y = expected
+    assert close(result.position, (x - 10 * math.cos(math.radians(angle)), y - 10 * math.sin(math.radians(angle)))), result
+
+
+# a robot moving 50 units a step still stops at a wall 1 unit thin
+def test_no_tunnelling():
+    simulator = HeadlessSimulator(world=World([Rect(600, 0, 1, 600)]))
+    simulator.move_speed = 50
+    simulator.move_forward(1000)
+    assert math.isclose(simulator.run().position[0], 580, abs_tol=1e-6)
+
+
+# a negative distance drives the other way and is stopped on that side too
+@pytest.mark.parametrize('fast_forward', [False, True])
+@pytest.mark.parametrize('command, distance, expected', [
+    ('move_forward', -200, 271),
+    ('move_backward', -200, 480),
+    ('move_forward', -50, 350),
+    ('move_backward', -50, 450),
+])
+def test_negative_distance(command, distance, expected, fast_forward):
+    simulator = HeadlessSimulator(world=World([Rect(250, 0, 1, 600), Rect(500, 0, 1, 600)]), fast_forward=fast_forward)
+    simulator.enqueue_action(command, distance)
+    result = simulator.run()
+    assert math.isclose(result.position[0], expected, abs_tol=1e-6), result
+    assert len(result.collisions) == (1 if distance == -200 else 0), result
+
+
+# a robot touching an obstacle may turn and drive away from it, in either direction sign, but not into it
+@pytest.mark.parametrize('fast_forward', [False, True])
+@pytest.mark.parametrize('index', range(len(TOUCHING)))
+def test_drive_away_from_touching(index, fast_forward):
+    world = World([TOUCHING[index]])
+    simulator = HeadlessSimulator(world=world, fast_forward=fast_forward)
+    simulator.turn_left(90)
+    simulator.turn_left(-90)
+    simulator.move_backward(50)
+    simulator.move_forward(-30)
+    result = simulator.run()
+    assert close(result.position, (320, 300)) and not result.collisions, result
+    simulator = HeadlessSimulator(world=world, fast_forward=fast_forward)
+    simulator.move_forward(50)
+    simulator.move_backward(-5)
+    result = simulator.run()
+    assert close(result.position, (400, 300)) and len(result.collisions) == 2, result
+    assert close(result.collisions[0].position, (400, 300)), result.collisions
+
+
+# sliding along a wall it touches is allowed too
+def test_slide_along_wall():
+    simulator = HeadlessSimulator(world=World([Segment(0, 320, 800, 320)]))
+    simulator.move_forward(100)
+    assert math.isclose(simulator.run().position[0], 500) and not simulator.collisions
+
+
+# without a world nothing stops the robot
+def test_no_world():
+    simulator = HeadlessSimulator()
+    simulator.move_forward(1000)
+    assert simulator.run().position == (1400, 300)
+
+
+def walled_random_world():
+    rng = random.Random(3)
+    obstacles = [Circle(rng.uniform(0, 800), rng.uniform(0, 600), rng.uniform(5, 30)) for _ in range(6)]
+    obstacles += [Rect(rng.uniform(0, 800), rng.uniform(0, 600), rng.uniform(5, 80), rng.uniform(5, 80)) for _ in range(6)]
+    obstacles += [Segment(rng.uniform(0, 800), rng.uniform(0, 600), rng.uniform(0, 800), rng.uniform(0, 600)) for _ in range(6)]
+    # keep the start position free
+    obstacles = [obstacle for obstacle in obstacles if obstacle.distance_to(400, 300) > 25]
+    world = World(obstacles, cell_size=40)
+    world.add_boundary(800, 600)
+    return world
+
+
+WALLED_WORLD = walled_random_world()
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_random_drive(seed):
+    world = WALLED_WORLD
+    stepped = random_drive(HeadlessSimulator(world=world, sample_resolution=None), 30, seed)
+    fast = random_drive(HeadlessSimulator(world=world, fast_forward=True, sample_resolution=2), 30, seed)
+    for result in (stepped, fast):
+        for x, y in result.trajectory:
+            assert 0 < x < 800 and 0 < y < 600, (x, y)
+            gap = min(obstacle.distance_to(x, y) for obstacle in world.obstacles)
+            assert gap >= 20 - 1e-6, (x, y, gap)
+    assert close(stepped.position, fast.position), (stepped, fast)
+    assert len(stepped.collisions) == len(fast.collisions), (stepped, fast)
+
+
+def test_broad_phase():
+    world, side = random_world(2000)
+    for x, y, dx, dy, distance in random_moves(world, side, 300):
+        travelled, hit = world.sweep(x, y, dx, dy, distance, 20)
+        expected, expected_hit = brute_sweep(world, x, y, dx, dy, distance, 20)
+        assert math.isclose(travelled, expected, abs_tol=1e-9) and hit is expected_hit, ((x, y, dx, dy), travelled, expected)
@@ -0,0 +1,83 @@
+# test_diagnostics.py
+#
+# one parser.parse_with_diagnostics pass reports every syntax error and illegal character with its line and column,
+# keeps the intact statements in the partial AST, and agrees with parse and parse_stream on what is broken
+
+import contextlib
+import io
+import textwrap
+
+import pytest
+
+from parser import get_parser, parse, parse_stream, parse_with_diagnostics
+from bench_engines import CONFORMANCE_PROGRAMS
+from bench_diagnostics import broken_program
+
+
+def kept(result):
+    return [stmt.command for stmt in result.ast.functions[-1].body]
+
+
+@pytest.mark.parametrize('index', range(len(CONFORMANCE_PROGRAMS)))
+def test_valid(index):
+    source = textwrap.dedent(CONFORMANCE_PROGRAMS[index])
+    result = parse_with_diagnostics(source)
+    assert not result.diagnostics
+    assert repr(result.ast) == repr(parse(source))
+
+
+# the statement after the missing ; is where the error shows, the parser resumes after the next ;
+def test_missing_semicolon():
+    result = parse_with_diagnostics('function main() {\n  moveForward(1)\n  turnLeft(2);\n  moveBackward(3);\n}\n')
+    assert [(d.kind, d.lineno, d.column) for d in result.diagnostics] == [('syntax', 3, 3)]
+    assert kept(result) == ['moveBackward']
+
+
+def test_bad_expression():
+    result = parse_with_diagnostics('function main() {\n  moveForward(1 + * 2);\n  turnLeft(2);\n}\n')
+    assert [(d.kind, d.lineno, d.column) for d in result.diagnostics] == [('syntax', 2, 19)]
+    assert kept(result) == ['turnLeft']
+
+
+# an illegal character is skipped, so the statement around it survives
+def test_illegal_character():
+    result = parse_with_diagnostics('function main() {\n  moveForward(1) $;\n  turnLeft(2);\n}\n')
+    assert [(d.kind, d.lineno, d.column) for d in result.diagnostics] == [('lexical', 2, 18)]
+    assert "'$'" in result.diagnostics[0].message
+    assert kept(result) == ['moveForward', 'turnLeft']
+
+
+# a program cut off before its closing braces keeps every complete statement and reports the end of the input once
+@pytest.mark.parametrize('source', [
+    'function main() { moveForward(1); repeat(2) { turnLeft(90); } turnLeft(5);',
+    'function main() { moveForward(1); repeat(2) { turnLeft(90); } turnLeft(5); moveForward(1',
+])
+def test_unclosed(source):
+    complete = parse('function main() { moveForward(1); repeat(2) { turnLeft(90); } turnLeft(5); }')
+    for result in (parse_with_diagnostics(source), get_parser().parse_stream_with_diagnostics(io.StringIO(source), 8)):
+        assert repr(result.ast) == repr(complete), result
+        assert [diagnostic.message for diagnostic in result.diagnostics] == ['Syntax error at EOF'], result
+
+
+def test_unclosed_block():
+    complete = parse('function main() { moveForward(1); repeat(2) { turnLeft(90); } }')
+    result = parse_with_diagnostics('function main() { moveForward(1); repeat(2) { turnLeft(90);')
+    assert repr(result.ast) == repr(complete), result
+    assert [diagnostic.message for diagnostic in result.diagnostics] == ['Syntax error at EOF'], result
+
+
+# every breakage of bench_diagnostics.broken_program is found with its line and column in a single pass
+def test_broken_program():
+    statements = 2000
+    source, expected = broken_program(statements, 20)
+    result = parse_with_diagnostics(source)
+    syntax = {diagnostic.lineno: diagnostic.column for diagnostic in result.syntax_errors()}
+    lexical = [diagnostic.lineno for diagnostic in result.diagnostics if diagnostic.kind == 'lexical']
+    assert syntax == {line: column for line, column in expected.items() if column is not None}
+    assert lexical == [line for line, column in expected.items() if column is None]
+    main = result.ast.functions[-1]
+    assert main.name == 'main' and len(main.body) == statements - len(syntax)
+    with contextlib.redirect_stdout(io.StringIO()) as messages:
+        assert parse(source) is None
+        assert parse_stream(io.StringIO(source), 1024) is None
+    assert messages.getvalue().count('Syntax error') == 2 * len(syntax)
@@ -0,0 +1,35 @@
+# test_engines.py
+#
+# every execution engine and the cooperative interpreter must enqueue the same actions and end with the same
+# error on the conformance programs, and stop at the same point when a limit fires
+
+import textwrap
+
+import pytest
+
+from parser import parse
+from engines import ENGINES
+from bench_engines import CONFORMANCE_PROGRAMS, LIMIT_PROGRAMS, execute, execute_cooperative
+
+
+@pytest.mark.parametrize('engine', list(ENGINES) + ['cooperative'])
+@pytest.mark.parametrize('index', range(len(CONFORMANCE_PROGRAMS)))
+def test_conformance(index, engine):
+    ast = parse(textwrap.dedent(CONFORMANCE_PROGRAMS[index]))
+    expected = execute('tree', ast)
+    result = execute_cooperative(ast) if engine == 'cooperative' else execute(engine, ast)
+    assert result == expected
+
+
+@pytest.mark.parametrize('index', range(len(LIMIT_PROGRAMS)))
+def test_limits(index):
+    source, limits = LIMIT_PROGRAMS[index]
+    ast = parse(textwrap.dedent(source))
+    results = {engine: execute(engine, ast, limits) for engine in ENGINES}
+    results['cooperative'] = execute_cooperative(ast, limits)
+    errors = {engine: error for engine, (actions, error) in results.items()}
+    assert all(error and error.startswith('LimitExceeded') for error in errors.values()), errors
+    assert len(set(errors.values())) == 1, errors
+    # the wall-clock limit stops the engines after different amounts of work, only its error has to match
+    if limits.max_seconds is None:
+        assert len(set(map(repr, results.values()))) == 1, results
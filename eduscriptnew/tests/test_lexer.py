@@ -0,0 +1,68 @@
+# test_lexer.py
+#
+# lexer.FastLexer and the PLY lexer must agree token for token: type, value, line, position and the error
+# messages, on the conformance programs, hand-picked odd sources and random character soup, both on whole
+# texts and streamed through lexer.StreamLexer, and the parser must build the same AST on top of either
+
+import contextlib
+import io
+import random
+import textwrap
+
+import pytest
+
+from lexer import build_lexer, reserved, LEXER_ENGINES, StreamLexer
+from parser import build_parser
+from bench_engines import CONFORMANCE_PROGRAMS
+from test_stream import ODD_SOURCES
+
+# pieces random sources are glued from: every keyword and operator, near misses and illegal characters
+FRAGMENTS = list(reserved) + [
+    '==', '!=', '<=', '>=', '&&', '||', '(', ')', '{', '}', ',', ';', '+', '-', '*', '/', '<', '>', '!',
+    '=', '&', '|', '.', '@', '#', '\r', 'é', '٣',
+    'x', '_a1', 'Forward', 'move', '0', '42', '3.14', '7.', ' ', '  ', '\t', '\n', '\n\n',
+]
+
+
+def random_sources(count, seed=1):
+    rng = random.Random(seed)
+    return [''.join(rng.choice(FRAGMENTS) for _ in range(rng.randrange(1, 80))) for _ in range(count)]
+
+
+SOURCES = [textwrap.dedent(source) for source in CONFORMANCE_PROGRAMS] + ODD_SOURCES + random_sources(2000)
+
+PARSERS = {engine: build_parser(frozen=True, lexer=engine) for engine in LEXER_ENGINES}
+
+
+def tokens(engine, source):
+    lexer = build_lexer(frozen=True, engine=engine)
+    lexer.lineno = 1
+    lexer.line_start = 0
+    lexer.input(source)
+    messages = io.StringIO()
+    with contextlib.redirect_stdout(messages):
+        result = [(tok.type, tok.value, type(tok.value), tok.lineno, tok.lexpos) for tok in iter(lexer.token, None)]
+    return result, messages.getvalue()
+
+
+def streamed(engine, source, chunk_size):
+    messages = io.StringIO()
+    with contextlib.redirect_stdout(messages):
+        stream = StreamLexer(io.StringIO(source), build_lexer(frozen=True, engine=engine), chunk_size)
+        result = [(tok.type, tok.value, type(tok.value), tok.lineno, tok.lexpos, tok.column) for tok in stream]
+    return result, messages.getvalue()
+
+
+def parsed(parser, source):
+    messages = io.StringIO()
+    with contextlib.redirect_stdout(messages):
+        return repr(parser.parse(source)), messages.getvalue()
+
+
+@pytest.mark.parametrize('index', range(len(SOURCES)))
+def test_equivalence(index):
+    source = SOURCES[index]
+    assert tokens('fast', source) == tokens('ply', source)
+    for chunk_size in (1, 5, 4096):
+        assert streamed('fast', source, chunk_size) == streamed('ply', source, chunk_size), chunk_size
+    assert parsed(PARSERS['fast'], source) == parsed(PARSERS['ply'], source)
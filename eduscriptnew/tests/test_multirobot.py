@@ -0,0 +1,45 @@
+# test_multirobot.py
+#
+# every robot of a multirobot.MultiRobotSimulator ends exactly where its program takes a lone HeadlessSimulator:
+# pose, path, steps, actions, collisions and errors, with and without a world of obstacles
+
+import random
+import textwrap
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from parser import parse
+from multirobot import MultiRobotSimulator
+from bench_engines import CONFORMANCE_PROGRAMS
+from bench_world import WALL_SCRIPT
+from bench_multirobot import random_program, alone, same_result, walled_world, competition
+
+
+def programs():
+    rng = random.Random(5)
+    sources = [textwrap.dedent(source) for source in CONFORMANCE_PROGRAMS] + [WALL_SCRIPT]
+    sources += [random_program(rng) for _ in range(40)]
+    return [parse(source) for source in sources]
+
+
+@pytest.mark.parametrize('walled', [False, True])
+def test_matches_lone_simulators(walled):
+    world = walled_world() if walled else None
+    asts = programs()
+    results, errors = MultiRobotSimulator(len(asts), world=world).run_programs(asts)
+    for index, ast in enumerate(asts):
+        expected, error = alone(ast, world)
+        assert errors[index] == error, index
+        assert same_result(results[index], expected), (index, results[index], expected)
+
+
+# a single robot and many robots running the same kind of program
+@pytest.mark.parametrize('count', [1, 100])
+def test_competition(count):
+    asts = competition(count)
+    results, errors = MultiRobotSimulator(count).run_programs(asts)
+    assert not any(errors)
+    for ast, result in zip(asts, results):
+        assert same_result(result, alone(ast)[0])
@@ -0,0 +1,69 @@
+# test_optimizer.py
+#
+# optimizer.optimize, with any combination of its fold, prune and unroll passes, keeps every conformance program's
+# actions and errors on every engine, and every engine stops an optimized program at the same point when a limit fires
+
+import textwrap
+
+import pytest
+
+from parser import parse, Number, IfStatement, RepeatLoop
+from engines import ENGINES
+from optimizer import optimize
+from bench_engines import CONFORMANCE_PROGRAMS, LIMIT_PROGRAMS, execute, execute_cooperative
+from bench_optimizer import CONSTANT_LOOP
+
+PASSES = {
+    'fold': {'fold': True, 'prune': False, 'unroll': False},
+    'prune': {'fold': False, 'prune': True, 'unroll': False},
+    'unroll': {'fold': False, 'prune': False, 'unroll': True},
+    # what engines.create_interpreter runs for the vm
+    'prune and unroll': {'fold': False},
+    'all': {},
+}
+
+
+@pytest.mark.parametrize('passes', list(PASSES))
+@pytest.mark.parametrize('index', range(len(CONFORMANCE_PROGRAMS)))
+def test_conformance(index, passes):
+    ast = parse(textwrap.dedent(CONFORMANCE_PROGRAMS[index]))
+    expected = execute('tree', ast)
+    optimized = optimize(ast, **PASSES[passes])
+    for engine in ENGINES:
+        assert execute(engine, optimized) == expected, engine
+    assert execute_cooperative(optimized) == expected
+
+
+# the optimized programs run fewer statements, so they may stop elsewhere, but every engine has to agree
+@pytest.mark.parametrize('index', [index for index, (source, limits) in enumerate(LIMIT_PROGRAMS) if limits.max_seconds is None])
+def test_limits(index):
+    source, limits = LIMIT_PROGRAMS[index]
+    optimized = optimize(parse(textwrap.dedent(source)))
+    results = {engine: execute(engine, optimized, limits) for engine in ENGINES}
+    results['cooperative'] = execute_cooperative(optimized, limits)
+    assert len(set(map(repr, results.values()))) == 1, results
+
+
+@pytest.mark.parametrize('passes', list(PASSES))
+def test_constant_loop(passes):
+    ast = parse(CONSTANT_LOOP % 3)
+    optimized = optimize(ast, **PASSES[passes])
+    expected = execute('tree', ast)
+    for engine in ENGINES:
+        assert execute(engine, optimized) == expected, engine
+
+
+def test_passes():
+    body = optimize(parse('function main() { moveForward(2 * 3 + 1); if (1 > 2) { turnLeft(1); } repeat(2) { turnRight(4); } }'))
+    body = body.functions[0].body
+    assert [stmt.command for stmt in body] == ['moveForward', 'turnRight', 'turnRight']
+    assert isinstance(body[0].args[0], Number) and body[0].args[0].value == 7
+    kept = optimize(parse('function main() { if (1 > 2) { turnLeft(1); } repeat(2) { turnRight(4); } }'), prune=False, unroll=False)
+    assert [type(stmt) for stmt in kept.functions[0].body] == [IfStatement, RepeatLoop]
+
+
+# a loop whose unrolled body would exceed the limit stays a loop
+def test_unroll_limit():
+    ast = parse('function main() { repeat(33) { turnRight(4); } repeat(32) { turnRight(4); } }')
+    body = optimize(ast).functions[0].body
+    assert isinstance(body[0], RepeatLoop) and len(body) == 33
@@ -0,0 +1,79 @@
+# test_serialize.py
+#
+# every conformance program and a few hand-built edge cases survive serialize.dumps/loads and the mmap-based
+# dump/load unchanged, and broken payloads are rejected
+
+import os
+import textwrap
+
+import pytest
+
+from parser import parse, Program, FunctionDef, Command, IfStatement, Number
+from serialize import dumps, loads, dump, load, SerializationError, HEADER
+from bench_engines import CONFORMANCE_PROGRAMS
+from bench_parse import generate_program
+
+# values and shapes the parser does not produce itself but an AST may still hold
+EDGE_CASES = [
+    Program([]),
+    Program([FunctionDef('main', [])]),
+    Program([FunctionDef('main', [
+        Command('moveForward', [Number(True)]),
+        Command('moveForward', [Number(1.0)]),
+        Command('moveForward', [Number(10 ** 30)]),
+        Command('turnLeft', [Number(float('inf'))]),
+        IfStatement(Number(0), [], []),
+        IfStatement(Number(0), [], None),
+    ])]),
+]
+
+PROGRAMS = [parse(textwrap.dedent(source)) for source in CONFORMANCE_PROGRAMS] + EDGE_CASES
+
+
+@pytest.mark.parametrize('index', range(len(PROGRAMS)))
+def test_round_trip(index, tmp_path):
+    program = PROGRAMS[index]
+    assert repr(loads(dumps(program))) == repr(program)
+    path = os.path.join(tmp_path, 'program.ast')
+    dump(program, path)
+    assert repr(load(path)) == repr(program)
+
+
+def test_value_types():
+    values = [stmt.args[0].value for stmt in loads(dumps(EDGE_CASES[2])).functions[0].body[:4]]
+    assert [type(value) for value in values] == [bool, float, int, float], values
+
+
+@pytest.mark.parametrize('cut', ['empty', 'magic', 'truncated'])
+def test_broken_payload(cut):
+    data = dumps(PROGRAMS[0])
+    broken = {'empty': b'', 'magic': b'EDUB' + data[4:], 'truncated': data[:-4]}[cut]
+    with pytest.raises(SerializationError):
+        loads(broken)
+
+
+# a body count and value indexes above 32767 are kept aside, the other words stay int16
+def test_wide_words(tmp_path):
+    program = Program([FunctionDef('main', [Command('moveForward', [Number(i)]) for i in range(40000)])])
+    data = dumps(program)
+    # the body count and the indexes of the values 32768 and up
+    assert HEADER.unpack_from(data)[5] == 1 + 40000 - 32768
+    assert repr(loads(data)) == repr(program)
+    path = os.path.join(tmp_path, 'program.ast')
+    dump(program, path)
+    assert repr(load(path)) == repr(program)
+
+
+def test_smaller_than_source():
+    source = generate_program(20000)
+    assert len(dumps(parse(source))) < len(source)
+
+
+def test_corrupt_wide_position():
+    program = Program([FunctionDef('main', [Command('moveForward', [Number(i)]) for i in range(40000)])])
+    data = bytearray(dumps(program))
+    strings_size, values_size = HEADER.unpack_from(data)[3:5]
+    wide_start = HEADER.size + strings_size + values_size
+    data[wide_start:wide_start + 4] = (10 ** 9).to_bytes(4, 'little')
+    with pytest.raises(SerializationError):
+        loads(bytes(data))
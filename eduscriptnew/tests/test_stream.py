@@ -0,0 +1,78 @@
+# test_stream.py
+#
+# lexer.StreamLexer yields exactly the tokens, positions, columns and error messages of the regular lexer
+# for any chunk size, parser.parse_stream builds the same AST as parser.parse, and a minified script
+# without any whitespace is still lexed in pieces of about chunk_size
+
+import contextlib
+import io
+import re
+import textwrap
+
+import pytest
+
+from lexer import StreamLexer, load_frozen_lexer, find_column
+from parser import parse, parse_stream
+from bench_engines import CONFORMANCE_PROGRAMS
+from bench_parse import generate_program
+
+# illegal characters, operators whose first character is illegal on its own and long runs without whitespace
+ODD_SOURCES = [
+    'function main() {\n  moveForward(1 @ 2);\n\tturnLeft(3 | 4 & 5 = 6);\n}\n',
+    'function main(){moveForward(123456789);turnLeft(1.25);if(1<=2&&3!=4||!0){moveBackward(7);}}',
+    '\n\n\nfunction   main ( )\n{\n}\n#',
+    '',
+]
+
+SOURCES = [textwrap.dedent(source) for source in CONFORMANCE_PROGRAMS] + ODD_SOURCES
+
+
+def regular_tokens(source):
+    lexer = load_frozen_lexer()
+    lexer.lineno = 1
+    lexer.input(source)
+    messages = io.StringIO()
+    with contextlib.redirect_stdout(messages):
+        tokens = [(tok.type, tok.value, tok.lineno, tok.lexpos, find_column(source, tok)) for tok in iter(lexer.token, None)]
+    return tokens, messages.getvalue()
+
+
+def streamed_tokens(source, chunk_size):
+    messages = io.StringIO()
+    with contextlib.redirect_stdout(messages):
+        tokens = [(tok.type, tok.value, tok.lineno, tok.lexpos, tok.column)
+                  for tok in StreamLexer(io.StringIO(source), chunk_size=chunk_size)]
+    return tokens, messages.getvalue()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 65536])
+@pytest.mark.parametrize('index', range(len(SOURCES)))
+def test_tokens(index, chunk_size):
+    source = SOURCES[index]
+    assert streamed_tokens(source, chunk_size) == regular_tokens(source)
+
+
+@pytest.mark.parametrize('index', range(len(SOURCES)))
+def test_parse(index):
+    source = SOURCES[index]
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = repr(parse(source))
+        assert repr(parse_stream(io.StringIO(source), 5)) == expected
+        # an iterable of strings works as well as a file object
+        assert repr(parse_stream(source.splitlines(keepends=True))) == expected
+
+
+# a generated program of several MB with every optional space and newline taken out
+def test_minified():
+    source = re.sub(r'\s*([;{}(),<>*+=])\s*', r'\1', ' '.join(generate_program(100000).split()))
+    assert len(source) > 2 * 1024 * 1024 and source.count(' ') < 10
+    chunk_size = 4096
+    stream = StreamLexer(io.StringIO(source), chunk_size=chunk_size)
+    lexer = load_frozen_lexer()
+    lexer.input(source)
+    longest = 0
+    for tok, expected in zip(iter(stream.token, None), iter(lexer.token, None)):
+        assert (tok.type, tok.value, tok.lexpos) == (expected.type, expected.value, expected.lexpos)
+        longest = max(longest, len(stream.lexer.lexdata), len(stream.pending))
+    assert stream.token() is None and lexer.token() is None
+    assert longest <= 2 * chunk_size, longest
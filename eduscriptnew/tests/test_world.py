@@ -0,0 +1,116 @@
+# test_world.py
+#
+# the grid-backed world.World.detect_obstacle and measure_distance answer exactly like testing every obstacle,
+# for segments, circles and rectangles, hand-placed walls have their known distances, rays running along
+# and through the borders of grid cells miss nothing, and a sensor-driven script ends in the same pose on every engine
+
+import math
+import os
+import random
+
+import pytest
+
+from parser import parse
+from engines import ENGINES, create_interpreter
+from interpreter import InterpreterWithSimulator
+from simulator import HeadlessSimulator
+from world import World, Segment, Circle, Rect, load_world
+from bench_world import WALL_SCRIPT, random_world, random_queries, brute_detect, brute_measure
+
+# a box from (0, 0) to (200, 100) of segments, a pillar and a crate inside it
+BOX = World([Segment(0, 0, 200, 0), Segment(200, 0, 200, 100), Segment(200, 100, 0, 100), Segment(0, 100, 0, 0),
+             Circle(150, 50, 10), Rect(40, 60, 20, 20)], cell_size=16)
+
+
+@pytest.mark.parametrize('query, distance', [
+    ((100, 50, 0), 40),       # east to the pillar
+    ((100, 50, 270), 50),     # north, y points down
+    ((100, 50, 90), 50),      # south
+    ((100, 50, 180), 100),    # west, the wall at 100 is exactly at sensor range
+    ((50, 50, 90), 10),       # south onto the crate
+    ((50, 70, 45), 0),        # inside the crate
+    ((190, 50, 0), 10),       # past the pillar
+])
+def test_walls(query, distance):
+    assert math.isclose(BOX.measure_distance(*query), distance, abs_tol=1e-9)
+
+
+def test_detect():
+    assert BOX.detect_obstacle(100, 20) and BOX.detect_obstacle(150, 75) and not BOX.detect_obstacle(100, 50)
+
+
+def test_empty_world():
+    assert World().measure_distance(0, 0, 0) == 100 and not World().detect_obstacle(0, 0)
+
+
+# one obstacle of each kind, 60 units east of a ray that runs exactly along the border between two rows of cells
+@pytest.mark.parametrize('obstacle', [
+    Segment(110, 0, 110, 100),
+    Segment(110, 50, 140, 50),      # lies on the border itself
+    Circle(120, 50, 10),
+    Circle(110, 60, 10),            # only touches the border from below
+    Rect(110, 50, 20, 20),          # its top edge is the border
+    Rect(110, 30, 20, 20),          # its bottom edge is the border
+], ids=repr)
+@pytest.mark.parametrize('cell_size', [10, 25, 50])
+def test_ray_along_cell_border(obstacle, cell_size):
+    world = World([obstacle], cell_size=cell_size)
+    assert math.isclose(world.measure_distance(50, 50, 0), 60, abs_tol=1e-9)
+    assert world.measure_distance(50, 50, 0) == brute_measure(world, 50, 50, 0)
+    # the same ray the other way round and along a column border
+    mirrored = World([Segment(-10, 0, -10, 100), Circle(50, 120, 10), Rect(40, -30, 20, 20)], cell_size=cell_size)
+    assert math.isclose(mirrored.measure_distance(50, 50, 180), 60, abs_tol=1e-9)
+    assert math.isclose(mirrored.measure_distance(50, 50, 90), 60, abs_tol=1e-9)
+    assert math.isclose(mirrored.measure_distance(50, 50, 270), 60, abs_tol=1e-9)
+
+
+# queries starting on cell borders and corners, along the axes and through the corners of cells
+def test_border_queries():
+    world, side = random_world(2000)
+    rng = random.Random(5)
+    for _ in range(500):
+        x = rng.randrange(int(side) // world.cell_size) * world.cell_size
+        y = rng.randrange(int(side) // world.cell_size) * world.cell_size
+        x += rng.choice([0, 0, rng.uniform(0, world.cell_size)])
+        angle = rng.choice([0, 45, 90, 135, 180, 225, 270, 315])
+        assert world.detect_obstacle(x, y) == brute_detect(world, x, y), (x, y)
+        measured, expected = world.measure_distance(x, y, angle), brute_measure(world, x, y, angle)
+        assert math.isclose(measured, expected, abs_tol=1e-9), ((x, y, angle), measured, expected)
+
+
+def test_random_queries():
+    world, side = random_world(2000)
+    for x, y, angle in random_queries(500, side):
+        assert world.detect_obstacle(x, y) == brute_detect(world, x, y), (x, y)
+        measured, expected = world.measure_distance(x, y, angle), brute_measure(world, x, y, angle)
+        assert math.isclose(measured, expected, abs_tol=1e-9), ((x, y, angle), measured, expected)
+
+
+def test_save_load(tmp_path):
+    world, side = random_world(1000)
+    path = os.path.join(tmp_path, 'world.json')
+    world.save(path)
+    loaded = load_world(path)
+    assert repr(loaded.obstacles) == repr(world.obstacles) and loaded.grid.keys() == world.grid.keys()
+
+
+def test_engines_agree():
+    world = World([Segment(0, 0, 800, 0), Segment(800, 0, 800, 600), Segment(800, 600, 0, 600), Segment(0, 600, 0, 0),
+                   Circle(500, 250, 30), Rect(550, 350, 60, 60)])
+    ast = parse(WALL_SCRIPT)
+    results = {}
+    for engine in ENGINES:
+        simulator = HeadlessSimulator(world=world)
+        create_interpreter(ast, simulator, engine).interpret()
+        results[engine] = simulator.run()
+        simulator = HeadlessSimulator(fast_forward=True, coalesce=True, world=world)
+        create_interpreter(ast, simulator, engine).interpret()
+        results[engine + ' fast'] = simulator.run()
+    simulator = HeadlessSimulator(world=world)
+    InterpreterWithSimulator(ast, simulator).run_to_end()
+    results['cooperative'] = simulator.result()
+    poses = {name: (round(result.position[0], 6), round(result.position[1], 6), round(result.angle % 360, 6))
+             for name, result in results.items()}
+    assert len(set(poses.values())) == 1, poses
+    # the robot must have met the walls, not driven 60 x 7 units straight ahead
+    assert poses['cooperative'][2] != 0, poses
@@ -0,0 +1,146 @@
+# vm.py
+
+from compiler import (compile_program, COMMAND_CONST, SENSOR_OP_CONST, COMMAND_OP_CONST, FOR_ITER, CALL_SENSOR,
+                      POP_JUMP_IF_FALSE, OP_CONST_JUMP_IF_FALSE, JUMP, LOAD_CONST, BINARY_OP_CONST, COMMAND, BINARY_OP,
+                      CALL_FUNCTION, POP_TOP, RETURN_VALUE, UNARY_NOT, GET_ITER, LOAD_NAME, CALL_BUILTIN, COMMAND_N, TICK,
+                      FOR_ITER_TICK)
+from interpreter import Interpreter
+from limits import LimitExceeded
+
+# runs the bytecode produced by compiler.py on a value stack.
+# it reuses Interpreter's environments, built-in error handling and simulator wiring,
+# so the simulator receives exactly the same enqueue_action calls as with the tree-walking interpreter.
+# sensor built-ins go straight to the simulator method and skip the interpreter's DEBUG trace.
+# statements are only counted (with TICK and FOR_ITER_TICK instructions) when the limits need it
+class VirtualMachine(Interpreter):
+    def __init__(self, ast, simulator, limits=None):
+        super().__init__(ast, simulator, limits)
+        self.code_objects = compile_program(ast, self.limits.counts_statements())
+        self.linked = {name: self.link(code_object.code) for name, code_object in self.code_objects.items()}
+
+    # code objects name sensors by simulator method so they can be shared between simulators,
+    # linking swaps those names for this simulator's bound methods once, before anything runs
+    def link(self, code):
+        linked = []
+        for op, arg in code:
+            if op == CALL_SENSOR:
+                arg = getattr(self.simulator, arg)
+            elif op == SENSOR_OP_CONST:
+                arg = (getattr(self.simulator, arg[0]),) + arg[1:]
+            linked.append((op, arg))
+        return tuple(linked)
+
+    def interpret(self):
+        if 'main' not in self.linked:
+            raise Exception("No 'main' function defined.")
+        self.execute_function('main', [])
+
+    def execute_function(self, name, args):
+        if name in self.built_in_functions:
+            return self.built_in_functions[name](args)
+        elif name in self.linked:
+            self.depth += 1
+            if self.depth > self.max_depth:
+                raise LimitExceeded('depth', self.max_depth)
+            value = self.run(self.linked[name])
+            self.depth -= 1
+            return value
+        else:
+            raise Exception(f"Undefined function '{name}'")
+
+    # the dispatch loop. each user function call gets its own Python frame and value stack,
+    # so RETURN_VALUE simply returns and discards any loop counters still on the stack.
+    # the top of the stack is cached in the local "top", the list only holds the values below it
+    # (starting with a placeholder, so every instruction can pop unconditionally)
+    def run(self, code):
+        stack = [None]
+        push = stack.append
+        pop = stack.pop
+        top = None
+        enqueue = self.enqueue
+        budget = self.budget
+        pc = 0
+        while True:
+            op, arg = code[pc]
+            pc += 1
+            if op == COMMAND_CONST:
+                enqueue(arg[0], arg[1])
+            elif op == SENSOR_OP_CONST:
+                push(top)
+                top = arg[1](arg[0](), arg[2])
+            elif op == COMMAND_OP_CONST:
+                enqueue(arg[0], arg[1](top, arg[2]))
+                top = pop()
+            elif op == FOR_ITER:
+                if top > 0:
+                    top -= 1
+                    pc = arg[0]
+                else:
+                    top = pop()
+                    pc = arg[1]
+            elif op == FOR_ITER_TICK:
+                if top > 0:
+                    top -= 1
+                    pc = arg[0]
+                    budget.remaining -= arg[2]
+                    if budget.remaining < 0:
+                        budget.exhausted()
+                else:
+                    top = pop()
+                    pc = arg[1]
+            elif op == TICK:
+                budget.remaining -= arg
+                if budget.remaining < 0:
+                    budget.exhausted()
+            elif op == CALL_SENSOR:
+                push(top)
+                top = arg()
+            elif op == POP_JUMP_IF_FALSE:
+                condition = top
+                top = pop()
+                if not condition:
+                    pc = arg
+            elif op == OP_CONST_JUMP_IF_FALSE:
+                condition = arg[0](top, arg[1])
+                top = pop()
+                if not condition:
+                    pc = arg[2]
+            elif op == JUMP:
+                pc = arg
+            elif op == LOAD_CONST:
+                push(top)
+                top = arg
+            elif op == BINARY_OP_CONST:
+                top = arg[0](top, arg[1])
+            elif op == COMMAND:
+                enqueue(arg, top)
+                top = pop()
+            elif op == BINARY_OP:
+                top = arg(pop(), top)
+            elif op == CALL_FUNCTION:
+                push(top)
+                top = self.execute_function(arg, [])
+            elif op == POP_TOP:
+                top = pop()
+            elif op == RETURN_VALUE:
+                return top
+            elif op == UNARY_NOT:
+                top = not top
+            elif op == GET_ITER:
+                top = int(top)
+            elif op == LOAD_NAME:
+                # user functions take no parameters, so their scope is always empty and lookups go to the globals
+                push(top)
+                top = self.global_env.get(arg)
+            elif op == CALL_BUILTIN:
+                push(top)
+                top = self.built_in_functions[arg[0]](arg[1])
+            elif op == COMMAND_N:
+                action_type, count = arg
+                push(top)
+                values = stack[len(stack) - count:]
+                del stack[len(stack) - count:]
+                top = pop()
+                enqueue(action_type, values[0])
+            else:
+                raise Exception(f"Unknown opcode {op}")
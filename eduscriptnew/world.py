@@ -0,0 +1,341 @@
+# world.py
+
+import json
+import math
+
+# obstacles the robot's sensors can see. every shape has
+#   bounds()                  (min_x, min_y, max_x, max_y) of the shape
+#   distance_to(x, y)         distance from a point to the shape, 0 on or inside it
+#   raycast(x, y, dx, dy)     distance along the unit direction (dx, dy) to the first point of the shape,
+#                             0 if the ray starts on or inside it, None if it misses
+#   sweep(x, y, dx, dy, r)    distance a circle of radius r moving from (x, y) along (dx, dy) travels until it
+#                             touches the shape, None if it never does. the circle must start clear of the shape
+# coordinates are world units with y pointing down, like the simulator's robot_pos.
+# sweeping a circle is casting a ray against the shape grown by the circle's radius, so the sweeps are built
+# from the three ray tests below
+
+# distance along the unit direction (dx, dy) to the segment from (x1, y1) to (x2, y2), None if the ray misses it
+def ray_segment(x, y, dx, dy, x1, y1, x2, y2):
+    ex, ey = x2 - x1, y2 - y1
+    wx, wy = x1 - x, y1 - y
+    denominator = dx * ey - dy * ex
+    if denominator == 0:
+        if wx * dy - wy * dx != 0:
+            return None  # parallel and beside the ray
+        # on the ray's line: the ray starts on the segment or reaches its nearer end
+        near, far = sorted((wx * dx + wy * dy, (wx + ex) * dx + (wy + ey) * dy))
+        if far < 0:
+            return None
+        return max(near, 0.0)
+    t = (wx * ey - wy * ex) / denominator
+    s = (wx * dy - wy * dx) / denominator
+    if t < 0 or s < 0 or s > 1:
+        return None
+    return t
+
+def ray_circle(x, y, dx, dy, cx, cy, radius):
+    ox, oy = x - cx, y - cy
+    c = ox * ox + oy * oy - radius * radius
+    if c <= 0:
+        return 0.0
+    b = ox * dx + oy * dy
+    discriminant = b * b - c
+    if b > 0 or discriminant < 0:
+        return None  # moving away from the circle, or passing it
+    return -b - math.sqrt(discriminant)
+
+# slab method: the ray is inside the box between the last entry and the first exit of the two slabs
+def ray_box(x, y, dx, dy, min_x, min_y, max_x, max_y):
+    enter, leave = 0.0, math.inf
+    for origin, direction, low, high in ((x, dx, min_x, max_x), (y, dy, min_y, max_y)):
+        if direction == 0:
+            if origin < low or origin > high:
+                return None
+            continue
+        t1, t2 = (low - origin) / direction, (high - origin) / direction
+        if t1 > t2:
+            t1, t2 = t2, t1
+        enter, leave = max(enter, t1), min(leave, t2)
+        if enter > leave:
+            return None
+    return enter
+
+# the smallest of the hits, None if there are none
+def first_hit(hits):
+    hits = [hit for hit in hits if hit is not None]
+    return min(hits) if hits else None
+
+class Segment:
+    __slots__ = ('x1', 'y1', 'x2', 'y2')
+
+    def __init__(self, x1, y1, x2, y2):
+        self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+
+    def bounds(self):
+        return min(self.x1, self.x2), min(self.y1, self.y2), max(self.x1, self.x2), max(self.y1, self.y2)
+
+    def distance_to(self, x, y):
+        ex, ey = self.x2 - self.x1, self.y2 - self.y1
+        length = ex * ex + ey * ey
+        s = 0.0 if length == 0 else max(0.0, min(1.0, ((x - self.x1) * ex + (y - self.y1) * ey) / length))
+        return math.hypot(x - self.x1 - s * ex, y - self.y1 - s * ey)
+
+    def raycast(self, x, y, dx, dy):
+        return ray_segment(x, y, dx, dy, self.x1, self.y1, self.x2, self.y2)
+
+    # the segment grown by r is a capsule: two sides parallel to the segment and a half circle at either end
+    def sweep(self, x, y, dx, dy, r):
+        hits = [ray_circle(x, y, dx, dy, self.x1, self.y1, r), ray_circle(x, y, dx, dy, self.x2, self.y2, r)]
+        length = math.hypot(self.x2 - self.x1, self.y2 - self.y1)
+        if length > 0:
+            nx, ny = (self.y1 - self.y2) / length * r, (self.x2 - self.x1) / length * r
+            for side in (1, -1):
+                hits.append(ray_segment(x, y, dx, dy, self.x1 + side * nx, self.y1 + side * ny,
+                                        self.x2 + side * nx, self.y2 + side * ny))
+        return first_hit(hits)
+
+    def to_dict(self):
+        return {'type': 'segment', 'x1': self.x1, 'y1': self.y1, 'x2': self.x2, 'y2': self.y2}
+
+    def __repr__(self):
+        return f"Segment({self.x1}, {self.y1}, {self.x2}, {self.y2})"
+
+class Circle:
+    __slots__ = ('x', 'y', 'radius')
+
+    def __init__(self, x, y, radius):
+        self.x, self.y, self.radius = x, y, radius
+
+    def bounds(self):
+        return self.x - self.radius, self.y - self.radius, self.x + self.radius, self.y + self.radius
+
+    def distance_to(self, x, y):
+        return max(0.0, math.hypot(x - self.x, y - self.y) - self.radius)
+
+    def raycast(self, x, y, dx, dy):
+        return ray_circle(x, y, dx, dy, self.x, self.y, self.radius)
+
+    def sweep(self, x, y, dx, dy, r):
+        return ray_circle(x, y, dx, dy, self.x, self.y, self.radius + r)
+
+    def to_dict(self):
+        return {'type': 'circle', 'x': self.x, 'y': self.y, 'radius': self.radius}
+
+    def __repr__(self):
+        return f"Circle({self.x}, {self.y}, {self.radius})"
+
+# an axis-aligned rectangle with its top-left corner at (x, y)
+class Rect:
+    __slots__ = ('x', 'y', 'width', 'height')
+
+    def __init__(self, x, y, width, height):
+        self.x, self.y, self.width, self.height = x, y, width, height
+
+    def bounds(self):
+        return self.x, self.y, self.x + self.width, self.y + self.height
+
+    def distance_to(self, x, y):
+        dx = max(self.x - x, 0.0, x - self.x - self.width)
+        dy = max(self.y - y, 0.0, y - self.y - self.height)
+        return math.hypot(dx, dy)
+
+    def raycast(self, x, y, dx, dy):
+        return ray_box(x, y, dx, dy, self.x, self.y, self.x + self.width, self.y + self.height)
+
+    # the rectangle grown by r has rounded corners: it is the rectangle widened by r, the rectangle
+    # heightened by r and a circle at every corner
+    def sweep(self, x, y, dx, dy, r):
+        min_x, min_y, max_x, max_y = self.bounds()
+        hits = [ray_box(x, y, dx, dy, min_x - r, min_y, max_x + r, max_y),
+                ray_box(x, y, dx, dy, min_x, min_y - r, max_x, max_y + r)]
+        for cx, cy in ((min_x, min_y), (max_x, min_y), (min_x, max_y), (max_x, max_y)):
+            hits.append(ray_circle(x, y, dx, dy, cx, cy, r))
+        return first_hit(hits)
+
+    def to_dict(self):
+        return {'type': 'rect', 'x': self.x, 'y': self.y, 'width': self.width, 'height': self.height}
+
+    def __repr__(self):
+        return f"Rect({self.x}, {self.y}, {self.width}, {self.height})"
+
+SHAPES = {
+    'segment': (Segment, ('x1', 'y1', 'x2', 'y2')),
+    'circle': (Circle, ('x', 'y', 'radius')),
+    'rect': (Rect, ('x', 'y', 'width', 'height')),
+}
+
+def obstacle_from_dict(data):
+    if data.get('type') not in SHAPES:
+        raise Exception(f"Unknown obstacle type '{data.get('type')}', expected one of: {', '.join(SHAPES)}")
+    cls, fields = SHAPES[data['type']]
+    return cls(*(float(data[name]) for name in fields))
+
+# a robot this close to an obstacle touches it. a robot stopped at the contact point is only about that close
+# after rounding, and a sweep starting there could find the obstacle again at distance 0 even when moving away
+CONTACT = 1e-9
+# how far sweep() looks ahead to tell moving into a touched obstacle from moving away or sliding along it.
+# a move closing the gap by less than CONTACT_PROBE per unit counts as sliding
+CONTACT_PROBE = 1e-6
+
+# the obstacles of a world in a uniform grid of cell_size x cell_size cells, each cell listing the obstacles
+# that overlap it, so a sensor query only looks at the obstacles in the few cells around the robot.
+# circles and rectangles are listed in every cell of their bounds, segments only in the cells they pass through.
+# detect_obstacle() is true when an obstacle is within detect_range of a point,
+# measure_distance() casts a ray and reports the distance to the first obstacle, or sensor_range if there is none
+# in range, sweep() finds where a moving robot first touches an obstacle.
+# cell_size works best around the sensor range or the typical obstacle size, whichever is smaller
+class World:
+    def __init__(self, obstacles=(), cell_size=50, sensor_range=100, detect_range=30):
+        self.cell_size = cell_size
+        self.sensor_range = sensor_range
+        self.detect_range = detect_range
+        self.obstacles = []
+        self.grid = {}  # (column, row) -> list of obstacles
+        for obstacle in obstacles:
+            self.add(obstacle)
+
+    def add(self, obstacle):
+        self.obstacles.append(obstacle)
+        if isinstance(obstacle, Segment):
+            length = math.hypot(obstacle.x2 - obstacle.x1, obstacle.y2 - obstacle.y1)
+            if length > 0:
+                dx, dy = (obstacle.x2 - obstacle.x1) / length, (obstacle.y2 - obstacle.y1) / length
+                cells = [cell for cell, t in self.traverse(obstacle.x1, obstacle.y1, dx, dy, length)]
+            else:
+                cells = [self.cell(obstacle.x1, obstacle.y1)]
+        else:
+            min_x, min_y, max_x, max_y = obstacle.bounds()
+            cells = self.cells_in(min_x, min_y, max_x, max_y)
+        for cell in cells:
+            self.grid.setdefault(cell, []).append(obstacle)
+
+    def cell(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def cells_in(self, min_x, min_y, max_x, max_y):
+        low_column, low_row = self.cell(min_x, min_y)
+        high_column, high_row = self.cell(max_x, max_y)
+        return [(column, row) for column in range(low_column, high_column + 1) for row in range(low_row, high_row + 1)]
+
+    # the cells a ray from (x, y) along the unit direction (dx, dy) passes through up to max_distance, in order,
+    # each with the distance at which the ray enters it (Amanatides and Woo's grid traversal)
+    def traverse(self, x, y, dx, dy, max_distance):
+        size = self.cell_size
+        column, row = self.cell(x, y)
+        step_column = 1 if dx > 0 else -1
+        step_row = 1 if dy > 0 else -1
+        next_x = ((column + (dx > 0)) * size - x) / dx if dx else math.inf  # distance to the next vertical grid line
+        next_y = ((row + (dy > 0)) * size - y) / dy if dy else math.inf
+        delta_x = size / abs(dx) if dx else math.inf
+        delta_y = size / abs(dy) if dy else math.inf
+        t = 0.0
+        while t <= max_distance:
+            yield (column, row), t
+            if next_x < next_y:
+                t = next_x
+                next_x += delta_x
+                column += step_column
+            else:
+                t = next_y
+                next_y += delta_y
+                row += step_row
+
+    # whether any obstacle is within radius (default detect_range) of the point
+    def detect_obstacle(self, x, y, radius=None):
+        radius = self.detect_range if radius is None else radius
+        grid = self.grid
+        seen = set()
+        for cell in self.cells_in(x - radius, y - radius, x + radius, y + radius):
+            for obstacle in grid.get(cell, ()):
+                if id(obstacle) not in seen:
+                    seen.add(id(obstacle))
+                    if obstacle.distance_to(x, y) <= radius:
+                        return True
+        return False
+
+    # distance from the point along the heading (degrees, as robot_angle) to the nearest obstacle,
+    # max_distance (default sensor_range) if there is none that close
+    def measure_distance(self, x, y, angle, max_distance=None):
+        max_distance = self.sensor_range if max_distance is None else max_distance
+        rad = math.radians(angle)
+        dx, dy = math.cos(rad), math.sin(rad)
+        grid = self.grid
+        nearest = max_distance
+        seen = set()
+        for cell, entered in self.traverse(x, y, dx, dy, max_distance):
+            if entered > nearest:
+                break  # every obstacle in this cell or beyond is further away than the one found
+            for obstacle in grid.get(cell, ()):
+                if id(obstacle) not in seen:
+                    seen.add(id(obstacle))
+                    distance = obstacle.raycast(x, y, dx, dy)
+                    if distance is not None and distance < nearest:
+                        nearest = distance
+        return nearest
+
+    # moves a circle of the given radius from (x, y) along the unit direction (dx, dy) for distance units and returns
+    # (travelled, obstacle): how far it gets before it touches an obstacle and that obstacle,
+    # or (distance, None) if the way is clear. a circle already touching an obstacle may slide along it or move
+    # away from it but not into it. the broad phase walks the cells the centre passes through like a ray,
+    # together with every cell within radius of them, because the obstacle it touches can be that far to the side
+    def sweep(self, x, y, dx, dy, distance, radius):
+        grid = self.grid
+        reach = math.ceil(radius / self.cell_size)
+        nearest, hit = distance, None
+        seen = set()
+        for (column, row), entered in self.traverse(x, y, dx, dy, distance):
+            if entered > nearest:
+                break  # a contact further on happens after the one found, see measure_distance
+            for neighbour_column in range(column - reach, column + reach + 1):
+                for neighbour_row in range(row - reach, row + reach + 1):
+                    for obstacle in grid.get((neighbour_column, neighbour_row), ()):
+                        if id(obstacle) in seen:
+                            continue
+                        seen.add(id(obstacle))
+                        gap = obstacle.distance_to(x, y)
+                        if gap <= radius + CONTACT:
+                            # in contact already: blocked only if the first bit of the move closes the gap
+                            probe = obstacle.distance_to(x + dx * CONTACT_PROBE, y + dy * CONTACT_PROBE)
+                            travelled = 0.0 if probe < gap - CONTACT_PROBE * CONTACT_PROBE else None
+                        else:
+                            travelled = obstacle.sweep(x, y, dx, dy, radius)
+                        if travelled is not None and travelled < nearest:
+                            nearest, hit = travelled, obstacle
+        return nearest, hit
+
+    # walls along the edges of a width x height screen, so the robot cannot drive off it
+    def add_boundary(self, width, height):
+        for x1, y1, x2, y2 in ((0, 0, width, 0), (width, 0, width, height), (width, height, 0, height), (0, height, 0, 0)):
+            self.add(Segment(x1, y1, x2, y2))
+
+    # a copy of this world with walls along the edges of a width x height screen, this world is left as it is
+    def bounded(self, width, height):
+        world = World(self.obstacles, self.cell_size, self.sensor_range, self.detect_range)
+        world.add_boundary(width, height)
+        return world
+
+    def to_dict(self):
+        return {
+            'cell_size': self.cell_size,
+            'sensor_range': self.sensor_range,
+            'detect_range': self.detect_range,
+            'obstacles': [obstacle.to_dict() for obstacle in self.obstacles],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls([obstacle_from_dict(obstacle) for obstacle in data.get('obstacles', [])],
+                   data.get('cell_size', 50), data.get('sensor_range', 100), data.get('detect_range', 30))
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    def __repr__(self):
+        return f"World({len(self.obstacles)} obstacles, {len(self.grid)} cells of {self.cell_size})"
+
+# reads a world saved by World.save: a JSON object with an "obstacles" list such as
+# {"type": "circle", "x": 100, "y": 50, "radius": 10} and optional cell_size, sensor_range and detect_range
+def load_world(path):
+    with open(path) as f:
+        return World.from_dict(json.load(f))